@@ -90,6 +90,11 @@ def edit_config_file(args: List[str]) -> None:
     f()
 
 
+def clear_shell_env_cache(args: List[str]) -> None:
+    from kitty.utils import clear_shell_environment_cache
+    clear_shell_environment_cache()
+
+
 def namespaced(args: List[str]) -> None:
     try:
         func = namespaced_entry_points[args[1]]
@@ -116,6 +121,7 @@ def namespaced(args: List[str]) -> None:
 namespaced_entry_points = {k: v for k, v in entry_points.items() if k[0] not in '+@'}
 namespaced_entry_points['hold'] = hold
 namespaced_entry_points['complete'] = complete
+namespaced_entry_points['clear-shell-env-cache'] = clear_shell_env_cache
 
 
 def setup_openssl_environment() -> None:
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# vim:fileencoding=utf-8
+# License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+# The index is built only from the defaults built into the Python mimetypes
+# module, never from the mime.types files of the machine it is run on, so that
+# it is reproducible. known_extensions are not included, they remain a fallback
+# for extensions that neither the index nor the system database know.
+
+from typing import Dict, Set, Tuple
+
+
+def build_index() -> Tuple[Set[str], Dict[str, str]]:
+    import mimetypes
+    index = {ext[1:].lower(): mt for ext, mt in getattr(mimetypes, '_types_map_default').items() if '.' not in ext[1:]}
+    encoding_extensions = {x[1:].lower() for x in getattr(mimetypes, '_encodings_map_default')}
+    encoding_extensions |= {x[1:].lower() for x in getattr(mimetypes, '_suffix_map_default')}
+    for ext in encoding_extensions:
+        index.pop(ext, None)
+    return encoding_extensions, index
+
+
+def main() -> None:
+    encoding_extensions, index = build_index()
+    lines = [
+        '# generated by gen-mime-types.py DO NOT edit', '',
+        '# Extensions that mimetypes.guess_type() treats as compression or',
+        '# as an alias, they are not in the index', '',
+        f'encoding_extensions = frozenset({sorted(encoding_extensions)!r})', '',
+        'mime_types = {',
+    ]
+    for ext in sorted(index):
+        lines.append(f'    {ext!r}: {index[ext]!r},')
+    lines.append('}')
+    with open('kitty/mime_types_index.py', 'w') as f:
+        print('\n'.join(lines), file=f)
+
+
+if __name__ == '__main__':
+    main()
@@ -503,6 +503,25 @@ def add_word(word_idx: int, word: str) -> None:
 
         for i, word in enumerate(word_map):
             add_word(i, word)
+
+        # A second trie of all the proper suffixes of every word, used for
+        # substring searches. Its match offsets point into suffix_groups,
+        # which holds the indices of the words each suffix occurs in.
+        suffix_root = len(all_trie_nodes)
+        all_trie_nodes.append(TrieNode())
+        suffix_to_words: DefaultDict[str, Set[int]] = defaultdict(set)
+        for i, word in enumerate(word_map):
+            for start in range(1, len(word)):
+                suffix_to_words[word[start:]].add(i)
+        suffix_groups = [0]
+        for suffix, word_idxs in suffix_to_words.items():
+            parent = all_trie_nodes[suffix_root]
+            for letter in map(ord, suffix):
+                parent = all_trie_nodes[parent.add_letter(letter)]
+            parent.match_offset = len(suffix_groups)
+            suffix_groups.append(len(word_idxs))
+            suffix_groups.extend(sorted(word_idxs))
+
         children_array = [0]
         for node in all_trie_nodes:
             if node.children:
@@ -517,6 +536,10 @@ def add_word(word_idx: int, word: str) -> None:
         p(f'static const uint32_t children_array[{len(children_array)}] = {{' ' // {{{')
         p(', '.join(map(str, children_array)))
         p('}; // }}}\n')
+        p(f'static const uint32_t suffix_groups[{len(suffix_groups)}] = {{' ' // {{{')
+        p(', '.join(map(str, suffix_groups)))
+        p('}; // }}}\n')
+        p(f'#define SUFFIX_TRIE_ROOT {suffix_root}')
 
 
 def gen_wcwidth() -> None:
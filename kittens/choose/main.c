@@ -7,6 +7,7 @@
 
 #include "choose-data-types.h"
 #include "charsets.h"
+#include "../../kitty/iqsort.h"
 
 #include <errno.h>
 #include <stdio.h>
@@ -225,6 +226,212 @@ match(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+// Matcher {{{
+
+typedef struct {
+    size_t offset;
+    len_t haystack_len;
+} Item;
+
+typedef struct {
+    PyObject_HEAD
+
+    GlobalData levels;
+    int num_threads;
+    bool busy;
+    text_t *chars;
+    size_t chars_count, chars_capacity;
+    Item *items;
+    size_t items_count, items_capacity;
+    // The results of the previous query, used to speed up queries that extend it
+    text_t needle[LEN_MAX];
+    len_t needle_len;
+    bool has_previous;
+    size_t *matches, matches_count, searched_count;
+} Matcher;
+
+static PyObject*
+Matcher_new(PyTypeObject *type, PyObject *args, PyObject UNUSED *kwds) {
+    PyObject *levels;
+    int num_threads = 0;
+    if (!PyArg_ParseTuple(args, "O!|i", &PyTuple_Type, &levels, &num_threads)) return NULL;
+    if (PyTuple_GET_SIZE(levels) != 3) { PyErr_SetString(PyExc_ValueError, "levels must be a tuple of three strings"); return NULL; }
+    for (int i = 0; i < 3; i++) {
+        if (!PyUnicode_Check(PyTuple_GET_ITEM(levels, i))) { PyErr_SetString(PyExc_TypeError, "levels must be a tuple of three strings"); return NULL; }
+    }
+    Matcher *self = (Matcher*)type->tp_alloc(type, 0);
+    if (self) {
+        self->num_threads = num_threads;
+        self->levels.level1_len = copy_unicode_object(PyTuple_GET_ITEM(levels, 0), self->levels.level1, arraysz(self->levels.level1));
+        self->levels.level2_len = copy_unicode_object(PyTuple_GET_ITEM(levels, 1), self->levels.level2, arraysz(self->levels.level2));
+        self->levels.level3_len = copy_unicode_object(PyTuple_GET_ITEM(levels, 2), self->levels.level3, arraysz(self->levels.level3));
+    }
+    return (PyObject*)self;
+}
+
+static void
+Matcher_dealloc(Matcher *self) {
+    free(self->chars); free(self->items); free(self->matches);
+    Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+static Py_ssize_t
+Matcher_len(Matcher *self) {
+    return self->items_count;
+}
+
+static bool
+ensure_capacity(void **data, size_t *capacity, size_t needed, size_t itemsz) {
+    if (needed <= *capacity) return true;
+    size_t cap = MAX(MAX(*capacity * 2, needed), 1024u);
+    void *temp = realloc(*data, cap * itemsz);
+    if (!temp) return false;
+    *data = temp; *capacity = cap;
+    return true;
+}
+
+static bool
+add_item(Matcher *self, PyObject *item) {
+    size_t sz;
+    if (!ensure_capacity((void**)&self->items, &self->items_capacity, self->items_count + 1, sizeof(Item))) { PyErr_NoMemory(); return false; }
+    if (PyBytes_Check(item)) {
+        // decoding can produce at most as many characters as there are bytes
+        if (!ensure_capacity((void**)&self->chars, &self->chars_capacity, self->chars_count + PyBytes_GET_SIZE(item), sizeof(text_t))) { PyErr_NoMemory(); return false; }
+        sz = decode_utf8_string(PyBytes_AS_STRING(item), PyBytes_GET_SIZE(item), self->chars + self->chars_count);
+    } else if (PyUnicode_Check(item)) {
+        if (!ensure_capacity((void**)&self->chars, &self->chars_capacity, self->chars_count + LEN_MAX, sizeof(text_t))) { PyErr_NoMemory(); return false; }
+        sz = copy_unicode_object(item, self->chars + self->chars_count, LEN_MAX);
+    } else {
+        PyErr_Format(PyExc_TypeError, "Items must be str or bytes, not %s", Py_TYPE(item)->tp_name);
+        return false;
+    }
+    // Only the first LEN_MAX characters of an item are used for matching
+    Item *it = self->items + self->items_count++;
+    it->offset = self->chars_count;
+    it->haystack_len = (len_t)MIN((size_t)LEN_MAX, sz);
+    self->chars_count += it->haystack_len;
+    return true;
+}
+
+static PyObject*
+Matcher_add(Matcher *self, PyObject *items) {
+    if (self->busy) { PyErr_SetString(PyExc_RuntimeError, "Cannot add items while a query is running"); return NULL; }
+    PyObject *iter = PyObject_GetIter(items);
+    if (!iter) return NULL;
+    PyObject *item;
+    while ((item = PyIter_Next(iter))) {
+        bool ok = add_item(self, item);
+        Py_DECREF(item);
+        if (!ok) break;
+    }
+    Py_DECREF(iter);
+    if (PyErr_Occurred()) return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject*
+build_results(Candidate *haystack, size_t count, size_t limit, len_t needle_len) {
+    // Use the same order as output_results(), an empty needle matches everything in the order it was added
+    if (needle_len) {
+#define lt(b, a) ( (a)->score < (b)->score || ((a)->score == (b)->score && (a->idx < b->idx)) )
+        QSORT(Candidate, haystack, count, lt);
+#undef lt
+    }
+    if (limit > 0) count = MIN(count, limit);
+    PyObject *ans = PyList_New(count);
+    if (!ans) return NULL;
+    for (size_t i = 0; i < count; i++) {
+        Candidate *c = haystack + i;
+        PyObject *positions = PyTuple_New(needle_len);
+        if (!positions) { Py_DECREF(ans); return NULL; }
+        for (len_t p = 0; p < needle_len; p++) PyTuple_SET_ITEM(positions, p, PyLong_FromUnsignedLong(c->positions[p]));
+        PyObject *r = Py_BuildValue("ndN", c->idx, c->score, positions);
+        if (!r) { Py_DECREF(ans); return NULL; }
+        PyList_SET_ITEM(ans, i, r);
+    }
+    return ans;
+}
+
+static PyObject*
+Matcher_query(Matcher *self, PyObject *args) {
+    PyObject *needle, *ans = NULL;
+    unsigned long limit = 0;
+    size_t num_matches = 0;
+    if (!PyArg_ParseTuple(args, "U|k", &needle, &limit)) return NULL;
+    if (self->busy) { PyErr_SetString(PyExc_RuntimeError, "A query is already running"); return NULL; }
+    GlobalData global = self->levels;
+    global.needle_len = (len_t)MIN((size_t)LEN_MAX, copy_unicode_object(needle, global.needle, arraysz(global.needle)));
+    // Any item that matches the needle also matches every prefix of it, so
+    // only the previous matches and the items added since need to be scored
+    bool extends = self->has_previous && global.needle_len >= self->needle_len && memcmp(global.needle, self->needle, sizeof(text_t) * self->needle_len) == 0;
+    size_t count = extends ? self->matches_count + self->items_count - self->searched_count : self->items_count;
+    Candidate *haystack = calloc(MAX(1u, count), sizeof(Candidate));
+    len_t *positions = calloc(MAX(1u, count * global.needle_len), sizeof(len_t));
+    size_t *matches = malloc(sizeof(size_t) * MAX(1u, count));
+    if (!haystack || !positions || !matches) { PyErr_NoMemory(); goto end; }
+    for (size_t i = 0, n = extends ? self->matches_count : 0; i < count; i++) {
+        size_t idx = i < n ? self->matches[i] : (extends ? self->searched_count + i - n : i);
+        Item *it = self->items + idx;
+        haystack[i].src = self->chars + it->offset;
+        haystack[i].src_sz = it->haystack_len;
+        haystack[i].haystack_len = it->haystack_len;
+        haystack[i].positions = positions + i * global.needle_len;
+        haystack[i].idx = idx;
+        global.haystack_size += it->haystack_len;
+    }
+    global.haystack = haystack;
+    global.haystack_count = count;
+    if (global.needle_len && count) {
+        int ret;
+        self->busy = true;
+        Py_BEGIN_ALLOW_THREADS;
+        ret = run_threaded(self->num_threads, &global);
+        Py_END_ALLOW_THREADS;
+        self->busy = false;
+        if (ret) { PyErr_NoMemory(); goto end; }
+    }
+    for (size_t i = 0; i < count; i++) {
+        if (haystack[i].score > 0 || !global.needle_len) {
+            matches[num_matches] = haystack[i].idx;
+            haystack[num_matches++] = haystack[i];
+        }
+    }
+    free(self->matches);
+    self->matches = matches; matches = NULL;
+    self->matches_count = num_matches;
+    self->searched_count = self->items_count;
+    memcpy(self->needle, global.needle, sizeof(text_t) * global.needle_len);
+    self->needle_len = global.needle_len;
+    self->has_previous = true;
+    ans = build_results(haystack, num_matches, limit, global.needle_len);
+end:
+    free(haystack); free(positions); free(matches);
+    return ans;
+}
+
+static PyMethodDef Matcher_methods[] = {
+    {"add", (PyCFunction)Matcher_add, METH_O, ""},
+    {"query", (PyCFunction)Matcher_query, METH_VARARGS, ""},
+    {NULL}  /* Sentinel */
+};
+
+static PySequenceMethods Matcher_as_sequence = {
+    .sq_length = (lenfunc)Matcher_len,
+};
+
+static PyTypeObject Matcher_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "subseq_matcher.Matcher",
+    .tp_basicsize = sizeof(Matcher),
+    .tp_dealloc = (destructor)Matcher_dealloc,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "Matcher",
+    .tp_methods = Matcher_methods,
+    .tp_as_sequence = &Matcher_as_sequence,
+    .tp_new = Matcher_new,
+};
+// }}}
+
 static PyMethodDef module_methods[] = {
     {"match", match, METH_VARARGS, ""},
     {NULL, NULL, 0, NULL}        /* Sentinel */
@@ -240,5 +447,10 @@ static struct PyModuleDef module = {
 
 EXPORTED PyMODINIT_FUNC
 PyInit_subseq_matcher(void) {
-    return PyModule_Create(&module);
+    if (PyType_Ready(&Matcher_Type) < 0) return NULL;
+    PyObject *m = PyModule_Create(&module);
+    if (m == NULL) return NULL;
+    Py_INCREF(&Matcher_Type);
+    if (PyModule_AddObject(m, "Matcher", (PyObject*)&Matcher_Type) != 0) { Py_DECREF(&Matcher_Type); Py_DECREF(m); return NULL; }
+    return m;
 }
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
 
-from typing import Iterable, List, Union
+from typing import BinaryIO, Iterable, List, Tuple, Union
 
 from . import subseq_matcher
 
@@ -36,3 +36,46 @@ def match(
     if data is None:
         return []
     return list(filter(None, data.split(delimiter or '\n')))
+
+
+MatchResult = Tuple[int, float, Tuple[int, ...]]
+
+
+class Matcher:
+
+    '''
+    Holds items in native memory so that they can be matched against
+    repeatedly, for example as the user types. Items can be added at any
+    time, queries return a list of (index, score, positions) tuples sorted by
+    score, where index is the position of the item in the order it was added.
+    '''
+
+    def __init__(
+        self,
+        threads: int = 0,
+        level1: str = '/',
+        level2: str = '-_0123456789',
+        level3: str = '.',
+    ):
+        self.matcher = subseq_matcher.Matcher((level1.lower(), level2.lower(), level3.lower()), threads)
+
+    def __len__(self) -> int:
+        return len(self.matcher)
+
+    def add(self, items: Iterable[Union[str, bytes]]) -> None:
+        self.matcher.add(items)
+
+    def add_from_file(self, f: BinaryIO, delimiter: bytes = b'\n', chunk_size: int = 64 * 1024) -> None:
+        tail = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            items = (tail + chunk).split(delimiter)
+            tail = items.pop()
+            self.matcher.add(items)
+        if tail:
+            self.matcher.add((tail,))
+
+    def query(self, query: str, limit: int = 0) -> List[MatchResult]:
+        return self.matcher.query(query.lower(), limit)
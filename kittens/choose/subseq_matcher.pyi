@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple, Union
 
 
 def match(
@@ -7,3 +7,14 @@ def match(
     mark_after: str, delimiter: str
 ) -> Optional[str]:
     pass
+
+
+class Matcher:
+
+    def __init__(self, levels: Tuple[str, str, str], num_threads: int = 0): ...
+
+    def __len__(self) -> int: ...
+
+    def add(self, items: Iterable[Union[str, bytes]]) -> None: ...
+
+    def query(self, needle: str, limit: int = 0) -> List[Tuple[int, float, Tuple[int, ...]]]: ...
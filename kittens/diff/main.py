@@ -268,9 +268,9 @@ def scroll_lines(self, amt: int = 1) -> None:
         if new_pos == self.scroll_pos:
             self.cmd.bell()
             return
-        if abs(new_pos - self.scroll_pos) >= self.num_lines - 1:
+        if abs(new_pos - self.scroll_pos) >= self.num_lines - 1 or self.frame_pending:
             self.scroll_pos = new_pos
-            self.draw_screen()
+            self.schedule_redraw()
             return
         self.enforce_cursor_state()
         self.cmd.scroll_screen(amt)
@@ -450,7 +450,7 @@ def change_context_count(self, new_ctx: int) -> None:
             self.state = COLLECTED
             self.generate_diff()
             self.restore_position = self.current_position
-            self.draw_screen()
+            self.schedule_redraw()
 
     def start_search(self, is_regex: bool, is_backward: bool) -> None:
         if self.state != DIFFED:
@@ -507,7 +507,7 @@ def on_key_event(self, key_event: KeyEvent, in_bracketed_paste: bool = False) ->
                     self.state = DIFFED
                     self.do_search()
                     self.line_edit.clear()
-                    self.draw_screen()
+                    self.schedule_redraw()
                     return
                 if key_event.matches('esc'):
                     self.state = DIFFED
@@ -529,7 +529,7 @@ def on_resize(self, screen_size: ScreenSize) -> None:
         if self.state > COLLECTED:
             self.image_manager.delete_all_sent_images()
             self.render_diff()
-        self.draw_screen()
+        self.schedule_redraw()
 
     def on_interrupt(self) -> None:
         self.quit_loop(1)
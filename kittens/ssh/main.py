@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 # License: GPL v3 Copyright: 2018, Kovid Goyal <kovid at kovidgoyal.net>
 
+import hashlib
 import os
+import re
 import shlex
+import stat
 import subprocess
 import sys
 from contextlib import suppress
@@ -11,19 +14,31 @@
 
 from kitty.utils import SSHConnectionData
 
+# Number of seconds an idle master connection is kept open for re-use
+CONTROL_PERSIST = 600
+forwarding_args = frozenset('-' + x for x in 'ADLRWXYwM')
+
 SHELL_SCRIPT = '''\
 #!/bin/sh
 # macOS ships with an ancient version of tic that cannot read from stdin, so we
-# create a temp file for it
-tmp=$(mktemp)
-cat >$tmp << 'TERMEOF'
+# create a temp file for it. The terminfo is only compiled if it is different
+# from the one compiled on a previous login.
+terminfo_stamp="$HOME/.terminfo/.kitty-terminfo-hash"
+terminfo_entry_exists() {
+    [ -e "$HOME/.terminfo/TERMINFO_ENTRY_CHAR/TERMINFO_ENTRY_NAME" ] || [ -e "$HOME/.terminfo/TERMINFO_ENTRY_HEX/TERMINFO_ENTRY_NAME" ]
+}
+if [ "$(cat "$terminfo_stamp" 2>/dev/null)" != "TERMINFO_HASH" ] || ! terminfo_entry_exists; then
+    tmp=$(mktemp)
+    cat >$tmp << 'TERMEOF'
 TERMINFO
 TERMEOF
 
-tic_out=$(tic -x -o $HOME/.terminfo $tmp 2>&1)
-rc=$?
-rm $tmp
-if [ "$rc" != "0" ]; then echo "$tic_out"; exit 1; fi
+    tic_out=$(tic -x -o $HOME/.terminfo $tmp 2>&1)
+    rc=$?
+    rm $tmp
+    if [ "$rc" != "0" ]; then echo "$tic_out"; exit 1; fi
+    echo "TERMINFO_HASH" > "$terminfo_stamp"
+fi
 if [ -z "$USER" ]; then export USER=$(whoami); fi
 export TERMINFO="$HOME/.terminfo"
 login_shell=""
@@ -106,15 +121,26 @@
 from tempfile import NamedTemporaryFile
 import subprocess, os, sys, pwd, binascii, json
 
+terminfo_stamp = os.path.expanduser('~/.terminfo/.kitty-terminfo-hash')
+try:
+    with open(terminfo_stamp) as f:
+        compiled_hash = f.read().strip()
+except Exception:
+    compiled_hash = ''
+entry_exists = any(os.path.exists(os.path.expanduser('~/.terminfo/{{}}/{terminfo_entry_name}'.format(x))) for x in {terminfo_entry_dirs!r})
 # macOS ships with an ancient version of tic that cannot read from stdin, so we
 # create a temp file for it
-with NamedTemporaryFile() as tmp:
-    tmp.write(binascii.unhexlify('{terminfo}'))
-    p = subprocess.Popen(['tic', '-x', '-o', os.path.expanduser('~/.terminfo'), tmp.name], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    stdout, stderr = p.communicate()
-    if p.wait() != 0:
-        getattr(sys.stderr, 'buffer', sys.stderr).write(stdout + stderr)
-        raise SystemExit('Failed to compile terminfo using tic')
+if compiled_hash != '{terminfo_hash}' or not entry_exists:
+    with NamedTemporaryFile() as tmp:
+        tmp.write(binascii.unhexlify('{terminfo}'))
+        tmp.flush()
+        p = subprocess.Popen(['tic', '-x', '-o', os.path.expanduser('~/.terminfo'), tmp.name], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = p.communicate()
+        if p.wait() != 0:
+            getattr(sys.stderr, 'buffer', sys.stderr).write(stdout + stderr)
+            raise SystemExit('Failed to compile terminfo using tic')
+    with open(terminfo_stamp, 'w') as f:
+        f.write('{terminfo_hash}')
 command_to_execute = json.loads(binascii.unhexlify('{command_to_execute}'))
 try:
     shell_path = pwd.getpwuid(os.geteuid()).pw_shell or '/bin/sh'
@@ -268,8 +294,122 @@ def quote(x: str) -> str:
     return x
 
 
+def terminfo_hash(terminfo: str) -> str:
+    return hashlib.sha256(terminfo.encode('utf-8')).hexdigest()
+
+
+def terminfo_entry_name(terminfo: str) -> str:
+    for line in terminfo.splitlines():
+        if line and not line.startswith('#'):
+            return line.partition('|')[0].split(',')[0].strip()
+    return 'xterm-kitty'
+
+
+def terminfo_entry_dirs(name: str) -> Tuple[str, str]:
+    # tic uses either the first letter or its hex code as the directory name
+    # depending on the platform
+    return name[0], f'{ord(name[0]):x}'
+
+
+def get_terminfo() -> str:
+    # infocmp is slow, so cache its output, the terminfo only changes when
+    # kitty is updated
+    from kitty.config import atomic_save
+    from kitty.constants import cache_dir, str_version
+    term = os.environ.get('TERM') or 'xterm-kitty'
+    path = os.path.join(cache_dir(), 'ssh', f'terminfo-{str_version}-{term}')
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+    except OSError:
+        pass
+    raw = subprocess.check_output(['infocmp', '-a'])
+    with suppress(OSError):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_save(raw, path)
+    return raw.decode('utf-8')
+
+
+def uses_connection_sharing(ssh_args: List[str]) -> bool:
+    for i, arg in enumerate(ssh_args):
+        if arg == '-S':
+            return True
+        if arg == '-o' and i + 1 < len(ssh_args):
+            key = re.split(r'[\s=]', ssh_args[i + 1].strip(), 1)[0].lower()
+            if key in ('controlmaster', 'controlpath'):
+                return True
+    return False
+
+
+def uses_forwarding(ssh_args: List[str]) -> bool:
+    # A shared connection silently ignores the forwarding options of all but
+    # the master connection
+    for arg in ssh_args:
+        if arg in forwarding_args:
+            return True
+    return False
+
+
+def config_prevents_connection_sharing(ssh_args: List[str], hostname: str) -> bool:
+    # Dont override connection sharing or forwarding setup in ssh_config
+    try:
+        cp = subprocess.run(['ssh', '-G'] + ssh_args + ['--', hostname], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return True
+    if cp.returncode != 0:
+        return True
+    for line in cp.stdout.decode('utf-8', 'replace').splitlines():
+        key, _, val = line.partition(' ')
+        key, val = key.lower(), val.strip().lower()
+        if key == 'controlmaster' and val not in ('false', 'no'):
+            return True
+        if key == 'controlpath' and val != 'none':
+            return True
+        if key in ('localforward', 'remoteforward', 'dynamicforward') or (key in ('forwardagent', 'forwardx11') and val != 'no'):
+            return True
+    return False
+
+
+def connection_sharing_dir() -> str:
+    # OpenSSH appends a random suffix to the socket path while creating it and
+    # socket paths are limited to ~104 chars, so keep the directory short
+    base = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    if len(base) > 32:
+        base = '/tmp'
+    rd = os.path.join(base, f'kssh-{os.getuid()}')
+    try:
+        os.makedirs(rd, mode=0o700, exist_ok=True)
+        st = os.lstat(rd)
+    except OSError:
+        return ''
+    # The directory may have been created by some other user in a world
+    # writable location, only use it if it is really ours and private
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        return ''
+    return rd
+
+
+def connection_sharing_args(ssh_args: List[str], hostname: str) -> List[str]:
+    if os.environ.get('KITTY_SSH_SHARE_CONNECTIONS') != '1':
+        return []
+    if uses_connection_sharing(ssh_args) or uses_forwarding(ssh_args) or config_prevents_connection_sharing(ssh_args, hostname):
+        return []
+    rd = connection_sharing_dir()
+    if not rd:
+        return []
+    return [
+        '-o', 'ControlMaster=auto',
+        '-o', f'ControlPath={rd}/%C',
+        '-o', f'ControlPersist={CONTROL_PERSIST}',
+    ]
+
+
 def get_posix_cmd(terminfo: str, remote_args: List[str]) -> List[str]:
-    sh_script = SHELL_SCRIPT.replace('TERMINFO', terminfo, 1)
+    sh_script = SHELL_SCRIPT.replace('TERMINFO_HASH', terminfo_hash(terminfo))
+    name = terminfo_entry_name(terminfo)
+    dirs = terminfo_entry_dirs(name)
+    sh_script = sh_script.replace('TERMINFO_ENTRY_CHAR', dirs[0]).replace('TERMINFO_ENTRY_HEX', dirs[1]).replace('TERMINFO_ENTRY_NAME', name)
+    sh_script = sh_script.replace('TERMINFO', terminfo, 1)
     command_to_execute = ''
     if remote_args:
         # ssh simply concatenates multiple commands using a space see
@@ -283,8 +423,12 @@ def get_posix_cmd(terminfo: str, remote_args: List[str]) -> List[str]:
 
 def get_python_cmd(terminfo: str, command_to_execute: List[str]) -> List[str]:
     import json
+    name = terminfo_entry_name(terminfo)
     script = PYTHON_SCRIPT.format(
         terminfo=terminfo.encode('utf-8').hex(),
+        terminfo_hash=terminfo_hash(terminfo),
+        terminfo_entry_name=name,
+        terminfo_entry_dirs=terminfo_entry_dirs(name),
         command_to_execute=json.dumps(' '.join(command_to_execute)).encode('utf-8').hex()
     )
     return [f'python -c "{script}"']
@@ -307,9 +451,10 @@ def main(args: List[str]) -> NoReturn:
         hostname, remote_args = server_args[0], server_args[1:]
         if not remote_args:
             cmd.append('-t')
+        cmd += connection_sharing_args(ssh_args, hostname)
         cmd.append('--')
         cmd.append(hostname)
-        terminfo = subprocess.check_output(['infocmp', '-a']).decode('utf-8')
+        terminfo = get_terminfo()
         f = get_posix_cmd if use_posix else get_python_cmd
         cmd += f(terminfo, remote_args)
     os.execvp('ssh', cmd)
@@ -11,14 +11,20 @@
 import tempfile
 import zipfile
 from contextlib import suppress
-from typing import Any, Callable, Dict, Iterator, Match, Optional, Tuple, Union, Type
+from functools import partial
+from typing import (
+    IO, Any, Callable, Dict, Iterator, List, Match, Optional, Tuple, Type,
+    Union
+)
 from urllib.error import HTTPError
+from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
 from kitty.config import atomic_save, parse_config
 from kitty.constants import cache_dir, config_dir
-from kitty.options.types import Options as KittyOptions
 from kitty.fast_data_types import Color
+from kitty.options.types import Options as KittyOptions
+from kitty.rgb import color_as_sharp, to_color
 from kitty.utils import reload_conf_in_all_kitties
 
 from ..choose.match import match
@@ -334,35 +340,87 @@ class NoCacheFound(ValueError):
     pass
 
 
-def fetch_themes(
-    name: str = 'kitty-themes',
-    url: str = 'https://codeload.github.com/kovidgoyal/kitty-themes/zip/master',
-    cache_age: float = 1,
-) -> str:
-    now = datetime.datetime.now(datetime.timezone.utc)
-    cache_age_delta = datetime.timedelta(days=cache_age)
+DEFAULT_URL = 'https://codeload.github.com/kovidgoyal/kitty-themes/zip/master'
+
+
+class Metadata:
+
+    def __init__(self, timestamp: datetime.datetime) -> None:
+        self.etag = ''
+        self.timestamp = timestamp
+
+    def __str__(self) -> str:
+        return json.dumps({'etag': self.etag, 'timestamp': self.timestamp.isoformat()})
+
 
-    class Metadata:
-        def __init__(self) -> None:
-            self.etag = ''
-            self.timestamp = now
+def themes_cache_path(name: str = 'kitty-themes') -> str:
+    return os.path.join(cache_dir(), f'{name}.zip')
 
-        def __str__(self) -> str:
-            return json.dumps({'etag': self.etag, 'timestamp': self.timestamp.isoformat()})
 
-    dest_path = os.path.join(cache_dir(), f'{name}.zip')
-    m = Metadata()
-    with suppress(Exception), zipfile.ZipFile(dest_path, 'r') as zf:
+def read_metadata(path: str) -> Optional[Metadata]:
+    with suppress(Exception), zipfile.ZipFile(path, 'r') as zf:
         q = json.loads(zf.comment)
+        m = Metadata(datetime.datetime.fromisoformat(q['timestamp']))
         m.etag = str(q.get('etag') or '')
-        m.timestamp = datetime.datetime.fromisoformat(q['timestamp'])
-        if cache_age < 0 or (now - m.timestamp) < cache_age_delta:
+        return m
+    return None
+
+
+def is_cache_stale(cache_age: float = 1, name: str = 'kitty-themes') -> bool:
+    if cache_age < 0:
+        return False
+    m = read_metadata(themes_cache_path(name))
+    if m is None:
+        return True
+    return datetime.datetime.now(datetime.timezone.utc) - m.timestamp >= datetime.timedelta(days=cache_age)
+
+
+def fetch_themes(
+    name: str = 'kitty-themes',
+    url: str = DEFAULT_URL,
+    cache_age: float = 1,
+) -> str:
+    # url can also be the path to a local mirror directory containing a copy
+    # of the themes zip file
+    now = datetime.datetime.now(datetime.timezone.utc)
+    dest_path = themes_cache_path(name)
+    m = read_metadata(dest_path)
+    if m is not None:
+        if cache_age < 0 or (now - m.timestamp) < datetime.timedelta(days=cache_age):
             return dest_path
     if cache_age < 0:
         raise NoCacheFound('No local themes cache found and negative cache age specified, aborting')
+    if m is None:
+        m = Metadata(now)
+    m.timestamp = now
+
+    def save(src: IO[bytes]) -> None:
+        needs_delete = False
+        try:
+            with tempfile.NamedTemporaryFile(suffix='-' + os.path.basename(dest_path), dir=os.path.dirname(dest_path), delete=False) as f:
+                needs_delete = True
+                shutil.copyfileobj(src, f)
+                f.flush()
+                set_comment_in_zip_file(f.name, str(m))
+                os.replace(f.name, dest_path)
+                needs_delete = False
+        finally:
+            if needs_delete:
+                os.unlink(f.name)
+
+    if not urlparse(url).scheme:
+        src_path = os.path.join(url, f'{name}.zip')
+        st = os.stat(src_path)
+        etag = f'{st.st_mtime_ns}-{st.st_size}'
+        if etag == m.etag:
+            set_comment_in_zip_file(dest_path, str(m))
+            return dest_path
+        m.etag = etag
+        with open(src_path, 'rb') as src:
+            save(src)
+        return dest_path
 
     rq = Request(url)
-    m.timestamp = now
     if m.etag:
         rq.add_header('If-None-Match', m.etag)
     try:
@@ -373,33 +431,10 @@ def __str__(self) -> str:
             return dest_path
         raise
     m.etag = res.headers.get('etag') or ''
-
-    needs_delete = False
-    try:
-        with tempfile.NamedTemporaryFile(suffix='-' + os.path.basename(dest_path), dir=os.path.dirname(dest_path), delete=False) as f:
-            needs_delete = True
-            shutil.copyfileobj(res, f)
-            f.flush()
-            set_comment_in_zip_file(f.name, str(m))
-            os.replace(f.name, dest_path)
-            needs_delete = False
-    finally:
-        if needs_delete:
-            os.unlink(f.name)
+    save(res)
     return dest_path
 
 
-def zip_file_loader(path_to_zip: str, theme_file_name: str, file_name: str) -> Callable[[], str]:
-
-    name = os.path.join(os.path.dirname(theme_file_name), file_name)
-
-    def zip_loader() -> str:
-        with zipfile.ZipFile(path_to_zip, 'r') as zf, zf.open(name) as f:
-            return f.read().decode('utf-8')
-
-    return zip_loader
-
-
 def theme_name_from_file_name(fname: str) -> str:
     ans = fname.rsplit('.', 1)[0]
     ans = ans.replace('_', ' ')
@@ -470,6 +505,56 @@ def parse_theme(fname: str, raw: str, exc_class: Type[BaseException] = SystemExi
     return ans
 
 
+def theme_colors(raw: str) -> Optional[Dict[str, Optional[str]]]:
+    # The settings in the theme, if they are all colors
+    conf = parse_config(raw.splitlines())
+    defaults = parse_config(())
+    ans: Dict[str, Optional[str]] = {}
+    for k, v in conf.items():
+        if k in defaults and v == defaults[k]:
+            continue
+        if isinstance(v, Color):
+            ans[k] = color_as_sharp(v)
+        elif v is None:
+            ans[k] = None
+        else:
+            return None
+    return ans
+
+
+INDEX_VERSION = 1
+
+
+def theme_index(path_to_zip: str) -> List[Dict[str, Any]]:
+    # Read the themes from the zip file once and store them along with their
+    # parsed colors in an index next to it, so that they can be loaded
+    # without touching the zip file at all
+    st = os.stat(path_to_zip)
+    key = [INDEX_VERSION, st.st_mtime_ns, st.st_size]
+    index_path = os.path.splitext(path_to_zip)[0] + '-index.json'
+    with suppress(Exception), open(index_path, 'rb') as f:
+        index = json.loads(f.read())
+        if index['key'] == key:
+            ans: List[Dict[str, Any]] = index['themes']
+            return ans
+
+    with zipfile.ZipFile(path_to_zip, 'r') as zf:
+        for name in zf.namelist():
+            if os.path.basename(name) == 'themes.json':
+                theme_file_name = name
+                items = json.loads(zf.read(theme_file_name))
+                break
+        else:
+            raise ValueError(f'No themes.json found in {path_to_zip}')
+        base = os.path.dirname(theme_file_name)
+        for item in items:
+            item['raw'] = zf.read(os.path.join(base, item['file'])).decode('utf-8')
+            item['colors'] = theme_colors(item['raw'])
+    with suppress(OSError):
+        atomic_save(json.dumps({'key': key, 'themes': items}).encode('utf-8'), index_path)
+    return items
+
+
 def update_theme_file(path: str) -> bool:
     with open(path) as f:
         raw = f.read()
@@ -490,6 +575,7 @@ class Theme:
     is_dark: bool = False
     blurb: str = ''
     num_settings: int = 0
+    colors: Optional[Dict[str, Optional[str]]] = None
 
     def apply_dict(self, d: Dict[str, Any]) -> None:
         self.name = str(d['name'])
@@ -501,6 +587,9 @@ def apply_dict(self, d: Dict[str, Any]) -> None:
             a = d.get(x)
             if isinstance(a, int):
                 setattr(self, x, a)
+        a = d.get('colors')
+        if isinstance(a, dict):
+            self.colors = a
 
     def __init__(self, loader: Callable[[], str]):
         self._loader = loader
@@ -516,7 +605,10 @@ def raw(self) -> str:
     @property
     def kitty_opts(self) -> KittyOptions:
         if self._opts is None:
-            self._opts = KittyOptions(options_dict=parse_config(self.raw.splitlines()))
+            if self.colors is None:
+                self._opts = KittyOptions(options_dict=parse_config(self.raw.splitlines()))
+            else:
+                self._opts = KittyOptions(options_dict={k: None if v is None else to_color(v) for k, v in self.colors.items()})
         return self._opts
 
     def save_in_dir(self, dirpath: str) -> None:
@@ -562,21 +654,11 @@ def __getitem__(self, key: Union[int, str]) -> Theme:
         return self.themes[self.index_map[key]]
 
     def load_from_zip(self, path_to_zip: str) -> None:
-        with zipfile.ZipFile(path_to_zip, 'r') as zf:
-            for name in zf.namelist():
-                if os.path.basename(name) == 'themes.json':
-                    theme_file_name = name
-                    with zf.open(theme_file_name) as f:
-                        items = json.loads(f.read())
-                    break
-            else:
-                raise ValueError(f'No themes.json found in {path_to_zip}')
-
-            for item in items:
-                t = Theme(zip_file_loader(path_to_zip, theme_file_name, item['file']))
-                t.apply_dict(item)
-                if t.name:
-                    self.themes[t.name] = t
+        for item in theme_index(path_to_zip):
+            t = Theme(partial(str, item['raw']))
+            t.apply_dict(item)
+            if t.name:
+                self.themes[t.name] = t
 
     def load_from_dir(self, path: str) -> None:
         if not os.path.isdir(path):
@@ -589,7 +671,7 @@ def load_from_dir(self, path: str) -> None:
                     d = parse_theme(name, raw)
                 except (Exception, SystemExit):
                     continue
-                t = Theme(raw.__str__)
+                t = Theme(partial(str, raw))
                 t.apply_dict(d)
                 if t.name:
                     self.themes[t.name] = t
@@ -613,8 +695,7 @@ def copy(self) -> 'Themes':
     def apply_search(
         self, expression: str, mark_before: str = MARK_BEFORE, mark_after: str = MARK_AFTER
     ) -> Iterator[str]:
-        raw = '\n'.join(self.themes)
-        results = match(raw, expression, positions=True, level1=' ')
+        results = match(self.themes, expression, positions=True, level1=' ')
         themes: Dict[str, Theme] = {}
         for r in results:
             pos, k = r.split(':', 1)
@@ -628,14 +709,15 @@ def apply_search(
         self.index_map = tuple(self.themes)
 
 
-def load_themes(cache_age: float = 1., ignore_no_cache: bool = False) -> Themes:
+def load_themes(cache_age: float = 1., ignore_no_cache: bool = False, mirror: str = '') -> Themes:
     ans = Themes()
     try:
-        fetched = fetch_themes(cache_age=cache_age)
+        fetched = fetch_themes(cache_age=cache_age, url=mirror or DEFAULT_URL)
     except NoCacheFound:
         if not ignore_no_cache:
             raise
-    ans.load_from_zip(fetched)
+    else:
+        ans.load_from_zip(fetched)
     ans.load_from_dir(os.path.join(config_dir, 'themes'))
     ans.index_map = tuple(ans.themes)
     return ans
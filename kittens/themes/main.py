@@ -5,8 +5,10 @@
 import re
 import sys
 import traceback
+from contextlib import suppress
 from enum import Enum, auto
 from gettext import gettext as _
+from threading import Thread
 from typing import (
     Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 )
@@ -23,8 +25,14 @@
 from ..tui.handler import Handler
 from ..tui.line_edit import LineEdit
 from ..tui.loop import Loop
-from ..tui.operations import color_code, styled
-from .collection import MARK_AFTER, NoCacheFound, Theme, Themes, load_themes
+from ..tui.operations import (
+    color_code, move_cursor_by, set_cursor_position, styled
+)
+from ..tui.virtual_screen import VirtualScreen
+from .collection import (
+    MARK_AFTER, NoCacheFound, Theme, Themes, is_cache_stale, load_themes,
+    read_metadata, themes_cache_path
+)
 
 separator = '║'
 
@@ -100,10 +108,12 @@ def next(self, delta: int = 1, allow_wrapping: bool = True) -> bool:
         self.current_idx = idx % len(self)
         return True
 
-    def update_themes(self, themes: Themes) -> None:
+    def update_themes(self, themes: Themes, narrow_from: Optional[Themes] = None) -> None:
         self.themes = self.all_themes = themes
         if self.current_search:
             self.themes = self.all_themes.copy()
+            if narrow_from is not None:
+                self.themes.themes = {k: v for k, v in self.themes.themes.items() if k in narrow_from.themes}
             self.display_strings = tuple(map(limit_length, self.themes.apply_search(self.current_search)))
         else:
             self.display_strings = tuple(map(limit_length, (t.name for t in self.themes)))
@@ -114,8 +124,12 @@ def update_themes(self, themes: Themes) -> None:
     def update_search(self, search: str = '') -> bool:
         if search == self.current_search:
             return False
+        # Every theme matching a query also matches all prefixes of it, so
+        # when the query is extended, only the current matches need to be
+        # searched
+        narrow_from = self.themes if self.current_search and search.startswith(self.current_search) else None
         self.current_search = search
-        self.update_themes(self.all_themes)
+        self.update_themes(self.all_themes, narrow_from)
         return True
 
     def lines(self, num_rows: int) -> Iterator[Tuple[str, int, bool]]:
@@ -146,6 +160,7 @@ def __init__(self, cached_values: Dict[str, Any], cli_opts: ThemesCLIOptions) ->
         self.themes_list = ThemesList()
         self.colors_set_once = False
         self.line_edit = LineEdit()
+        self.virtual_screen = VirtualScreen()
         self.tabs = tuple('all dark light recent'.split())
 
     def update_recent(self) -> None:
@@ -208,7 +223,7 @@ def set_colors_to_current_theme(self) -> bool:
     def redraw_after_category_change(self) -> None:
         self.themes_list.update_themes(self.all_themes.filtered(self.filter_map[self.current_category]))
         self.set_colors_to_current_theme()
-        self.draw_screen()
+        self.schedule_redraw()
 
     # Theme fetching {{{
     def fetch_themes(self) -> None:
@@ -222,12 +237,43 @@ def fetching_done(themes_or_exception: Union[Themes, str]) -> None:
             self.state = State.browsing
             self.redraw_after_category_change()
 
+        def refreshing_done(themes: Themes) -> None:
+            current = self.themes_list.current_theme.name if self.themes_list else ''
+            self.all_themes = themes
+            if self.state in (State.browsing, State.searching):
+                self.themes_list.update_themes(self.all_themes.filtered(self.filter_map[self.current_category]))
+                with suppress(ValueError):
+                    self.themes_list.current_idx = self.themes_list.themes.index_map.index(current)
+                self.set_colors_to_current_theme()
+                self.schedule_redraw()
+
+        def refresh(etag: str) -> None:
+            # Runs in a daemon thread so that quitting does not have to wait
+            # for the download to finish
+            try:
+                themes = load_themes(self.cli_opts.cache_age, mirror=self.cli_opts.mirror)
+            except Exception:
+                return  # keep using the cached themes
+            m = read_metadata(themes_cache_path())
+            if m is not None and (not etag or m.etag != etag):
+                self.asyncio_loop.call_soon_threadsafe(refreshing_done, themes)
+
         def fetch() -> None:
+            # Show the cached themes immediately, even if they are stale,
+            # checking for new themes in the background
+            stale = False
             try:
-                themes: Union[Themes, str] = load_themes(self.cli_opts.cache_age)
+                try:
+                    themes: Union[Themes, str] = load_themes(-1)
+                    stale = is_cache_stale(self.cli_opts.cache_age)
+                except NoCacheFound:
+                    themes = load_themes(self.cli_opts.cache_age, mirror=self.cli_opts.mirror)
             except Exception:
                 themes = format_traceback('Failed to download themes')
             self.asyncio_loop.call_soon_threadsafe(fetching_done, themes)
+            if stale:
+                m = read_metadata(themes_cache_path())
+                Thread(target=refresh, args=(m.etag if m else '',), daemon=True, name='RefreshThemes').start()
 
         self.asyncio_loop.run_in_executor(None, fetch)
         self.draw_screen()
@@ -243,7 +289,7 @@ def on_fetching_key_event(self, key_event: KeyEventType, in_bracketed_paste: boo
 
     # Theme browsing {{{
     def draw_tab_bar(self) -> None:
-        self.print(styled(' ' * self.screen_size.cols, reverse=True), end='\r')
+        buf = [styled(' ' * self.screen_size.cols, reverse=True), '\r']
 
         def draw_tab(text: str, name: str, acc: str) -> None:
             is_active = name == self.current_category
@@ -252,50 +298,38 @@ def draw_tab(text: str, name: str, acc: str) -> None:
             else:
                 text = mark_shortcut(text, acc)
 
-            self.cmd.styled(f' {text} ', reverse=not is_active)
+            buf.append(styled(f' {text} ', reverse=not is_active))
 
         for t in self.tabs:
             draw_tab(t.capitalize(), t, t[0])
-        self.cmd.sgr('0')
-        self.print()
+        self.virtual_screen.set_line(0, ''.join(buf))
 
     def draw_bottom_bar(self) -> None:
-        self.cmd.set_cursor_position(0, self.screen_size.rows)
-        self.print(styled(' ' * self.screen_size.cols, reverse=True), end='\r')
+        buf = [styled(' ' * self.screen_size.cols, reverse=True), '\r']
         for (t, sc) in (('search (/)', 's'), ('accept (⏎)', 'c')):
             text = mark_shortcut(t.capitalize(), sc)
-            self.cmd.styled(f' {text} ', reverse=True)
-        self.cmd.sgr('0')
+            buf.append(styled(f' {text} ', reverse=True))
+        self.virtual_screen.set_line(self.screen_size.rows - 1, ''.join(buf))
 
     def draw_search_bar(self) -> None:
-        self.cmd.set_cursor_position(0, self.screen_size.rows)
-        self.cmd.clear_to_eol()
-        self.line_edit.write(self.write)
+        self.line_edit.draw(self.virtual_screen, self.screen_size.rows - 1)
 
-    def draw_theme_demo(self) -> None:
+    def theme_demo_lines(self) -> List[str]:
         theme = self.themes_list.current_theme
         xstart = self.themes_list.max_width + 3
         sz = self.screen_size.cols - xstart
         if sz < 20:
-            return
+            return []
         sz -= 1
-        y = 0
         colors = 'black red green yellow blue magenta cyan white'.split()
         trunc = sz // 8 - 1
-
-        def next_line() -> None:
-            nonlocal y
-            self.write('\r')
-            y += 1
-            self.cmd.set_cursor_position(xstart - 1, y)
-            self.write(separator + ' ')
+        lines: List[str] = []
 
         def write_para(text: str) -> None:
             text = re.sub(r'\s+', ' ', text)
             while text:
                 sp = truncate_point_for_length(text, sz)
-                self.write(text[:sp])
-                next_line()
+                lines.append(text[:sp])
                 text = text[sp:]
 
         def write_colors(bg: Optional[str] = None) -> None:
@@ -303,56 +337,47 @@ def write_colors(bg: Optional[str] = None) -> None:
                 buf = []
                 for c in colors:
                     buf.append(styled(c[:trunc], fg=c, fg_intense=intense))
-                self.cmd.styled(' '.join(buf), bg=bg, bg_intense=intense)
-                next_line()
-            next_line()
-
-        def write_line(text: str) -> None:
-            self.write(text)
-            next_line()
-
-        self.cmd.set_cursor_position()
-        next_line()
-        self.cmd.styled(theme.name.center(sz), bold=True, fg='green')
-        next_line()
+                lines.append(styled(' '.join(buf), bg=bg, bg_intense=intense))
+            lines.append('')
+
+        lines.append(styled(theme.name.center(sz), bold=True, fg='green'))
         if theme.author:
-            self.cmd.styled(theme.author.center(sz), italic=True)
-            next_line()
+            lines.append(styled(theme.author.center(sz), italic=True))
         if theme.blurb:
-            next_line()
+            lines.append('')
             write_para(theme.blurb)
-            next_line()
+            lines.append('')
         write_colors()
 
         for bg in colors:
             write_colors(bg)
+        return lines
 
     def draw_browsing_screen(self) -> None:
+        vs = self.virtual_screen
         self.draw_tab_bar()
         num_rows = self.screen_size.rows - 2
         mw = self.themes_list.max_width + 1
-        for line, width, is_current in self.themes_list.lines(num_rows):
-            num_rows -= 1
+        demo = self.theme_demo_lines() if self.themes_list else []
+        for y, (line, width, is_current) in enumerate(self.themes_list.lines(num_rows), start=1):
             if is_current:
                 line = line.replace(MARK_AFTER, '\033[' + color_code('green') + 'm')
-            self.cmd.styled('>' if is_current else ' ', fg='green')
-            self.cmd.styled(line, bold=is_current, fg='green' if is_current else None)
-            self.cmd.move_cursor_by(mw - width, 'right')
-            self.print(separator)
-        if self.themes_list:
-            self.draw_theme_demo()
+            vs.set_line(y, styled('>' if is_current else ' ', fg='green') + styled(
+                line, bold=is_current, fg='green' if is_current else None) + move_cursor_by(mw - width, 'right') + separator)
+        for y, line in enumerate(demo[:num_rows], start=1):
+            q = vs.lines[y] if y < len(vs.lines) else ''
+            vs.set_line(y, f'{q}{set_cursor_position(mw + 1, y)}{separator} {line}')
         self.draw_bottom_bar() if self.state is State.browsing else self.draw_search_bar()
 
     def on_searching_key_event(self, key_event: KeyEventType, in_bracketed_paste: bool = False) -> None:
         if key_event.matches('enter'):
             self.state = State.browsing
-            self.draw_bottom_bar()
-            return
+            return self.schedule_redraw()
         if key_event.matches('esc'):
             self.state = State.browsing
             self.themes_list.update_search('')
             self.set_colors_to_current_theme()
-            return self.draw_screen()
+            return self.schedule_redraw()
         if key_event.text:
             self.line_edit.on_text(key_event.text, in_bracketed_paste)
         else:
@@ -374,12 +399,9 @@ def on_searching_key_event(self, key_event: KeyEventType, in_bracketed_paste: bo
             q = self.line_edit.current_input[1:]
             if self.themes_list.update_search(q):
                 self.set_colors_to_current_theme()
-                self.draw_screen()
-            else:
-                self.draw_search_bar()
         else:
             self.state = State.browsing
-            self.draw_bottom_bar()
+        self.schedule_redraw()
 
     def on_browsing_key_event(self, key_event: KeyEventType, in_bracketed_paste: bool = False) -> None:
         if key_event.matches('esc') or key_event.matches_text('q'):
@@ -415,7 +437,7 @@ def start_search(self) -> None:
         self.line_edit.clear()
         self.line_edit.add_text('/' + self.themes_list.current_search)
         self.state = State.searching
-        self.draw_screen()
+        self.schedule_redraw()
 
     def next_category(self, delta: int = 1) -> None:
         idx = self.tabs.index(self.current_category) + delta + len(self.tabs)
@@ -425,7 +447,7 @@ def next_category(self, delta: int = 1) -> None:
     def next(self, delta: int = 1, allow_wrapping: bool = True) -> None:
         if self.themes_list.next(delta, allow_wrapping):
             self.set_colors_to_current_theme()
-            self.draw_screen()
+            self.schedule_redraw()
         else:
             self.cmd.bell()
     # }}}
@@ -484,19 +506,23 @@ def on_key_event(self, key_event: KeyEventType, in_bracketed_paste: bool = False
 
     @Handler.atomic_update
     def draw_screen(self) -> None:
-        self.cmd.clear_screen()
         self.enforce_cursor_state()
+        if self.state in (State.browsing, State.searching):
+            self.cmd.set_line_wrapping(False)
+            self.draw_browsing_screen()
+            self.virtual_screen.commit(self.write, self.screen_size)
+            return
+        self.virtual_screen.invalidate()
+        self.cmd.clear_screen()
         self.cmd.set_line_wrapping(False)
         if self.state is State.fetching:
             self.draw_fetching_screen()
-        elif self.state in (State.browsing, State.searching):
-            self.draw_browsing_screen()
         elif self.state is State.accepting:
             self.draw_accepting_screen()
 
     def on_resize(self, screen_size: ScreenSize) -> None:
         self.screen_size = screen_size
-        self.draw_screen()
+        self.schedule_redraw()
 
     def on_interrupt(self) -> None:
         self.quit_loop(1)
@@ -517,7 +543,14 @@ def on_eot(self) -> None:
 Check for new themes only after the specified number of days. A value of
 zero will always check for new themes. A negative value will never check
 for new themes, instead raising an error if a local copy of the themes
-is not available.
+is not available. When a local copy is available, it is shown immediately
+while checking for new themes in the background.
+
+
+--mirror
+Get the themes from the specified URL or local directory instead of from the
+kitty-themes repository on GitHub. A directory must contain a copy of the
+:file:`kitty-themes.zip` file. Useful on hosts without access to the internet.
 
 
 --reload-in
@@ -543,7 +576,7 @@ def parse_themes_args(args: List[str]) -> Tuple[ThemesCLIOptions, List[str]]:
 
 def non_interactive(cli_opts: ThemesCLIOptions, theme_name: str) -> None:
     try:
-        themes = load_themes(cli_opts.cache_age)
+        themes = load_themes(cli_opts.cache_age, mirror=cli_opts.mirror)
     except NoCacheFound as e:
         raise SystemExit(str(e))
     try:
@@ -42,6 +42,8 @@ class Handler:
     image_manager_class: Optional[Type[ImageManagerType]] = None
     use_alternate_screen = True
     mouse_tracking = MouseTracking.none
+    # The minimum time in seconds between frames drawn in response to schedule_redraw()
+    frame_interval = 1 / 60
 
     def _initialize(
         self,
@@ -168,6 +170,23 @@ def on_file_transfer_response(self, ftc: 'FileTransmissionCommand') -> None:
     def on_capability_response(self, name: str, val: str) -> None:
         pass
 
+    def draw_screen(self) -> None:
+        pass
+
+    def schedule_redraw(self) -> None:
+        ''' Redraw the screen using draw_screen() at the start of the next
+        frame. Any number of calls before then result in a single redraw,
+        done as a synchronized update. '''
+        self._tui_loop.schedule_frame(self)
+
+    @property
+    def frame_pending(self) -> bool:
+        return self._tui_loop.frame_pending
+
+    @property
+    def frame_timings(self) -> Deque[float]:
+        return self._tui_loop.frame_timings
+
     def write(self, data: Union[bytes, str]) -> None:
         if isinstance(data, str):
             data = data.encode('utf-8')
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # License: GPL v3 Copyright: 2018, Kovid Goyal <kovid at kovidgoyal.net>
 
-from typing import Callable, Tuple
+from typing import TYPE_CHECKING, Callable, Tuple
 
 from kitty.fast_data_types import truncate_point_for_length, wcswidth
 from kitty.key_encoding import EventType, KeyEvent
@@ -10,6 +10,9 @@
     RESTORE_CURSOR, SAVE_CURSOR, move_cursor_by, set_cursor_shape
 )
 
+if TYPE_CHECKING:
+    from .virtual_screen import VirtualScreen
+
 
 class LineEdit:
 
@@ -51,6 +54,13 @@ def write(self, write: Callable[[str], None], prompt: str = '', screen_cols: int
                 write(move_cursor_by(cursor_pos, 'right'))
             write(set_cursor_shape('bar'))
 
+    def draw(self, vscreen: 'VirtualScreen', y: int, prompt: str = '') -> None:
+        if self.pending_bell:
+            vscreen.bell()
+            self.pending_bell = False
+        vscreen.set_line(y, prompt + self.current_input)
+        vscreen.set_cursor(self.cursor_pos + wcswidth(prompt), y, 'bar')
+
     def add_text(self, text: str) -> None:
         if self.current_input:
             x = truncate_point_for_length(self.current_input, self.cursor_pos) if self.cursor_pos else 0
@@ -10,10 +10,14 @@
 import signal
 import sys
 import termios
+from collections import deque
 from contextlib import contextmanager
 from enum import Enum, IntFlag, auto
 from functools import partial
-from typing import Any, Callable, Dict, Generator, List, NamedTuple, Optional
+from time import monotonic
+from typing import (
+    Any, Callable, Deque, Dict, Generator, NamedTuple, Optional
+)
 
 from kitty.constants import is_macos
 from kitty.fast_data_types import (
@@ -29,7 +33,9 @@
 )
 
 from .handler import Handler
-from .operations import MouseTracking, init_state, reset_state
+from .operations import (
+    MouseTracking, init_state, pending_update, reset_state
+)
 
 
 class BinaryWrite(Protocol):
@@ -231,10 +237,11 @@ def __init__(
         self.optional_actions = optional_actions
         self.read_buf = ''
         self.decoder = codecs.getincrementaldecoder('utf-8')('ignore')
-        try:
-            self.iov_limit = max(os.sysconf('SC_IOV_MAX') - 1, 255)
-        except Exception:
-            self.iov_limit = 255
+        self.write_buf = bytearray()
+        self.frame_pending = False
+        self.last_frame_at = 0.
+        # Time taken to draw the most recent frames, in seconds
+        self.frame_timings: Deque[float] = deque(maxlen=128)
         self.parse_input_from_terminal = partial(parse_input_from_terminal, self._on_text, self._on_dcs, self._on_csi, self._on_osc, self._on_pm, self._on_apc)
         self.ebs_pat = re.compile('([\177\r\x03\x04])')
         self.in_bracketed_paste = False
@@ -360,39 +367,41 @@ def _on_apc(self, apc: str) -> None:
 
     @property
     def total_pending_bytes_to_write(self) -> int:
-        return sum(map(len, self.write_buf))
+        return len(self.write_buf)
 
     def _write_ready(self, handler: Handler, fd: int) -> None:
-        if len(self.write_buf) > self.iov_limit:
-            self.write_buf[self.iov_limit - 1] = b''.join(self.write_buf[self.iov_limit - 1:])
-            del self.write_buf[self.iov_limit:]
-        total_size = self.total_pending_bytes_to_write
-        if total_size:
+        if self.write_buf:
             try:
-                written = os.writev(fd, self.write_buf)
+                written = os.write(fd, self.write_buf)
             except BlockingIOError:
                 return
             if not written:
                 raise EOFError('The output stream is closed')
-        else:
-            written = 0
-        if written >= total_size:
-            self.write_buf: List[bytes] = []
+            del self.write_buf[:written]
+        if not self.write_buf:
             self.asycio_loop.remove_writer(fd)
             self.waiting_for_writes = False
             handler.on_writing_finished()
+
+    def schedule_frame(self, handler: Handler) -> None:
+        if self.frame_pending:
+            return
+        self.frame_pending = True
+        delay = self.last_frame_at + handler.frame_interval - monotonic()
+        if delay > 0:
+            self.asycio_loop.call_later(delay, self._draw_frame, handler)
         else:
-            consumed = 0
-            for i, buf in enumerate(self.write_buf):
-                if not written:
-                    break
-                if len(buf) <= written:
-                    written -= len(buf)
-                    consumed += 1
-                    continue
-                self.write_buf[i] = buf[written:]
-                break
-            del self.write_buf[:consumed]
+            self.asycio_loop.call_soon(self._draw_frame, handler)
+
+    def _draw_frame(self, handler: Handler) -> None:
+        if not self.frame_pending:
+            return
+        self.frame_pending = False
+        st = monotonic()
+        with pending_update(handler.write):
+            handler.draw_screen()
+        self.last_frame_at = monotonic()
+        self.frame_timings.append(self.last_frame_at - st)
 
     def quit(self, return_code: Optional[int] = None) -> None:
         if return_code is not None:
@@ -400,13 +409,14 @@ def quit(self, return_code: Optional[int] = None) -> None:
         self.asycio_loop.stop()
 
     def loop_impl(self, handler: Handler, term_manager: TermManager, image_manager: Optional[ImageManagerType] = None) -> Optional[str]:
-        self.write_buf = []
+        self.write_buf = bytearray()
+        self.frame_pending = False
         tty_fd = term_manager.tty_fd
         tb = None
         self.waiting_for_writes = True
 
         def schedule_write(data: bytes) -> None:
-            self.write_buf.append(data)
+            self.write_buf += data
             if not self.waiting_for_writes:
                 self.asycio_loop.add_writer(tty_fd, self._write_ready, handler, tty_fd)
                 self.waiting_for_writes = True
@@ -453,7 +463,7 @@ def _on_sigwinch() -> None:
                 import traceback
                 tb = traceback.format_exc()
 
-            term_manager.extra_finalize = b''.join(self.write_buf).decode('utf-8')
+            term_manager.extra_finalize = self.write_buf.decode('utf-8')
             if tb is not None:
                 self.return_code = 1
                 self._report_error_loop(tb, term_manager)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# License: GPL v3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+from typing import Callable, List, Optional, Tuple
+
+from kitty.utils import ScreenSize
+
+from .operations import (
+    clear_screen, set_cursor_position, set_cursor_shape
+)
+
+
+class VirtualScreen:
+
+    '''
+    A screen that handlers draw into line by line. Every line must be
+    self-contained, it is drawn starting from a reset SGR state. When
+    committed, only the lines that differ from the previously committed frame
+    are written to the terminal.
+    '''
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.shown_lines: List[str] = []
+        self.shown_size: Optional[Tuple[int, int]] = None
+        self.cursor: Optional[Tuple[int, int]] = None
+        self.cursor_shape = ''
+        self.ring_bell = False
+
+    def invalidate(self) -> None:
+        # Call this when something other than this object has drawn on the
+        # screen, the next commit will redraw everything
+        self.shown_size = None
+
+    def set_line(self, y: int, text: str) -> None:
+        if y >= len(self.lines):
+            self.lines.extend([''] * (y + 1 - len(self.lines)))
+        self.lines[y] = text
+
+    def print(self, *args: object, sep: str = ' ') -> None:
+        self.lines.append(sep.join(map(str, args)))
+
+    def set_cursor(self, x: int, y: int, shape: str = '') -> None:
+        self.cursor = x, y
+        self.cursor_shape = shape
+
+    def bell(self) -> None:
+        self.ring_bell = True
+
+    def commit(self, write: Callable[[str], None], screen_size: ScreenSize) -> None:
+        rows = screen_size.rows
+        buf = []
+        if self.shown_size != (rows, screen_size.cols):
+            buf.append(clear_screen())
+            self.shown_lines = []
+            self.shown_size = rows, screen_size.cols
+        lines, shown = self.lines[:rows], self.shown_lines
+        for y in range(max(len(lines), len(shown))):
+            text = lines[y] if y < len(lines) else ''
+            if text != (shown[y] if y < len(shown) else ''):
+                buf.append(f'{set_cursor_position(0, y)}\033[m\033[2K{text}')
+        buf.append('\033[m')
+        if self.ring_bell:
+            buf.append('\a')
+        if self.cursor is not None:
+            buf.append(set_cursor_position(*self.cursor))
+            if self.cursor_shape:
+                buf.append(set_cursor_shape(self.cursor_shape))
+        write(''.join(buf))
+        self.shown_lines = lines
+        self.lines = []
+        self.cursor = None
+        self.cursor_shape = ''
+        self.ring_bell = False
@@ -8,8 +8,7 @@
 from functools import lru_cache
 from gettext import gettext as _
 from typing import (
-    Any, Dict, FrozenSet, Generator, Iterable, List, Optional, Sequence, Tuple,
-    Union
+    Any, Dict, Generator, Iterable, List, Optional, Sequence, Tuple, Union
 )
 
 from kitty.cli import parse_args
@@ -25,9 +24,9 @@
 from ..tui.line_edit import LineEdit
 from ..tui.loop import Loop
 from ..tui.operations import (
-    clear_screen, colored, cursor, faint, set_line_wrapping, set_window_title,
-    sgr, styled
+    colored, faint, set_line_wrapping, set_window_title, sgr, styled
 )
+from ..tui.virtual_screen import VirtualScreen
 
 HEX, NAME, EMOTICONS, FAVORITES = 'HEX', 'NAME', 'EMOTICONS', 'FAVORITES'
 favorites_path = os.path.join(config_dir, 'unicode-input-favorites.conf')
@@ -52,12 +51,6 @@ def codepoint_ok(code: int) -> bool:
     return not (code <= 32 or code == 127 or 128 <= code <= 159 or 0xd800 <= code <= 0xdbff or 0xDC00 <= code <= 0xDFFF)
 
 
-@lru_cache(maxsize=256)
-def points_for_word(w: str) -> FrozenSet[int]:
-    from .unicode_names import codepoints_for_word
-    return codepoints_for_word(w.lower())
-
-
 @lru_cache(maxsize=4096)
 def name(cp: Union[int, str]) -> str:
     from .unicode_names import name_for_codepoint
@@ -67,20 +60,10 @@ def name(cp: Union[int, str]) -> str:
 
 @lru_cache(maxsize=256)
 def codepoints_matching_search(parts: Tuple[str, ...]) -> List[int]:
-    ans = []
     if parts and parts[0] and len(parts[0]) > 1:
-        codepoints = points_for_word(parts[0])
-        for word in parts[1:]:
-            pts = points_for_word(word)
-            if pts:
-                intersection = codepoints & pts
-                if intersection:
-                    codepoints = intersection
-                    continue
-            codepoints = frozenset(c for c in codepoints if word in name(c).lower())
-        if codepoints:
-            ans = list(sorted(codepoints))
-    return ans
+        from .unicode_names import codepoints_matching_search
+        return list(codepoints_matching_search(tuple(w.lower() for w in parts)))
+    return []
 
 
 def parse_favorites(raw: str) -> Generator[int, None, None]:
@@ -296,6 +279,7 @@ def __init__(self, cached_values: Dict[str, Any], emoji_variation: str = 'none')
         self.choice_line = ''
         self.mode = globals().get(cached_values.get('mode', 'HEX'), 'HEX')
         self.table = Table(self.emoji_variation)
+        self.virtual_screen = VirtualScreen()
         self.update_prompt()
 
     @property
@@ -389,43 +373,36 @@ def draw_title_bar(self) -> None:
         extra = self.screen_size.cols - wcswidth(text)
         if extra > 0:
             text += ' ' * extra
-        self.print(styled(text, reverse=True))
+        self.virtual_screen.print(styled(text, reverse=True))
 
     @Handler.atomic_update
     def draw_screen(self) -> None:
-        self.write(clear_screen())
+        vs = self.virtual_screen
         self.draw_title_bar()
-        y = 1
-
-        def writeln(text: str = '') -> None:
-            nonlocal y
-            self.print(text)
-            y += 1
-
         if self.mode is NAME:
-            writeln(_('Enter words from the name of the character'))
+            vs.print(_('Enter words from the name of the character'))
         elif self.mode is HEX:
-            writeln(_('Enter the hex code for the character'))
+            vs.print(_('Enter the hex code for the character'))
         else:
-            writeln(_('Enter the index for the character you want from the list below'))
-        self.line_edit.write(self.write, self.prompt)
-        with cursor(self.write):
-            writeln()
-            writeln(self.choice_line)
-            if self.mode is HEX:
-                writeln(faint(_('Type {} followed by the index for the recent entries below').format(INDEX_CHAR)))
-            elif self.mode is NAME:
-                writeln(faint(_('Use Tab or the arrow keys to choose a character from below')))
-            elif self.mode is FAVORITES:
-                writeln(faint(_('Press F12 to edit the list of favorites')))
-            self.table_at = y
-            q = self.table.layout(self.screen_size.rows - self.table_at, self.screen_size.cols)
-            if q:
-                self.write(q)
+            vs.print(_('Enter the index for the character you want from the list below'))
+        self.line_edit.draw(vs, 2, self.prompt)
+        vs.print(self.choice_line)
+        if self.mode is HEX:
+            vs.print(faint(_('Type {} followed by the index for the recent entries below').format(INDEX_CHAR)))
+        elif self.mode is NAME:
+            vs.print(faint(_('Use Tab or the arrow keys to choose a character from below')))
+        elif self.mode is FAVORITES:
+            vs.print(faint(_('Press F12 to edit the list of favorites')))
+        self.table_at = len(vs.lines)
+        q = self.table.layout(self.screen_size.rows - self.table_at, self.screen_size.cols)
+        if q:
+            for line in q.split('\r\n'):
+                vs.print(line)
+        vs.commit(self.write, self.screen_size)
 
     def refresh(self) -> None:
         self.update_prompt()
-        self.draw_screen()
+        self.schedule_redraw()
 
     def on_text(self, text: str, in_bracketed_paste: bool = False) -> None:
         self.line_edit.on_text(text, in_bracketed_paste)
@@ -517,6 +494,7 @@ def edit_favorites(self) -> None:
             if p.wait() == 0:
                 load_favorites(refresh=True)
         self.init_terminal_state()
+        self.virtual_screen.invalidate()
         self.refresh()
 
     def switch_mode(self, mode: str) -> None:
@@ -6,6 +6,7 @@
  */
 
 #include "names.h"
+#include "../../kitty/iqsort.h"
 
 static PyObject*
 all_words(PYNOARG) {
@@ -43,13 +44,12 @@ process_trie_node(const word_trie *wt, PyObject *ans) {
     }
 }
 
-static PyObject*
-codepoints_for_word(const char *word, size_t len) {
-    const word_trie *wt = all_trie_nodes;
+static const word_trie*
+find_node(const word_trie *wt, const char *word, size_t len) {
     for (size_t i = 0; i < len; i++) {
         unsigned char ch = word[i];
         size_t num_children = children_array[wt->children_offset];
-        if (!num_children) return PyFrozenSet_New(NULL);
+        if (!num_children) return NULL;
         bool found = false;
         for (size_t c = wt->children_offset + 1; c < wt->children_offset + 1 + num_children; c++) {
             uint32_t x = children_array[c];
@@ -59,15 +59,134 @@ codepoints_for_word(const char *word, size_t len) {
                 break;
             }
         }
-        if (!found) return PyFrozenSet_New(NULL);
+        if (!found) return NULL;
     }
+    return wt;
+}
+
+static PyObject*
+codepoints_for_word(const char *word, size_t len) {
+    const word_trie *wt = find_node(all_trie_nodes, word, len);
     PyObject *ans = PyFrozenSet_New(NULL);
-    if (!ans) return NULL;
+    if (!ans || !wt) return ans;
     process_trie_node(wt, ans);
     if (PyErr_Occurred()) return NULL;
     return ans;
 }
 
+// Searching {{{
+
+enum { SUBSTRING_MATCH = 1, PREFIX_MATCH = 2, WORD_MATCH = 3 };
+
+typedef struct {
+    uint8_t *levels, *hits, *seen_words;
+    uint16_t *scores;
+} SearchState;
+
+typedef struct {
+    char_type mark;
+    uint16_t score, name_len;
+} Result;
+
+static void
+set_level(SearchState *s, uint32_t match_offset, uint8_t level) {
+    size_t num = mark_groups[match_offset];
+    for (size_t i = match_offset + 1; i < match_offset + 1 + num; i++) {
+        char_type m = mark_groups[i];
+        if (s->levels[m] < level) s->levels[m] = level;
+    }
+}
+
+static void
+mark_prefix_matches(SearchState *s, const word_trie *wt, uint8_t level) {
+    if (wt->match_offset) set_level(s, wt->match_offset, level);
+    size_t num_children = children_array[wt->children_offset];
+    for (size_t c = wt->children_offset + 1; c < wt->children_offset + 1 + num_children; c++) {
+        mark_prefix_matches(s, &all_trie_nodes[children_array[c] >> 8], PREFIX_MATCH);
+    }
+}
+
+static void
+mark_substring_matches(SearchState *s, const word_trie *wt) {
+    if (wt->match_offset) {
+        size_t num = suffix_groups[wt->match_offset];
+        for (size_t i = wt->match_offset + 1; i < wt->match_offset + 1 + num; i++) {
+            uint32_t w = suffix_groups[i];
+            if (!s->seen_words[w]) {
+                s->seen_words[w] = 1;
+                set_level(s, mark_to_offset[w], SUBSTRING_MATCH);
+            }
+        }
+    }
+    size_t num_children = children_array[wt->children_offset];
+    for (size_t c = wt->children_offset + 1; c < wt->children_offset + 1 + num_children; c++) {
+        mark_substring_matches(s, &all_trie_nodes[children_array[c] >> 8]);
+    }
+}
+
+static PyObject*
+cms(PyObject *self UNUSED, PyObject *args) {
+    // Return the codepoints whose names contain every one of the specified
+    // words, best matches first. A word scores highest when it is a complete
+    // word in the name, then when it is the prefix of a word and finally when
+    // it occurs inside a word.
+    PyObject *words, *ans = NULL;
+    size_t count = 0;
+    if (!PyArg_ParseTuple(args, "O!", &PyTuple_Type, &words)) return NULL;
+    const size_t num_words = PyTuple_GET_SIZE(words), num_marks = arraysz(mark_to_cp);
+    if (!num_words || num_words > UINT8_MAX) return PyTuple_New(0);
+    SearchState s = {
+        .levels = calloc(num_marks, sizeof(uint8_t)), .hits = calloc(num_marks, sizeof(uint8_t)),
+        .seen_words = calloc(arraysz(all_words_map), sizeof(uint8_t)), .scores = calloc(num_marks, sizeof(uint16_t))
+    };
+    Result *results = NULL;
+    if (!s.levels || !s.hits || !s.seen_words || !s.scores) { PyErr_NoMemory(); goto end; }
+    for (size_t w = 0; w < num_words; w++) {
+        Py_ssize_t len;
+        const char *word = PyUnicode_AsUTF8AndSize(PyTuple_GET_ITEM(words, w), &len);
+        if (!word) goto end;
+        const word_trie *wt = find_node(all_trie_nodes, word, len);
+        if (wt) mark_prefix_matches(&s, wt, WORD_MATCH);
+        wt = find_node(all_trie_nodes + SUFFIX_TRIE_ROOT, word, len);
+        if (wt) {
+            memset(s.seen_words, 0, arraysz(all_words_map));
+            mark_substring_matches(&s, wt);
+        }
+        size_t matched = 0;
+        for (size_t m = 0; m < num_marks; m++) {
+            if (s.levels[m]) {
+                if (s.hits[m] == w) { s.hits[m]++; s.scores[m] += s.levels[m]; matched++; }
+                s.levels[m] = 0;
+            }
+        }
+        if (!matched) { ans = PyTuple_New(0); goto end; }
+    }
+    for (size_t m = 0; m < num_marks; m++) { if (s.hits[m] == num_words) count++; }
+    results = malloc(MAX(1u, count) * sizeof(Result));
+    if (!results) { PyErr_NoMemory(); goto end; }
+    count = 0;
+    for (size_t m = 0; m < num_marks; m++) {
+        if (s.hits[m] == num_words) {
+            results[count].mark = m; results[count].score = s.scores[m];
+            results[count++].name_len = strlen(name_map[m]);
+        }
+    }
+#define lt(a, b) ((a)->score > (b)->score || ((a)->score == (b)->score && ((a)->name_len < (b)->name_len || ((a)->name_len == (b)->name_len && (a)->mark < (b)->mark))))
+    QSORT(Result, results, count, lt);
+#undef lt
+    ans = PyTuple_New(count);
+    if (!ans) goto end;
+    for (size_t i = 0; i < count; i++) {
+        PyObject *t = PyLong_FromUnsignedLong(mark_to_cp[results[i].mark]);
+        if (!t) { Py_CLEAR(ans); goto end; }
+        PyTuple_SET_ITEM(ans, i, t);
+    }
+end:
+    free(s.levels); free(s.hits); free(s.seen_words); free(s.scores); free(results);
+    return ans;
+}
+// }}}
+
 static PyObject*
 cfw(PyObject *self UNUSED, PyObject *args) {
     const char *word;
@@ -87,6 +206,7 @@ nfc(PyObject *self UNUSED, PyObject *args) {
 static PyMethodDef module_methods[] = {
     {"all_words", (PyCFunction)all_words, METH_NOARGS, ""},
     {"codepoints_for_word", (PyCFunction)cfw, METH_VARARGS, ""},
+    {"codepoints_matching_search", (PyCFunction)cms, METH_VARARGS, ""},
     {"name_for_codepoint", (PyCFunction)nfc, METH_VARARGS, ""},
     {NULL, NULL, 0, NULL}        /* Sentinel */
 };
@@ -9,5 +9,9 @@ def codepoints_for_word(word: str) -> FrozenSet[int]:
     pass
 
 
+def codepoints_matching_search(words: Tuple[str, ...]) -> Tuple[int, ...]:
+    pass
+
+
 def name_for_codepoint(cp: int) -> Optional[str]:
     pass
@@ -1,12 +1,13 @@
 #!/usr/bin/env python3
 # License: GPL v3 Copyright: 2016, Kovid Goyal <kovid at kovidgoyal.net>
 
+from array import array
 from enum import IntFlag
-from typing import Iterable, Sequence, NamedTuple
+from typing import Iterable, NamedTuple, Optional, Sequence
 
 from .fast_data_types import (
-    BORDERS_PROGRAM, add_borders_rect, compile_program, get_options,
-    init_borders_program, os_window_has_background_image
+    BORDERS_PROGRAM, compile_program, get_options, init_borders_program,
+    os_window_has_background_image, set_borders_rects
 )
 from .typing import LayoutType
 from .utils import load_shaders
@@ -26,17 +27,21 @@ class Border(NamedTuple):
     color: BorderColor
 
 
-def vertical_edge(os_window_id: int, tab_id: int, color: int, width: int, top: int, bottom: int, left: int) -> None:
+# Rects are packed as five unsigned 32-bit integers: left, top, right, bottom, color
+Rects = array
+
+
+def vertical_edge(rects: Rects, color: int, width: int, top: int, bottom: int, left: int) -> None:
     if width > 0:
-        add_borders_rect(os_window_id, tab_id, left, top, left + width, bottom, color)
+        rects.extend((left, top, left + width, bottom, color))
 
 
-def horizontal_edge(os_window_id: int, tab_id: int, color: int, height: int, left: int, right: int, top: int) -> None:
+def horizontal_edge(rects: Rects, color: int, height: int, left: int, right: int, top: int) -> None:
     if height > 0:
-        add_borders_rect(os_window_id, tab_id, left, top, right, top + height, color)
+        rects.extend((left, top, right, top + height, color))
 
 
-def draw_edges(os_window_id: int, tab_id: int, colors: Sequence[int], wg: WindowGroup, borders: bool = False) -> None:
+def draw_edges(rects: Rects, colors: Sequence[int], wg: WindowGroup, borders: bool = False) -> None:
     geometry = wg.geometry
     if geometry is None:
         return
@@ -57,10 +62,10 @@ def draw_edges(os_window_id: int, tab_id: int, colors: Sequence[int], wg: Window
         right += width
         bottom += width
         pl = pr = pb = pt = width
-    horizontal_edge(os_window_id, tab_id, colors[1], pt, left, right, top)
-    horizontal_edge(os_window_id, tab_id, colors[3], pb, left, right, bt)
-    vertical_edge(os_window_id, tab_id, colors[0], pl, top, bottom, left)
-    vertical_edge(os_window_id, tab_id, colors[2], pr, top, bottom, lr)
+    horizontal_edge(rects, colors[1], pt, left, right, top)
+    horizontal_edge(rects, colors[3], pb, left, right, bt)
+    vertical_edge(rects, colors[0], pl, top, bottom, left)
+    vertical_edge(rects, colors[2], pr, top, bottom, lr)
 
 
 def load_borders_program() -> None:
@@ -73,6 +78,7 @@ class Borders:
     def __init__(self, os_window_id: int, tab_id: int):
         self.os_window_id = os_window_id
         self.tab_id = tab_id
+        self.last_submitted_rects: Optional[Rects] = None
 
     def __call__(
         self,
@@ -84,13 +90,13 @@ def __call__(
         opts = get_options()
         draw_active_borders = opts.active_border_color is not None
         draw_minimal_borders = opts.draw_minimal_borders and max(opts.window_margin_width) < 1
-        add_borders_rect(self.os_window_id, self.tab_id, 0, 0, 0, 0, BorderColor.default_bg)
+        rects = array('I')
         has_background_image = os_window_has_background_image(self.os_window_id)
         if not has_background_image:
             for br in current_layout.blank_rects:
-                add_borders_rect(self.os_window_id, self.tab_id, *br, BorderColor.default_bg)
+                rects.extend((*br, BorderColor.default_bg))
             for tbr in tab_bar_rects:
-                add_borders_rect(self.os_window_id, self.tab_id, *tbr)
+                rects.extend(tbr)
         bw = 0
         groups = tuple(all_windows.iter_all_layoutable_groups(only_visible=True))
         if groups:
@@ -107,13 +113,18 @@ def __call__(
                     color = BorderColor.active
                 else:
                     color = BorderColor.bell if wg.needs_attention else BorderColor.inactive
-                draw_edges(self.os_window_id, self.tab_id, (color, color, color, color), wg, borders=True)
+                draw_edges(rects, (color, color, color, color), wg, borders=True)
             if not has_background_image:
                 # Draw the background rectangles over the padding region
                 colors = window_bg, window_bg, window_bg, window_bg
-                draw_edges(self.os_window_id, self.tab_id, colors, wg)
+                draw_edges(rects, colors, wg)
 
         if draw_minimal_borders:
             for border_line in current_layout.get_minimal_borders(all_windows):
-                left, top, right, bottom = border_line.edges
-                add_borders_rect(self.os_window_id, self.tab_id, left, top, right, bottom, border_line.color)
+                rects.extend((*border_line.edges, border_line.color))
+
+        # Focus changes and the like often result in identical borders, in
+        # which case there is no need to re-upload them to the GPU
+        if rects != self.last_submitted_rects:
+            set_borders_rects(self.os_window_id, self.tab_id, rects)
+            self.last_submitted_rects = rects
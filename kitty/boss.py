@@ -9,8 +9,8 @@
 from functools import partial
 from gettext import gettext as _
 from typing import (
-    Any, Callable, Container, Dict, Iterable, Iterator, List, Optional, Tuple,
-    Union, cast
+    TYPE_CHECKING, Any, Callable, Container, Dict, Iterable, Iterator, List,
+    Optional, Tuple, Union, cast
 )
 from weakref import WeakValueDictionary
 
@@ -64,6 +64,9 @@
 )
 from .window import MatchPatternType, Window
 
+if TYPE_CHECKING:
+    from .rc.base import CommandStats
+
 
 class OSWindowDict(TypedDict):
     id: int
@@ -466,13 +469,15 @@ def add_child(self, window: Window) -> None:
         self.child_monitor.add_child(window.id, window.child.pid, window.child.child_fd, window.screen)
         self.window_id_map[window.id] = window
 
-    def _handle_remote_command(self, cmd: str, window: Optional[Window] = None, peer_id: int = 0) -> Union[Dict[str, Any], None, AsyncResponse]:
+    def _handle_remote_command(
+        self, cmd: str, window: Optional[Window] = None, peer_id: int = 0
+    ) -> Tuple[Union[Dict[str, Any], None, AsyncResponse], Optional['CommandStats']]:
         from .remote_control import handle_cmd
         response = None
         window = window or None
         if self.allow_remote_control == 'y' or peer_id > 0 or getattr(window, 'allow_remote_control', False):
             try:
-                response = handle_cmd(self, window, cmd, peer_id)
+                return handle_cmd(self, window, cmd, peer_id)
             except Exception as err:
                 import traceback
                 response = {'ok': False, 'error': str(err)}
@@ -486,7 +491,7 @@ def _handle_remote_command(self, cmd: str, window: Optional[Window] = None, peer
                 pass
             if not no_response:
                 response = {'ok': False, 'error': 'Remote control is disabled. Add allow_remote_control to your kitty.conf'}
-        return response
+        return response, None
 
     @ac('misc', '''
         Run a remote control command
@@ -527,13 +532,13 @@ def peer_message_received(self, msg_bytes: bytes, peer_id: int) -> Union[bytes,
         terminator = b'\x1b\\'
         if msg_bytes.startswith(cmd_prefix) and msg_bytes.endswith(terminator):
             cmd = msg_bytes[len(cmd_prefix):-len(terminator)].decode('utf-8')
-            response = self._handle_remote_command(cmd, peer_id=peer_id)
+            response, stats = self._handle_remote_command(cmd, peer_id=peer_id)
             if response is None:
                 return None
             if isinstance(response, AsyncResponse):
                 return True
             from kitty.remote_control import encode_response_for_peer
-            return encode_response_for_peer(response)
+            return encode_response_for_peer(response, stats)
 
         data = json.loads(msg_bytes.decode('utf-8'))
         if isinstance(data, dict) and data.get('cmd') == 'new_instance':
@@ -560,9 +565,9 @@ def peer_message_received(self, msg_bytes: bytes, peer_id: int) -> Union[bytes,
         return None
 
     def handle_remote_cmd(self, cmd: str, window: Optional[Window] = None) -> None:
-        response = self._handle_remote_command(cmd, window)
+        response, stats = self._handle_remote_command(cmd, window)
         if response is not None and not isinstance(response, AsyncResponse) and window is not None:
-            window.send_cmd_response(response)
+            window.send_cmd_response(response, stats)
 
     def _cleanup_tab_after_window_removal(self, src_tab: Tab) -> None:
         if len(src_tab) < 1:
@@ -1888,8 +1893,8 @@ def load_config_file(self, *paths: str, apply_overrides: bool = True) -> None:
         if bad_lines:
             self.show_bad_config_lines(bad_lines)
         self.apply_new_options(opts)
-        from .open_actions import load_open_actions
-        load_open_actions.clear_cached()
+        from .open_actions import clear_open_actions_cache
+        clear_open_actions_cache()
 
     def safe_delete_temp_file(self, path: str) -> None:
         if is_path_in_temp_dir(path):
@@ -316,6 +316,40 @@ schedule_write_to_child_python(unsigned long id, const char *prefix, PyObject *a
 #undef get_next_arg
 }
 
+bool
+schedule_write_to_child_filtered(unsigned long id, const char *data, size_t sz, write_filter_func filter, void *filter_data) {
+    // Write data to the child, passing it through filter which writes its
+    // output directly into the write buffer. The output of filter must be no
+    // larger than its input.
+    ChildMonitor *self = the_monitor;
+    bool found = false;
+    children_mutex(lock);
+    for (size_t i = 0; i < self->count; i++) {
+        if (children[i].id == id) {
+            Screen *screen = children[i].screen;
+            screen_mutex(lock, write);
+            size_t space_left = screen->write_buf_sz - screen->write_buf_used;
+            if (space_left < sz) {
+                if (screen->write_buf_used + sz > 100 * 1024 * 1024) {
+                    log_error("Too much data being sent to child with id: %lu, ignoring it", id);
+                    screen_mutex(unlock, write);
+                    break;
+                }
+                screen->write_buf_sz = screen->write_buf_used + sz;
+                screen->write_buf = PyMem_RawRealloc(screen->write_buf, screen->write_buf_sz);
+                if (screen->write_buf == NULL) { fatal("Out of memory."); }
+            }
+            found = true;
+            screen->write_buf_used += filter(data, sz, (char*)screen->write_buf + screen->write_buf_used, filter_data);
+            if (screen->write_buf_used) wakeup_io_loop(self, false);
+            screen_mutex(unlock, write);
+            break;
+        }
+    }
+    children_mutex(unlock);
+    return found;
+}
+
 static PyObject *
 needs_write(ChildMonitor UNUSED *self, PyObject *args) {
 #define needs_write_doc "needs_write(id, data) -> Queue data to be written to child."
@@ -326,6 +360,23 @@ needs_write(ChildMonitor UNUSED *self, PyObject *args) {
     Py_RETURN_FALSE;
 }
 
+static PyObject *
+needs_write_many(ChildMonitor UNUSED *self, PyObject *args) {
+#define needs_write_many_doc "needs_write_many(ids, data) -> Queue the same data to be written to all the specified children. Returns the number of children it was queued for."
+    PyObject *ids;
+    Py_buffer data;
+    if (!PyArg_ParseTuple(args, "O!y*", &PyTuple_Type, &ids, &data)) return NULL;
+    unsigned long num = 0;
+    for (Py_ssize_t i = 0; i < PyTuple_GET_SIZE(ids); i++) {
+        unsigned long id = PyLong_AsUnsignedLong(PyTuple_GET_ITEM(ids, i));
+        if (PyErr_Occurred()) break;
+        if (schedule_write_to_child(id, 1, (const char*)data.buf, (size_t)data.len)) num++;
+    }
+    PyBuffer_Release(&data);
+    if (PyErr_Occurred()) return NULL;
+    return PyLong_FromUnsignedLong(num);
+}
+
 static PyObject *
 shutdown_monitor(ChildMonitor *self, PyObject *a UNUSED) {
 #define shutdown_monitor_doc "shutdown_monitor() -> Shutdown the monitor loop."
@@ -1657,6 +1708,7 @@ send_response_to_peer(id_type peer_id, const char *msg, size_t msg_sz) {
 static PyMethodDef methods[] = {
     METHOD(add_child, METH_VARARGS)
     METHOD(needs_write, METH_VARARGS)
+    METHOD(needs_write_many, METH_VARARGS)
     METHOD(start, METH_NOARGS)
     METHOD(wakeup, METH_NOARGS)
     METHOD(shutdown_monitor, METH_NOARGS)
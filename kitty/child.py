@@ -6,6 +6,7 @@
 import sys
 from collections import defaultdict
 from contextlib import contextmanager, suppress
+from functools import lru_cache
 from typing import (
     DefaultDict, Dict, Generator, List, Optional, Sequence, Tuple
 )
@@ -157,6 +158,28 @@ def set_default_env(val: Optional[Dict[str, str]] = None) -> None:
         env.update(val)
     setattr(default_env, 'env', env)
     setattr(default_env, 'lc_ctype_set_by_user', has_lctype)
+    child_base_env.clear_cached()
+    child_env_overrides.cache_clear()
+
+
+@run_once
+def child_base_env() -> Dict[str, str]:
+    # The environment shared by all children, computed once rather than for
+    # every window, which matters when a session starts many windows at once
+    env = default_env().copy()
+    if is_macos and env.get('LC_CTYPE') == 'UTF-8' and not sys._xoptions.get(
+            'lc_ctype_before_python') and not getattr(default_env, 'lc_ctype_set_by_user', False):
+        del env['LC_CTYPE']
+    return env
+
+
+@lru_cache(maxsize=2)
+def child_env_overrides(term: str) -> Dict[str, str]:
+    ans = {'TERM': term, 'COLORTERM': 'truecolor', 'KITTY_PID': getpid()}
+    tdir = checked_terminfo_dir()
+    if tdir:
+        ans['TERMINFO'] = tdir
+    return ans
 
 
 def openpty() -> Tuple[int, int]:
@@ -211,28 +234,20 @@ def final_env(self) -> Dict[str, str]:
         from kitty.options.utils import DELETE_ENV_VAR
         env: Optional[Dict[str, str]] = getattr(self, '_final_env', None)
         if env is None:
-            env = self._final_env = default_env().copy()
-            if is_macos and env.get('LC_CTYPE') == 'UTF-8' and not sys._xoptions.get(
-                    'lc_ctype_before_python') and not getattr(default_env, 'lc_ctype_set_by_user', False):
-                del env['LC_CTYPE']
+            opts = fast_data_types.get_options()
+            env = child_base_env().copy()
             env.update(self.env)
-            env['TERM'] = fast_data_types.get_options().term
-            env['COLORTERM'] = 'truecolor'
-            env['KITTY_PID'] = getpid()
+            env.update(child_env_overrides(opts.term))
             if self.cwd:
                 # needed in case cwd is a symlink, in which case shells
                 # can use it to display the current directory name rather
                 # than the resolved path
                 env['PWD'] = self.cwd
-            tdir = checked_terminfo_dir()
-            if tdir:
-                env['TERMINFO'] = tdir
-            opts = fast_data_types.get_options()
             if opts.shell_integration != 'disabled':
                 from .shell_integration import get_supported_shell_name
                 if get_supported_shell_name(self.argv[0]):
                     env['KITTY_SHELL_INTEGRATION'] = opts.shell_integration
-            env = {k: v for k, v in env.items() if v is not DELETE_ENV_VAR}
+            env = self._final_env = {k: v for k, v in env.items() if v is not DELETE_ENV_VAR}
         return env
 
     def fork(self) -> Optional[int]:
@@ -710,6 +710,11 @@ def options_spec() -> str:
 Print out information about the selection of fallback fonts for characters not present in the main font.
 
 
+--debug-startup
+type=bool-set
+Print out how long it took to spawn each window when starting up sessions.
+
+
 --watcher
 This option is deprecated in favor of the :opt:`watcher` option in kitty.conf and should not be used.
 
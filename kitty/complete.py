@@ -4,25 +4,22 @@
 import os
 import shlex
 import sys
+from contextlib import suppress
 from typing import (
-    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple,
-    Union
+    TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional,
+    Sequence, Tuple, Union, cast
 )
 
-from kittens.runner import (
-    all_kitten_names, get_kitten_cli_docs, get_kitten_completer
-)
-
-from .cli import (
-    OptionDict, OptionSpecSeq, options_for_completion, parse_option_spec,
-    prettify
-)
 from .constants import shell_integration_dir
-from .fast_data_types import truncate_point_for_length, wcswidth
-from .rc.base import all_command_names, command_for_name
-from .shell import options_for_cmd
 from .types import run_once
-from .utils import screen_size_function
+
+if TYPE_CHECKING:
+    from .cli import OptionDict, OptionSpecSeq
+
+# Only the bare minimum is imported above, as this module is imported every
+# time the user presses TAB. Everything expensive to compute, such as the
+# parsed option specs of remote control commands and kittens is read from
+# the completion data cache, see completion_data() below.
 
 '''
 To add completion for a new shell, you need to:
@@ -121,9 +118,136 @@ def add_match_group(
         return m
 
 
+# Completion data cache {{{
+
+def serialize_option(opt: 'OptionDict') -> Dict[str, Any]:
+    ans: Dict[str, Any] = dict(opt)
+    ans['aliases'] = sorted(opt['aliases'])
+    ans['choices'] = sorted(opt['choices'])
+    return ans
+
+
+def deserialize_option(opt: Dict[str, Any]) -> 'OptionDict':
+    ans = opt.copy()
+    ans['aliases'] = frozenset(opt['aliases'])
+    ans['choices'] = frozenset(opt['choices'])
+    return cast('OptionDict', ans)
+
+
+def completion_data_key() -> List[Any]:
+    from .constants import kitty_base_dir, str_version
+    ans: List[Any] = [str_version]
+    if not getattr(sys, 'frozen', False):
+        # Running from source, so the option specs can change without the
+        # version changing
+        base = os.path.join(kitty_base_dir, 'kitty')
+        paths = [os.path.join(base, x) for x in ('cli.py', 'complete.py', 'config.py', 'rc', 'options')]
+        paths.append(os.path.join(base, 'options', 'definition.py'))
+        with suppress(OSError):
+            paths.extend(x.path for x in os.scandir(os.path.join(base, 'rc')) if x.name.endswith('.py'))
+        kittens = os.path.join(kitty_base_dir, 'kittens')
+        paths.append(kittens)
+        with suppress(OSError):
+            paths.extend(os.path.join(x.path, 'main.py') for x in os.scandir(kittens) if x.is_dir())
+        mtime = 0
+        for path in paths:
+            with suppress(OSError):
+                mtime = max(mtime, os.stat(path).st_mtime_ns)
+        ans.append(mtime)
+    return ans
+
+
+def build_completion_data(key: List[Any]) -> Dict[str, Any]:
+    import io
+    from contextlib import redirect_stderr
+
+    from kittens.runner import (
+        all_kitten_names, get_kitten_cli_docs, get_kitten_completer
+    )
+
+    from .cli import options_for_completion, parse_option_spec
+    from .config import option_names_for_completion
+    from .rc.base import all_command_names, command_for_name
+
+    def options(seq: 'OptionSpecSeq') -> List[Dict[str, Any]]:
+        return [serialize_option(opt) for opt in seq if not isinstance(opt, str)]
+
+    rc_commands = sorted(x.replace('_', '-') for x in all_command_names())
+    rc_options: Dict[str, List[Dict[str, Any]]] = {}
+    rc_args: Dict[str, List[Any]] = {}
+    for cmd_name in rc_commands:
+        cmd = command_for_name(cmd_name)
+        if cmd.options_spec:
+            rc_options[cmd_name] = options(parse_option_spec(cmd.options_spec)[0])
+        if cmd.args_completion:
+            if 'files' in cmd.args_completion:
+                title, matchers = cmd.args_completion['files']
+                if isinstance(matchers, tuple):
+                    rc_args[cmd_name] = ['files', title, list(matchers)]
+            elif 'names' in cmd.args_completion:
+                title, q = cmd.args_completion['names']
+                rc_args[cmd_name] = ['names', title, sorted(q() if callable(q) else q)]
+
+    # Kittens that have their own completer or that fail to load are
+    # left out, they are handled when completing, as before
+    kitten_options: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+    for kitten in sorted(all_kitten_names()):
+        try:
+            with redirect_stderr(io.StringIO()):
+                if get_kitten_completer(kitten) is not None:
+                    continue
+                cd = get_kitten_cli_docs(kitten)
+        except (Exception, SystemExit):
+            continue
+        kitten_options[kitten] = None if cd is None else options(parse_option_spec(cd['options']())[0])
+
+    return {
+        'key': key,
+        'rc_commands': rc_commands,
+        'rc_options': rc_options,
+        'rc_args': rc_args,
+        'kitty_options': options(options_for_completion()),
+        'config_options': list(option_names_for_completion()),
+        'kittens': sorted(all_kitten_names()),
+        'kitten_options': kitten_options,
+    }
+
+
+def load_completion_data(path: str) -> Dict[str, Any]:
+    import json
+    key = completion_data_key()
+    with suppress(Exception):
+        with open(path, 'rb') as f:
+            ans: Dict[str, Any] = json.loads(f.read())
+        if ans['key'] == key:
+            return ans
+    ans = build_completion_data(key)
+    from .config import atomic_save
+    with suppress(OSError):
+        atomic_save(json.dumps(ans).encode('utf-8'), path)
+    return ans
+
+
+@run_once
+def completion_data() -> Dict[str, Any]:
+    from .constants import cache_dir
+    try:
+        path = os.path.join(cache_dir(), 'completion-data.json')
+    except OSError:
+        return build_completion_data(completion_data_key())
+    return load_completion_data(path)
+
+
 @run_once
 def remote_control_command_names() -> Tuple[str, ...]:
-    return tuple(sorted(x.replace('_', '-') for x in all_command_names()))
+    return tuple(completion_data()['rc_commands'])
+
+
+@run_once
+def kitty_cli_options() -> 'OptionSpecSeq':
+    return [deserialize_option(x) for x in completion_data()['kitty_options']]
+
+# }}}
 
 
 # Shell specific code {{{
@@ -215,6 +339,9 @@ def fish2_input_parser(data: str) -> ParseResult:
 
 @output_serializer
 def zsh_output_serializer(ans: Completions) -> str:
+    from .cli import prettify
+    from .fast_data_types import truncate_point_for_length, wcswidth
+    from .utils import screen_size_function
     lines = []
 
     screen = screen_size_function(sys.stderr.fileno())()
@@ -337,7 +464,7 @@ def kitty_cli_opts(ans: Completions, prefix: Optional[str] = None) -> None:
     if not prefix:
         return
     matches = {}
-    for opt in options_for_completion():
+    for opt in kitty_cli_options():
         if isinstance(opt, str):
             continue
         aliases = frozenset(x for x in opt['aliases'] if x.startswith(prefix)) if prefix else opt['aliases']
@@ -346,7 +473,7 @@ def kitty_cli_opts(ans: Completions, prefix: Optional[str] = None) -> None:
     ans.add_match_group('Options', matches)
 
 
-def complete_kitty_cli_arg(ans: Completions, opt: Optional[OptionDict], prefix: str, unknown_args: Delegate) -> None:
+def complete_kitty_cli_arg(ans: Completions, opt: Optional['OptionDict'], prefix: str, unknown_args: Delegate) -> None:
     prefix = prefix or ''
     if not opt:
         if unknown_args.num_of_unknown_args > 0:
@@ -354,9 +481,8 @@ def complete_kitty_cli_arg(ans: Completions, opt: Optional[OptionDict], prefix:
         return
     dest = opt['dest']
     if dest == 'override':
-        from kitty.config import option_names_for_completion
         k = 'Config directives'
-        ans.add_match_group(k, {k+'=': '' for k in option_names_for_completion() if k.startswith(prefix)}, trailing_space=False)
+        ans.add_match_group(k, {k+'=': '' for k in completion_data()['config_options'] if k.startswith(prefix)}, trailing_space=False)
     elif dest == 'config':
 
         def is_conf_file(x: str) -> bool:
@@ -381,18 +507,18 @@ def is_conf_file(x: str) -> bool:
         complete_basic_option_args(ans, opt, prefix)
 
 
-CompleteArgsFunc = Callable[[Completions, Optional[OptionDict], str, Delegate], None]
+CompleteArgsFunc = Callable[[Completions, Optional['OptionDict'], str, Delegate], None]
 
 
 def complete_alias_map(
     ans: Completions,
     words: Sequence[str],
     new_word: bool,
-    option_map: Dict[str, OptionDict],
+    option_map: Dict[str, 'OptionDict'],
     complete_args: Optional[CompleteArgsFunc] = None
 ) -> None:
     expecting_arg = False
-    opt: Optional[OptionDict] = None
+    opt: Optional['OptionDict'] = None
     last_word = words[-1] if words else ''
     for i, w in enumerate(words):
         if expecting_arg:
@@ -429,7 +555,7 @@ def complete_cli(
     ans: Completions,
     words: Sequence[str],
     new_word: bool,
-    seq: OptionSpecSeq,
+    seq: 'OptionSpecSeq',
     complete_args: Optional[CompleteArgsFunc] = None
 ) -> None:
     option_map = {}
@@ -441,20 +567,20 @@ def complete_cli(
 
 
 def complete_remote_command(ans: Completions, cmd_name: str, words: Sequence[str], new_word: bool) -> None:
-    aliases, alias_map = options_for_cmd(cmd_name)
-    if not alias_map:
+    data = completion_data()
+    cmd_name = cmd_name.replace('_', '-')
+    options = data['rc_options'].get(cmd_name)
+    if not options:
         return
     args_completer: Optional[CompleteArgsFunc] = None
-    args_completion = command_for_name(cmd_name).args_completion
+    args_completion = data['rc_args'].get(cmd_name)
     if args_completion:
-        if 'files' in args_completion:
-            title, matchers = args_completion['files']
-            if isinstance(matchers, tuple):
-                args_completer = remote_files_completer(title, matchers)
-        elif 'names' in args_completion:
-            title, q = args_completion['names']
-            args_completer = remote_args_completer(title, q() if callable(q) else q)
-    complete_alias_map(ans, words, new_word, alias_map, complete_args=args_completer)
+        kind, title, items = args_completion
+        if kind == 'files':
+            args_completer = remote_files_completer(title, tuple(items))
+        else:
+            args_completer = remote_args_completer(title, items)
+    complete_cli(ans, words, new_word, list(map(deserialize_option, options)), complete_args=args_completer)
 
 
 def path_completion(prefix: str = '') -> Tuple[List[str], List[str]]:
@@ -506,7 +632,7 @@ def complete_files_and_dirs(
         ans.add_match_group(files_group_name, files, is_files=True)
 
 
-def complete_basic_option_args(ans: Completions, opt: OptionDict, prefix: str) -> None:
+def complete_basic_option_args(ans: Completions, opt: 'OptionDict', prefix: str) -> None:
     if opt['choices']:
         ans.add_match_group(f'Choices for {opt["dest"]}', tuple(k for k in opt['choices'] if k.startswith(prefix)))
 
@@ -517,7 +643,7 @@ def complete_dirs(ans: Completions, prefix: str = '') -> None:
         ans.add_match_group('Directories', dirs, trailing_space=False, is_files=True)
 
 
-def complete_icat_args(ans: Completions, opt: Optional[OptionDict], prefix: str, unknown_args: Delegate) -> None:
+def complete_icat_args(ans: Completions, opt: Optional['OptionDict'], prefix: str, unknown_args: Delegate) -> None:
     from .guess_mime_type import guess_type
 
     def icat_file_predicate(filename: str) -> bool:
@@ -532,7 +658,7 @@ def icat_file_predicate(filename: str) -> bool:
         complete_basic_option_args(ans, opt, prefix)
 
 
-def complete_themes_args(ans: Completions, opt: Optional[OptionDict], prefix: str, unknown_args: Delegate) -> None:
+def complete_themes_args(ans: Completions, opt: Optional['OptionDict'], prefix: str, unknown_args: Delegate) -> None:
     if opt is None:
         from kittens.themes.collection import load_themes
         themes = load_themes(cache_age=-1, ignore_no_cache=True)
@@ -544,7 +670,7 @@ def complete_themes_args(ans: Completions, opt: Optional[OptionDict], prefix: st
 
 def remote_files_completer(name: str, matchers: Tuple[str, ...]) -> CompleteArgsFunc:
 
-    def complete_files_map(ans: Completions, opt: Optional[OptionDict], prefix: str, unknown_args: Delegate) -> None:
+    def complete_files_map(ans: Completions, opt: Optional['OptionDict'], prefix: str, unknown_args: Delegate) -> None:
 
         def predicate(filename: str) -> bool:
             for m in matchers:
@@ -563,7 +689,7 @@ def predicate(filename: str) -> bool:
 def remote_args_completer(title: str, words: Iterable[str]) -> CompleteArgsFunc:
     items = sorted(words)
 
-    def complete_names_for_arg(ans: Completions, opt: Optional[OptionDict], prefix: str, unknown_args: Delegate) -> None:
+    def complete_names_for_arg(ans: Completions, opt: Optional['OptionDict'], prefix: str, unknown_args: Delegate) -> None:
         if opt is None:
             ans.add_match_group(title, {c: '' for c in items if c.startswith(prefix)})
         else:
@@ -576,7 +702,7 @@ def config_file_predicate(filename: str) -> bool:
     return filename.endswith('.conf')
 
 
-def complete_diff_args(ans: Completions, opt: Optional[OptionDict], prefix: str, unknown_args: Delegate) -> None:
+def complete_diff_args(ans: Completions, opt: Optional['OptionDict'], prefix: str, unknown_args: Delegate) -> None:
     if opt is None:
         complete_files_and_dirs(ans, prefix, 'Files')
     elif opt['dest'] == 'config':
@@ -586,21 +712,30 @@ def complete_diff_args(ans: Completions, opt: Optional[OptionDict], prefix: str,
 
 
 def complete_kitten(ans: Completions, kitten: str, words: Sequence[str], new_word: bool) -> None:
-    try:
-        completer = get_kitten_completer(kitten)
-    except SystemExit:
-        completer = None
-    if completer is not None:
-        completer(ans, words, new_word)
-        return
-    try:
-        cd = get_kitten_cli_docs(kitten)
-    except SystemExit:
-        cd = None
-    if cd is None:
-        return
-    options = cd['options']()
-    seq = parse_option_spec(options)[0]
+    kitten_options = completion_data()['kitten_options']
+    if kitten in kitten_options:
+        if kitten_options[kitten] is None:
+            return
+        seq: 'OptionSpecSeq' = list(map(deserialize_option, kitten_options[kitten]))
+    else:
+        from kittens.runner import get_kitten_cli_docs, get_kitten_completer
+
+        from .cli import parse_option_spec
+        try:
+            completer = get_kitten_completer(kitten)
+        except SystemExit:
+            completer = None
+        if completer is not None:
+            completer(ans, words, new_word)
+            return
+        try:
+            cd = get_kitten_cli_docs(kitten)
+        except SystemExit:
+            cd = None
+        if cd is None:
+            return
+        options = cd['options']()
+        seq = parse_option_spec(options)[0]
     option_map = {}
     if not new_word:
         for opt in seq:
@@ -644,7 +779,7 @@ def find_completions(words: Sequence[str], new_word: bool, entry_points: Iterabl
         else:
             if words[1] == 'kitten':
                 if len(words) == 2 or (len(words) == 3 and not new_word):
-                    ans.add_match_group('Kittens', (k for k in all_kitten_names() if k.startswith('' if len(words) == 2 else words[2])))
+                    ans.add_match_group('Kittens', (k for k in completion_data()['kittens'] if k.startswith('' if len(words) == 2 else words[2])))
                 else:
                     complete_kitten(ans, words[2], words[3:], new_word)
         return ans
@@ -652,18 +787,18 @@ def find_completions(words: Sequence[str], new_word: bool, entry_points: Iterabl
         if len(words) == 1:
             if new_word:
                 if words[0] == '+kitten':
-                    ans.add_match_group('Kittens', all_kitten_names())
+                    ans.add_match_group('Kittens', completion_data()['kittens'])
             else:
                 prefix = words[0]
                 ans.add_match_group('Entry points', (c for c in namespaced_entry_points if c.startswith(prefix)))
         else:
             if len(words) == 2 and not new_word:
-                ans.add_match_group('Kittens', (k for k in all_kitten_names() if k.startswith(words[1])))
+                ans.add_match_group('Kittens', (k for k in completion_data()['kittens'] if k.startswith(words[1])))
             else:
                 if words[0] == '+kitten':
                     complete_kitten(ans, words[1], words[2:], new_word)
     else:
-        complete_cli(ans, words, new_word, options_for_completion(), complete_kitty_cli_arg)
+        complete_cli(ans, words, new_word, kitty_cli_options(), complete_kitty_cli_arg)
 
     return ans
 
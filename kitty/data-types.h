@@ -345,6 +345,8 @@ const char* cursor_as_sgr(const Cursor *);
 PyObject* cm_thread_write(PyObject *self, PyObject *args);
 bool schedule_write_to_child(unsigned long id, unsigned int num, ...);
 bool schedule_write_to_child_python(unsigned long id, const char *prefix, PyObject* tuple_of_str_or_bytes, const char *suffix);
+typedef size_t (*write_filter_func)(const char *src, size_t src_sz, char *dest, void *filter_data);
+bool schedule_write_to_child_filtered(unsigned long id, const char *data, size_t sz, write_filter_func filter, void *filter_data);
 bool set_iutf8(int, bool);
 
 DynamicColor colorprofile_to_color(ColorProfile *self, DynamicColor entry, DynamicColor defval);
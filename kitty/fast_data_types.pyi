@@ -1,4 +1,5 @@
 import termios
+from array import array
 from ctypes import Array, c_ubyte
 from typing import (
     Any, AnyStr, Callable, Dict, List, NewType, Optional, Tuple, TypedDict,
@@ -452,10 +453,7 @@ def set_titlebar_color(os_window_id: int, color: int, use_system_color: bool = F
     pass
 
 
-def add_borders_rect(
-    os_window_id: int, tab_id: int, left: int, top: int, right: int,
-    bottom: int, color: int
-) -> None:
+def set_borders_rects(os_window_id: int, tab_id: int, rects: array[int]) -> None:
     pass
 
 
@@ -1109,7 +1107,9 @@ class Screen:
 
     def paste_bytes(self, data: bytes) -> None:
         pass
-    paste = paste_bytes
+
+    def paste(self, data: Union[str, bytes]) -> None:
+        pass
 
     def as_text(self, callback: Callable[[str], None], as_ansi: bool, insert_wrap_markers: bool) -> None:
         pass
@@ -1183,6 +1183,9 @@ class ChildMonitor:
     def needs_write(self, child_id: int, data: Union[bytes, str]) -> bool:
         pass
 
+    def needs_write_many(self, child_ids: Tuple[int, ...], data: bytes) -> int:
+        pass
+
     def set_iutf8_winid(self, win_id: int, on: bool) -> bool:
         pass
 
@@ -7,13 +7,18 @@
 #
 
 import math
-from functools import partial as p, wraps
+import os
+import struct
+from contextlib import suppress
+from functools import lru_cache, partial as p, wraps
 from itertools import repeat
 from typing import (
     Any, Callable, Dict, Iterable, Iterator, List, MutableSequence, Optional,
     Sequence, Tuple
 )
 
+from kitty.constants import cache_dir, str_version
+
 scale = (0.001, 1., 1.5, 2.)
 _dpi = 96.0
 BufType = MutableSequence[int]
@@ -29,14 +34,38 @@ def thickness(level: int = 1, horizontal: bool = True) -> int:
     return int(math.ceil(pts * (_dpi / 72.0)))
 
 
+# The drawing primitives below operate on whole rows and columns of pixels at a
+# time using slice assignment, which is much faster than per pixel loops in
+# Python. Rows are contiguous slices and columns are slices with a step of
+# width.
+
+
+def fill_row(buf: BufType, width: int, y: int, x1: int, x2: int, val: int = 255) -> None:
+    if x2 > x1:
+        start, end = y * width + x1, y * width + x2
+        if start < 0 or end > len(buf):
+            for i in range(start, end):
+                buf[i] = val
+        else:
+            buf[start:end] = bytes((val,)) * (x2 - x1)
+
+
+def fill_column(buf: BufType, width: int, x: int, y1: int, y2: int, val: int = 255) -> None:
+    if y2 > y1:
+        start, last = x + y1 * width, x + (y2 - 1) * width
+        if start < 0 or last >= len(buf):
+            for i in range(start, last + 1, width):
+                buf[i] = val
+        else:
+            buf[start:last + 1:width] = bytes((val,)) * (y2 - y1)
+
+
 def draw_hline(buf: BufType, width: int, x1: int, x2: int, y: int, level: int) -> None:
     ' Draw a horizontal line between [x1, x2) centered at y with the thickness given by level '
     sz = thickness(level=level, horizontal=False)
     start = y - sz // 2
     for y in range(start, start + sz):
-        offset = y * width
-        for x in range(x1, x2):
-            buf[offset + x] = 255
+        fill_row(buf, width, y, x1, x2)
 
 
 def draw_vline(buf: BufType, width: int, y1: int, y2: int, x: int, level: int) -> None:
@@ -44,8 +73,7 @@ def draw_vline(buf: BufType, width: int, y1: int, y2: int, x: int, level: int) -
     sz = thickness(level=level, horizontal=True)
     start = x - sz // 2
     for x in range(start, start + sz):
-        for y in range(y1, y2):
-            buf[x + y * width] = 255
+        fill_column(buf, width, x, y1, y2)
 
 
 def half_hline(buf: BufType, width: int, height: int, level: int = 1, which: str = 'left', extend_by: int = 0) -> None:
@@ -58,7 +86,7 @@ def half_vline(buf: BufType, width: int, height: int, level: int = 1, which: str
     draw_vline(buf, width, y1, y2, width // 2, level)
 
 
-def get_holes(sz: int, hole_sz: int, num: int) -> List[Tuple[int, ...]]:
+def get_holes(sz: int, hole_sz: int, num: int) -> List[Tuple[int, int]]:
     all_holes_use = (num + 1) * hole_sz
     individual_block_size = (sz - all_holes_use) // (num + 1)
     half_hole_sz = hole_sz // 2
@@ -68,7 +96,7 @@ def get_holes(sz: int, hole_sz: int, num: int) -> List[Tuple[int, ...]]:
         left = max(0, pos)
         right = min(sz, pos + hole_sz)
         if right > left:
-            holes.append(tuple(range(left, right)))
+            holes.append((left, right))
         pos = right + individual_block_size
     return holes
 
@@ -82,10 +110,8 @@ def add_hholes(buf: BufType, width: int, height: int, level: int = 1, num: int =
     start = height // 2 - line_sz // 2
     holes = get_holes(width, hole_sz, num)
     for y in range(start, start + line_sz):
-        offset = y * width
-        for hole in holes:
-            for x in hole:
-                buf[offset + x] = 0
+        for left, right in holes:
+            fill_row(buf, width, y, left, right, 0)
 
 
 def add_vholes(buf: BufType, width: int, height: int, level: int = 1, num: int = 1) -> None:
@@ -94,9 +120,8 @@ def add_vholes(buf: BufType, width: int, height: int, level: int = 1, num: int =
     start = width // 2 - line_sz // 2
     holes = get_holes(height, hole_sz, num)
     for x in range(start, start + line_sz):
-        for hole in holes:
-            for y in hole:
-                buf[x + width * y] = 0
+        for top, bottom in holes:
+            fill_column(buf, width, x, top, bottom, 0)
 
 
 def hline(buf: BufType, width: int, height: int, level: int = 1) -> None:
@@ -146,22 +171,29 @@ def cross(buf: BufType, width: int, height: int, a: int = 1, b: int = 1, c: int
 
 
 def downsample(src: BufType, dest: BufType, dest_width: int, dest_height: int, factor: int = 4) -> None:
-    src_width = 4 * dest_width
-
-    def average_intensity_in_src(dest_x: int, dest_y: int) -> int:
-        src_y = dest_y * factor
-        src_x = dest_x * factor
-        total = 0
-        for y in range(src_y, src_y + factor):
-            offset = src_width * y
-            for x in range(src_x, src_x + factor):
-                total += src[offset + x]
-        return total // (factor * factor)
-
+    # Each row of src is spread into 16 bit lanes of a big integer, so that
+    # adding the integers sums the rows column wise and adding shifted copies
+    # sums adjacent columns, all without per pixel Python code. The lanes
+    # cannot overflow as they hold at most factor * factor * 255.
+    src_width = factor * dest_width
+    area = factor * factor
+    lanes = bytearray(2 * src_width)
     for y in range(dest_height):
         offset = dest_width * y
+        src_offset = src_width * y * factor
+        column_sums = 0
+        for i in range(src_offset, src_offset + factor * src_width, src_width):
+            lanes[::2] = src[i:i + src_width]
+            column_sums += int.from_bytes(lanes, 'little')
+        block_sums = column_sums
+        for i in range(1, factor):
+            block_sums += column_sums >> (16 * i)
+        sums = block_sums.to_bytes(2 * src_width, 'little')
         for x in range(dest_width):
-            dest[offset + x] = min(255, dest[offset + x] + average_intensity_in_src(x, y))
+            i = 2 * x * factor
+            val = (sums[i] | (sums[i + 1] << 8)) // area
+            if val:
+                dest[offset + x] = min(255, dest[offset + x] + val)
 
 
 class SSByteArray(bytearray):
@@ -186,10 +218,10 @@ def supersampled_wrapper(buf: BufType, width: int, height: int, *args: Any, **kw
 
 def fill_region(buf: BufType, width: int, height: int, xlimits: Iterable[Iterable[float]], inverted: bool = False) -> None:
     full, empty = (0, 255) if inverted else (255, 0)
-    for y in range(height):
-        offset = y * width
-        for x, (upper, lower) in enumerate(xlimits):
-            buf[x + offset] = full if upper <= y <= lower else empty
+    for x, (upper, lower) in enumerate(xlimits):
+        fill_column(buf, width, x, 0, height, empty)
+        # the pixels with upper <= y <= lower
+        fill_column(buf, width, x, max(0, math.ceil(upper)), min(height, math.floor(lower) + 1), full)
 
 
 def line_equation(x1: int, y1: int, x2: int, y2: int) -> Callable[[int], float]:
@@ -264,13 +296,9 @@ def thick_line(buf: BufType, width: int, height: int, thickness_in_pixels: int,
     leq = line_equation(*p1, *p2)
     delta, extra = divmod(thickness_in_pixels, 2)
 
-    for x in range(p1[0], p2[0] + 1):
-        if 0 <= x < width:
-            y_p = leq(x)
-            r = range(int(y_p) - delta, int(y_p) + delta + extra)
-            for y in r:
-                if 0 <= y < height:
-                    buf[x + y * width] = 255
+    for x in range(max(0, p1[0]), min(width, p2[0] + 1)):
+        y_p = int(leq(x))
+        fill_column(buf, width, x, max(0, y_p - delta), min(height, y_p + delta + extra))
 
 
 @supersampled()
@@ -402,11 +430,14 @@ def D(buf: SSByteArray, width: int, height: int, left: bool = True) -> None:
     else:
         mbuf = bytearray(width * height)
         fill_region(mbuf, width, height, xlimits)
-        for y in range(height):
-            offset = y * width
-            for src_x in range(width):
-                dest_x = width - 1 - src_x
-                buf[offset + dest_x] = mbuf[offset + src_x]
+        mirror(mbuf, buf, width, height)
+
+
+def mirror(src: BufType, dest: BufType, width: int, height: int) -> None:
+    ' Copy src into dest flipped horizontally '
+    for y in range(height):
+        offset = y * width
+        dest[offset:offset + width] = src[offset:offset + width][::-1]
 
 
 def draw_parametrized_curve(
@@ -426,13 +457,9 @@ def draw_parametrized_curve(
             continue
         x_p, y_p = p
         seen.add(p)
-        for y in range(y_p - delta, y_p + delta + extra):
-            if 0 <= y < height:
-                offset = y * width
-                for x in range(x_p - delta, x_p + delta + extra):
-                    if 0 <= x < width:
-                        pos = offset + x
-                        buf[pos] = min(255, buf[pos] + 255)
+        x1, x2 = max(0, x_p - delta), min(width, x_p + delta + extra)
+        for y in range(max(0, y_p - delta), min(height, y_p + delta + extra)):
+            fill_row(buf, width, y, x1, x2)
 
 
 def rectircle_equations(
@@ -507,11 +534,7 @@ def rounded_separator(buf: SSByteArray, width: int, height: int, level: int = 1,
         mbuf = SSByteArray(width * height)
         mbuf.supersample_factor = buf.supersample_factor
         draw_parametrized_curve(mbuf, width, height, level, bezier_x, bezier_y)
-        for y in range(height):
-            offset = y * width
-            for src_x in range(width):
-                dest_x = width - 1 - src_x
-                buf[offset + dest_x] = mbuf[offset + src_x]
+        mirror(mbuf, buf, width, height)
 
 
 def half_dhline(buf: BufType, width: int, height: int, level: int = 1, which: str = 'left', only: Optional[str] = None) -> Tuple[int, int]:
@@ -615,6 +638,9 @@ def inner_corner(buf: BufType, width: int, height: int, which: str = 'tl', level
     draw_vline(buf, width, y1, y2, width // 2 + (xd * hgap), level)
 
 
+inverted_intensities = bytes(range(255, -1, -1))
+
+
 def shade(buf: BufType, width: int, height: int, light: bool = False, invert: bool = False) -> None:
     square_sz = max(1, width // 12)
     number_of_rows = height // square_sz
@@ -646,11 +672,7 @@ def shade(buf: BufType, width: int, height: int, light: bool = False, invert: bo
                             break
                         dest[off + x] = 255
     if invert:
-        for y in range(height):
-            off = width * y
-            for x in range(width):
-                q = off + x
-                buf[q] = 255 - dest[q]
+        buf[:width * height] = dest.translate(inverted_intensities)
 
 
 def quad(buf: BufType, width: int, height: int, x: int = 0, y: int = 0) -> None:
@@ -661,9 +683,7 @@ def quad(buf: BufType, width: int, height: int, x: int = 0, y: int = 0) -> None:
     top = y * num_rows
     bottom = height if y else num_rows
     for r in range(top, bottom):
-        off = r * width
-        for c in range(left, right):
-            buf[off + c] = 255
+        fill_row(buf, width, r, left, right)
 
 
 def sextant(buf: BufType, width: int, height: int, level: int = 1, which: int = 0) -> None:
@@ -680,9 +700,7 @@ def draw_sextant(row: int = 0, col: int = 0) -> None:
         else:
             x_start, x_end = width // 2, width
         for r in range(y_start, y_end):
-            off = r * width
-            for c in range(x_start, x_end):
-                buf[c + off] = 255
+            fill_row(buf, width, r, x_start, x_end)
 
     def add_row(q: int, r: int) -> None:
         if q & 1:
@@ -704,18 +722,11 @@ def smooth_mosaic(
     bx, by = int(b[0] * (width - 1)), int(b[1] * (height - 1))
     line = line_equation(ax, ay, bx, by)
 
-    def lower_condition(x: int, y: int) -> bool:
-        return y >= line(x)
-
-    def upper_condition(x: int, y: int) -> bool:
-        return y <= line(x)
-
-    condition = lower_condition if lower else upper_condition
-    for y in range(height):
-        offset = width * y
-        for x in range(width):
-            if condition(x, y):
-                buf[offset + x] = 255
+    for x in range(width):
+        if lower:  # y >= line(x)
+            fill_column(buf, width, x, max(0, math.ceil(line(x))), height)
+        else:  # y <= line(x)
+            fill_column(buf, width, x, 0, min(height, math.floor(line(x)) + 1))
 
 
 def eight_range(size: int, which: int) -> range:
@@ -745,9 +756,7 @@ def eight_bar(buf: BufType, width: int, height: int, level: int = 1, which: int
         y_range = range(0, height)
         x_range = eight_range(width, which)
     for y in y_range:
-        offset = y * width
-        for x in x_range:
-            buf[offset + x] = 255
+        fill_row(buf, width, y, x_range.start, x_range.stop)
 
 
 def eight_block(buf: BufType, width: int, height: int, level: int = 1, which: Tuple[int, ...] = (0,), horizontal: bool = False) -> None:
@@ -762,12 +771,9 @@ def braille_dot(buf: BufType, width: int, height: int, col: int, row: int) -> No
     left_margin = (width - 3 * dot_width) // 2
     x_start = left_margin + (col * 2 * dot_width)
     y_start = top_margin + (row * 2 * dot_height)
-    if y_start < height:
+    if y_start < height and x_start < width:
         for y in range(y_start, min(height, y_start + dot_height)):
-            if x_start < width:
-                offset = y * width
-                for x in range(x_start, min(width, x_start + dot_width)):
-                    buf[offset + x] = 255
+            fill_row(buf, width, y, x_start, min(width, x_start + dot_width))
 
 
 def braille(buf: BufType, width: int, height: int, which: int = 0) -> None:
@@ -1033,7 +1039,66 @@ def render_box_char(ch: str, buf: BufType, width: int, height: int, dpi: float =
     return buf
 
 
-def render_missing_glyph(buf: BufType, width: int, height: int) -> None:
+class RenderedBoxChars:
+
+    ''' A persistent cache of rendered box drawing characters for a single
+    combination of cell size, dpi and scale. Rendered characters are
+    appended to a file as (codepoint, pixels) records, so that they need to
+    be rendered only once across all kitty instances. '''
+
+    def __init__(self, width: int, height: int, dpi: float, scale: Sequence[float]):
+        self.pixels_size = width * height
+        self.record_size = 4 + self.pixels_size
+        name = '{}x{}-{!r}-{}.bin'.format(width, height, dpi, '-'.join(map(repr, scale)))
+        self.path = os.path.join(cache_dir(), 'box-drawing', str_version, name)
+        self.rendered: Dict[int, bytes] = {}
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        for offset in range(0, len(data) - self.record_size + 1, self.record_size):
+            codepoint = struct.unpack_from('<I', data, offset)[0]
+            self.rendered[codepoint] = data[offset + 4:offset + self.record_size]
+
+    def get(self, codepoint: int) -> Optional[bytes]:
+        return self.rendered.get(codepoint)
+
+    def add(self, codepoint: int, pixels: bytes) -> None:
+        self.rendered[codepoint] = pixels
+        with suppress(OSError):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # a single write to a file opened for appending is atomic, so
+            # concurrent kitty instances cannot corrupt each others records
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, struct.pack('<I', codepoint) + pixels)
+            finally:
+                os.close(fd)
+
+
+@lru_cache(maxsize=16)
+def rendered_box_chars(width: int, height: int, dpi: float, scale: Sequence[float]) -> RenderedBoxChars:
+    return RenderedBoxChars(width, height, dpi, scale)
+
+
+def render_box_char_cached(codepoint: int, buf: BufType, width: int, height: int, dpi: float = 96.0) -> BufType:
+    global _dpi
+    _dpi = dpi
+    cache = rendered_box_chars(width, height, dpi, scale)
+    pixels = cache.get(codepoint)
+    if pixels is None:
+        render_box_char(chr(codepoint), buf, width, height, dpi)
+        cache.add(codepoint, bytes(buf))
+    else:
+        buf[:cache.pixels_size] = pixels
+    return buf
+
+
+def render_missing_glyph(buf: BufType, width: int, height: int, dpi: Optional[float] = None) -> None:
+    global _dpi
+    if dpi is not None:
+        _dpi = dpi
     hgap = thickness(level=0, horizontal=True) + 1
     vgap = thickness(level=0, horizontal=False) + 1
     draw_hline(buf, width, hgap, width - hgap + 1, vgap, 0)
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 # License: GPL v3 Copyright: 2016, Kovid Goyal <kovid at kovidgoyal.net>
 
+import json
+import os
 import re
 from functools import lru_cache
-from typing import Dict, Generator, List, Optional, Tuple, cast
+from typing import Any, Dict, Generator, List, Optional, Tuple, cast
+
+from kitty.constants import cache_dir, str_version
 
 from kitty.fast_data_types import (
     FC_DUAL, FC_MONO, FC_SLANT_ITALIC, FC_SLANT_ROMAN, FC_WEIGHT_BOLD,
@@ -11,6 +15,7 @@
     fc_match_postscript_name, parse_font_feature
 )
 from kitty.options.types import Options
+from kitty.types import run_once
 from kitty.typing import FontConfigPattern
 from kitty.utils import log_error
 
@@ -23,6 +28,106 @@
 
 
 FontMap = Dict[str, Dict[str, List[FontConfigPattern]]]
+FONT_CACHE_VERSION = 1
+
+
+def font_cache_path() -> str:
+    return os.path.join(cache_dir(), 'fontconfig-fonts.json')
+
+
+def newest_mtime(path: str) -> Optional[int]:
+    # Fonts can be installed in sub-directories of the font directories,
+    # adding them changes only the mtime of the sub-directory
+    try:
+        ans = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    for dirpath, dirnames, filenames in os.walk(path):
+        for x in dirnames:
+            try:
+                ans = max(ans, os.stat(os.path.join(dirpath, x)).st_mtime_ns)
+            except OSError:
+                pass
+    return ans
+
+
+def font_cache_key() -> List[Any]:
+    # The results of font lookups only change when fonts are installed or
+    # removed or the fontconfig configuration changes, both of which change
+    # the mtimes of one of the fontconfig cache, config or font directories
+    home = os.path.expanduser('~')
+    xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(home, '.cache')
+    xdg_config = os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, '.config')
+    xdg_data = os.environ.get('XDG_DATA_HOME') or os.path.join(home, '.local', 'share')
+    paths = [
+        os.path.join(xdg_cache, 'fontconfig'), '/var/cache/fontconfig', '/usr/lib/fontconfig/cache',
+        '/etc/fonts', '/etc/fonts/fonts.conf', '/etc/fonts/conf.d',
+        os.path.join(xdg_config, 'fontconfig'), os.path.join(xdg_config, 'fontconfig', 'fonts.conf'),
+        os.path.join(xdg_config, 'fontconfig', 'conf.d'),
+    ]
+    font_dirs = ['/usr/share/fonts', '/usr/local/share/fonts', os.path.join(xdg_data, 'fonts'), os.path.join(home, '.fonts')]
+    ans: List[Any] = [FONT_CACHE_VERSION, str_version, os.environ.get('FONTCONFIG_FILE'), os.environ.get('FONTCONFIG_PATH')]
+    for path in paths:
+        try:
+            ans.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            ans.append(None)
+    for path in font_dirs:
+        ans.append(newest_mtime(path))
+    return ans
+
+
+@run_once
+def font_cache() -> Dict[str, Any]:
+    key = font_cache_key()
+    try:
+        with open(font_cache_path(), 'rb') as f:
+            ans: Dict[str, Any] = json.loads(f.read())
+    except FileNotFoundError:
+        ans = {}
+    except Exception as err:
+        log_error(f'Failed to read the font cache with error: {err}')
+        ans = {}
+    if ans.get('key') != key:
+        ans = {'key': key, 'fc_list': {}, 'best_match': {}}
+    return ans
+
+
+font_cache_dirty = False
+
+
+def mark_font_cache_dirty() -> None:
+    # Lookups happen one at a time during startup, so the cache is written
+    # once after font setup, or at exit for lookups made later
+    global font_cache_dirty
+    if not font_cache_dirty:
+        font_cache_dirty = True
+        if not getattr(mark_font_cache_dirty, 'registered', False):
+            import atexit
+            atexit.register(save_font_cache)
+            setattr(mark_font_cache_dirty, 'registered', True)
+
+
+def save_font_cache() -> None:
+    global font_cache_dirty
+    if not font_cache_dirty:
+        return
+    font_cache_dirty = False
+    from kitty.config import atomic_save
+    try:
+        atomic_save(json.dumps(font_cache()).encode('utf-8'), font_cache_path())
+    except Exception as err:
+        log_error(f'Failed to save the font cache with error: {err}')
+
+
+def cached_fc_list(spacing: int = -1, allow_bitmapped_fonts: bool = False) -> Tuple[FontConfigPattern, ...]:
+    q: Dict[str, List[FontConfigPattern]] = font_cache()['fc_list']
+    key = f'{spacing}:{int(allow_bitmapped_fonts)}'
+    ans = q.get(key)
+    if ans is None:
+        ans = q[key] = list(fc_list(spacing, allow_bitmapped_fonts))
+        mark_font_cache_dirty()
+    return tuple(ans)
 
 
 def create_font_map(all_fonts: Tuple[FontConfigPattern, ...]) -> FontMap:
@@ -42,16 +147,16 @@ def create_font_map(all_fonts: Tuple[FontConfigPattern, ...]) -> FontMap:
 @lru_cache()
 def all_fonts_map(monospaced: bool = True) -> FontMap:
     if monospaced:
-        ans = fc_list(FC_DUAL) + fc_list(FC_MONO)
+        ans = cached_fc_list(FC_DUAL) + cached_fc_list(FC_MONO)
     else:
         # allow non-monospaced and bitmapped fonts as these are used for
         # symbol_map
-        ans = fc_list(-1, True)
+        ans = cached_fc_list(-1, True)
     return create_font_map(ans)
 
 
 def list_fonts() -> Generator[ListedFont, None, None]:
-    for fd in fc_list():
+    for fd in cached_fc_list():
         f = fd.get('family')
         if f and isinstance(f, str):
             fn_ = fd.get('full_name')
@@ -91,6 +196,16 @@ def find_font_features(postscript_name: str) -> Tuple[FontFeature, ...]:
 
 
 def find_best_match(family: str, bold: bool = False, italic: bool = False, monospaced: bool = True) -> FontConfigPattern:
+    q: Dict[str, FontConfigPattern] = font_cache()['best_match']
+    key = f'{family}:{int(bold)}{int(italic)}{int(monospaced)}'
+    ans = q.get(key)
+    if ans is None:
+        ans = q[key] = _find_best_match(family, bold, italic, monospaced)
+        mark_font_cache_dirty()
+    return ans
+
+
+def _find_best_match(family: str, bold: bool = False, italic: bool = False, monospaced: bool = True) -> FontConfigPattern:
     q = family_name_to_key(family)
     font_map = all_fonts_map(monospaced)
 
@@ -3,7 +3,7 @@
 
 import ctypes
 import sys
-from functools import partial
+from functools import lru_cache, partial
 from math import ceil, cos, floor, pi
 from typing import (
     TYPE_CHECKING, Any, Callable, Dict, Generator, List, Optional, Tuple,
@@ -17,7 +17,7 @@
     test_render_line, test_shape
 )
 from kitty.fonts.box_drawing import (
-    BufType, render_box_char, render_missing_glyph
+    BufType, render_box_char_cached, render_missing_glyph
 )
 from kitty.options.types import Options, defaults
 from kitty.typing import CoreTextFont, FontConfigPattern
@@ -31,7 +31,7 @@
 else:
     from .fontconfig import (
         find_font_features, font_for_family as font_for_family_fontconfig,
-        get_font_files as get_font_files_fontconfig
+        get_font_files as get_font_files_fontconfig, save_font_cache
     )
 
 FontObject = Union[CoreTextFont, FontConfigPattern]
@@ -200,6 +200,10 @@ def set_font_family(opts: Optional[Options] = None, override_font_size: Optional
     font_features.update(opts.font_features)
     if debug_font_matching:
         dump_faces(ftypes, indices)
+    if not is_macos:
+        save_font_cache()
+    # the box drawing scale may have changed
+    prerender_cells.cache_clear()
     set_font_data(
         render_box_drawing, prerender_function, descriptor_for_idx,
         indices['bold'], indices['italic'], indices['bi'], num_symbol_fonts,
@@ -297,7 +301,7 @@ def render_special(
 
     if missing:
         buf = bytearray(cell_width * cell_height)
-        render_missing_glyph(buf, cell_width, cell_height)
+        render_missing_glyph(buf, cell_width, cell_height, (dpi_x + dpi_y) / 2)
         return CharTexture.from_buffer(buf)
 
     ans = CharTexture()
@@ -336,17 +340,12 @@ def vert(edge: str, width_pt: float = 1) -> None:
         width = max(1, min(int(round(width_pt * dpi_x / 72.0)), cell_width))
         left = 0 if edge == 'left' else max(0, cell_width - width)
         for y in range(cell_height):
-            offset = y * cell_width + left
-            for x in range(offset, offset + width):
-                ans[x] = 255
+            ctypes.memset(ctypes.addressof(ans) + y * cell_width + left, 255, width)
 
     def horz(edge: str, height_pt: float = 1) -> None:
         height = max(1, min(int(round(height_pt * dpi_y / 72.0)), cell_height))
         top = 0 if edge == 'top' else max(0, cell_height - height)
-        for y in range(top, top + height):
-            offset = y * cell_width
-            for x in range(cell_width):
-                ans[offset + x] = 255
+        ctypes.memset(ctypes.addressof(ans) + top * cell_width, 255, cell_width * height)
 
     if which == 1:  # beam
         vert('left', cursor_beam_thickness)
@@ -360,7 +359,8 @@ def horz(edge: str, height_pt: float = 1) -> None:
     return ans
 
 
-def prerender_function(
+@lru_cache(maxsize=8)
+def prerender_cells(
     cell_width: int,
     cell_height: int,
     baseline: int,
@@ -372,8 +372,11 @@ def prerender_function(
     cursor_underline_thickness: float,
     dpi_x: float,
     dpi_y: float
-) -> Tuple[Union[int, CBufType], ...]:
-    # Pre-render the special underline, strikethrough and missing and cursor cells
+) -> Tuple[CBufType, ...]:
+    # The rendered cells depend only on the cell metrics, so font groups with
+    # identical metrics, such as those created when changing the font size
+    # back and forth or in many OS windows, share them. They are never
+    # modified after rendering.
     f = partial(
         render_special, cell_width=cell_width, cell_height=cell_height, baseline=baseline,
         underline_position=underline_position, underline_thickness=underline_thickness,
@@ -384,15 +387,34 @@ def prerender_function(
         render_cursor, cursor_beam_thickness=cursor_beam_thickness,
         cursor_underline_thickness=cursor_underline_thickness, cell_width=cell_width,
         cell_height=cell_height, dpi_x=dpi_x, dpi_y=dpi_y)
-    cells = f(1), f(2), f(3), f(0, True), f(missing=True), c(1), c(2), c(3)
+    return f(1), f(2), f(3), f(0, True), f(missing=True), c(1), c(2), c(3)
+
+
+def prerender_function(
+    cell_width: int,
+    cell_height: int,
+    baseline: int,
+    underline_position: int,
+    underline_thickness: int,
+    strikethrough_position: int,
+    strikethrough_thickness: int,
+    cursor_beam_thickness: float,
+    cursor_underline_thickness: float,
+    dpi_x: float,
+    dpi_y: float
+) -> Tuple[Union[int, CBufType], ...]:
+    # Pre-render the special underline, strikethrough and missing and cursor cells
+    cells = prerender_cells(
+        cell_width, cell_height, baseline, underline_position, underline_thickness, strikethrough_position,
+        strikethrough_thickness, cursor_beam_thickness, cursor_underline_thickness, dpi_x, dpi_y)
     return tuple(map(ctypes.addressof, cells)) + (cells,)
 
 
 def render_box_drawing(codepoint: int, cell_width: int, cell_height: int, dpi: float) -> Tuple[int, CBufType]:
     CharTexture = ctypes.c_ubyte * (cell_width * cell_height)
     buf = CharTexture()
-    render_box_char(
-        chr(codepoint), cast(BufType, buf), cell_width, cell_height, dpi
+    render_box_char_cached(
+        codepoint, cast(BufType, buf), cell_width, cell_height, dpi
     )
     return ctypes.addressof(buf), buf
 
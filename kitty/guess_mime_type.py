@@ -3,7 +3,9 @@
 
 import os
 from contextlib import suppress
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from .types import run_once
 
 known_extensions = {
     'asciidoc': 'text/asciidoctor',
@@ -46,14 +48,101 @@ def initialize_mime_database() -> None:
         init((local_defs,))
 
 
+@run_once
+def user_mime_types() -> Dict[str, str]:
+    from kitty.constants import config_dir
+    ans: Dict[str, str] = {}
+    with suppress(OSError), open(os.path.join(config_dir, 'mime.types')) as f:
+        for line in f:
+            words = line.partition('#')[0].split()
+            for ext in words[1:]:
+                ans[ext] = words[0]
+    return ans
+
+
+def system_mime_database_key() -> List[Any]:
+    import sys
+    from mimetypes import knownfiles
+    from kitty.constants import str_version
+    files = []
+    for path in knownfiles:
+        with suppress(OSError):
+            st = os.stat(path)
+            files.append([path, st.st_mtime_ns, st.st_size])
+    return [str_version, list(sys.version_info[:2]), files]
+
+
+@run_once
+def system_mime_types() -> Dict[str, str]:
+    # The entries of the system mime database that differ from the shipped
+    # index, an empty string means the extension is unknown. The system
+    # database is only parsed again when one of its files changes.
+    import json
+    from kitty.constants import cache_dir
+    key = system_mime_database_key()
+    path = os.path.join(cache_dir(), 'mime-types.json')
+    with suppress(Exception), open(path, 'rb') as f:
+        data = json.loads(f.read())
+        if data['key'] == key:
+            ans: Dict[str, str] = data['overrides']
+            return ans
+    from mimetypes import MimeTypes
+    from .mime_types_index import mime_types
+    db = MimeTypes(filenames=[x[0] for x in key[-1]])
+    # How the extensions are matched depends on the Python version, so ask
+    # mimetypes for every spelling that is defined
+    exts = {ext[1:] for ext in db.types_map[True] if '.' not in ext[1:]}
+    exts |= {ext.lower() for ext in exts}
+    merged = {ext: db.guess_type('x.' + ext)[0] or '' for ext in exts}
+    for x in tuple(db.encodings_map) + tuple(db.suffix_map):
+        merged[x[1:]] = merged[x[1:].lower()] = ''
+    ans = {ext: mt for ext, mt in merged.items() if mime_types.get(ext) != mt}
+    ans.update((ext, '') for ext in mime_types if ext not in merged)
+    from kitty.config import atomic_save
+    with suppress(OSError):
+        atomic_save(json.dumps({'key': key, 'overrides': ans}).encode('utf-8'), path)
+    return ans
+
+
+def lookup_extension(db: Dict[str, str], ext: str) -> Optional[str]:
+    # Like mimetypes, try the exact case before the lower case
+    ans = db.get(ext)
+    if ans is None:
+        lext = ext.lower()
+        if lext != ext:
+            ans = db.get(lext)
+    return ans
+
+
+def guess_type_from_index(path: str) -> Optional[str]:
+    # Look up the extension in the index generated by gen-mime-types.py,
+    # corrected by the system and user mime databases, returns None for
+    # anything that needs the full mimetypes database
+    name = os.path.basename(path)
+    base, dot, ext = name.rpartition('.')
+    if not dot or not base.strip('.') or ':' in path:
+        return None
+    from .mime_types_index import encoding_extensions, mime_types
+    if ext.lower() in encoding_extensions:
+        return None
+    ans = lookup_extension(user_mime_types(), ext)
+    if ans:
+        return ans
+    ans = lookup_extension(system_mime_types(), ext)
+    if ans is not None:
+        return ans or None
+    return mime_types.get(ext.lower())
+
+
 def guess_type(path: str, allow_filesystem_access: bool = False) -> Optional[str]:
     if allow_filesystem_access and is_folder(path):
         return 'inode/directory'
-    from mimetypes import guess_type as stdlib_guess_type
-    initialize_mime_database()
-    mt = None
-    with suppress(Exception):
-        mt = stdlib_guess_type(path)[0]
+    mt = guess_type_from_index(path)
+    if not mt and '.' in os.path.basename(path):
+        from mimetypes import guess_type as stdlib_guess_type
+        initialize_mime_database()
+        with suppress(Exception):
+            mt = stdlib_guess_type(path)[0]
     if not mt:
         ext = path.rpartition('.')[-1].lower()
         mt = known_extensions.get(ext)
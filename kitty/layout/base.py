@@ -215,6 +215,9 @@ def __init__(self, os_window_id: int, tab_id: int, layout_opts: str = '') -> Non
         # A set of rectangles corresponding to the blank spaces at the edges of
         # this layout, i.e. spaces that are not covered by any window
         self.blank_rects: List[Rect] = []
+        # Map of window group id to its neighbors, filled in as neighbors are
+        # looked up and discarded whenever the windows are laid out again
+        self.neighbors_graph: Dict[int, NeighborsMap] = {}
         self.layout_opts = self.parse_layout_opts(layout_opts)
         assert self.name is not None
         self.full_name = self.name + ((':' + layout_opts) if layout_opts else '')
@@ -259,7 +262,12 @@ def next_window(self, all_windows: WindowList, delta: int = 1) -> None:
     def neighbors(self, all_windows: WindowList) -> NeighborsMap:
         w = all_windows.active_window
         assert w is not None
-        return self.neighbors_for_window(w, all_windows)
+        wg = all_windows.active_group
+        assert wg is not None
+        ans = self.neighbors_graph.get(wg.id)
+        if ans is None:
+            ans = self.neighbors_graph[wg.id] = self.neighbors_for_window(w, all_windows)
+        return ans
 
     def move_window(self, all_windows: WindowList, delta: int = 1) -> bool:
         if all_windows.num_groups < 2 or not delta:
@@ -307,6 +315,7 @@ def __call__(self, all_windows: WindowList) -> None:
         self._set_dimensions()
         self.update_visibility(all_windows)
         self.blank_rects = []
+        self.neighbors_graph = {}
         self.do_layout(all_windows)
 
     def layout_single_window_group(self, wg: WindowGroup, add_blank_rects: bool = True) -> None:
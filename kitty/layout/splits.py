@@ -2,8 +2,8 @@
 # License: GPLv3 Copyright: 2020, Kovid Goyal <kovid at kovidgoyal.net>
 
 from typing import (
-    Any, Collection, Dict, Generator, List, NamedTuple, Optional, Sequence, Tuple,
-    Union
+    Any, Callable, Collection, Dict, Generator, List, NamedTuple, Optional,
+    Sequence, Tuple, Union
 )
 
 from kitty.borders import BorderColor
@@ -32,6 +32,11 @@ def __init__(self, horizontal: bool = True):
         self.top = self.left = self.width = self.height = 0
         self.between_borders: List[Edges] = []
         self.first_extent = self.second_extent = Extent()
+        # The signature of this pair and its descendants, used to detect when
+        # a relayout would produce exactly the same geometry as last time
+        self.signature: Tuple[Any, ...] = ()
+        self.layout_key: Optional[Tuple[Any, ...]] = None
+        self.layout_geometries: Tuple[Tuple[int, WindowGeometry], ...] = ()
 
     def __repr__(self) -> str:
         return 'Pair(horizontal={}, bias={:.2f}, one={}, two={}, between_borders={})'.format(
@@ -156,15 +161,26 @@ def split_and_add(self, existing_window_id: int, new_window_id: int, horizontal:
             tuple(map(pair.balanced_add, q))
         return pair
 
+    def update_signature(self, group_signature: Callable[[int], Tuple[Any, ...]]) -> Tuple[Any, ...]:
+
+        def child_signature(q: Union['Pair', int, None]) -> Any:
+            if isinstance(q, Pair):
+                return q.update_signature(group_signature)
+            return None if q is None else group_signature(q)
+
+        self.signature = self.horizontal, self.bias, child_signature(self.one), child_signature(self.two)
+        return self.signature
+
     def apply_window_geometry(
         self, window_id: int,
         window_geometry: WindowGeometry,
         id_window_map: Dict[int, WindowGroup],
-        layout_object: Layout
+        layout_object: 'Splits'
     ) -> None:
         wg = id_window_map[window_id]
         wg.set_geometry(window_geometry)
         layout_object.blank_rects.extend(blank_rects_for_window(window_geometry))
+        layout_object.applied_geometries.append((window_id, window_geometry))
 
     def effective_border(self, id_window_map: Dict[int, WindowGroup]) -> int:
         for wid in self.all_window_ids():
@@ -175,7 +191,24 @@ def layout_pair(
         self,
         left: int, top: int, width: int, height: int,
         id_window_map: Dict[int, WindowGroup],
-        layout_object: Layout
+        layout_object: 'Splits'
+    ) -> None:
+        key = left, top, width, height, layout_object.layout_environment, self.signature
+        if key == self.layout_key:
+            for window_id, geom in self.layout_geometries:
+                self.apply_window_geometry(window_id, geom, id_window_map, layout_object)
+            return
+        layout_object.borders_cache.clear()
+        start = len(layout_object.applied_geometries)
+        self.do_layout_pair(left, top, width, height, id_window_map, layout_object)
+        self.layout_key = key
+        self.layout_geometries = tuple(layout_object.applied_geometries[start:])
+
+    def do_layout_pair(
+        self,
+        left: int, top: int, width: int, height: int,
+        id_window_map: Dict[int, WindowGroup],
+        layout_object: 'Splits'
     ) -> None:
         self.between_borders = []
         self.left, self.top, self.width, self.height = left, top, width, height
@@ -399,6 +432,12 @@ class Splits(Layout):
     layout_opts = SplitsLayoutOpts({})
     no_minimal_window_borders = True
 
+    def __init__(self, os_window_id: int, tab_id: int, layout_opts: str = '') -> None:
+        self.layout_environment: Tuple[Any, ...] = ()
+        self.applied_geometries: List[Tuple[int, WindowGeometry]] = []
+        self.borders_cache: Dict[int, Tuple[Edges, ...]] = {}
+        super().__init__(os_window_id, tab_id, layout_opts)
+
     @property
     def default_axis_is_horizontal(self) -> bool:
         return self.layout_opts.default_axis_is_horizontal
@@ -440,6 +479,17 @@ def do_layout(self, all_windows: WindowList) -> None:
         if window_count == 1:
             self.layout_single_window_group(groups[0])
         else:
+            border_mult = 0 if lgd.draw_minimal_borders else 1
+
+            def group_signature(group_id: int) -> Tuple[Any, ...]:
+                wg = id_window_map[group_id]
+                return (
+                    group_id, tuple(w.id for w in wg.windows), wg.effective_border(),
+                    tuple(wg.decoration(edge, border_mult=border_mult) for edge in ('left', 'top', 'right', 'bottom')))
+
+            self.layout_environment = lgd.cell_width, lgd.cell_height, lgd.draw_minimal_borders, lgd.align_top_left
+            root.update_signature(group_signature)
+            self.applied_geometries = []
             root.layout_pair(lgd.central.left, lgd.central.top, lgd.central.width, lgd.central.height, id_window_map, self)
 
     def add_non_overlay_window(
@@ -506,7 +556,10 @@ def minimal_borders(self, all_windows: WindowList) -> Generator[BorderLine, None
                 qpair = self.pairs_root.pair_for_window(grp_id)
                 if qpair is not None:
                     color = BorderColor.active if grp_id is active_group_id else BorderColor.bell
-                    for edges in qpair.borders_for_window(self, grp_id):
+                    borders = self.borders_cache.get(grp_id)
+                    if borders is None:
+                        borders = self.borders_cache[grp_id] = tuple(qpair.borders_for_window(self, grp_id))
+                    for edges in borders:
                         yield BorderLine(edges, color)
 
     def neighbors_for_window(self, window: WindowType, all_windows: WindowList) -> NeighborsMap:
@@ -33,8 +33,8 @@
 from .shell_integration import setup_shell_integration
 from .types import SingleKey
 from .utils import (
-    detach, expandvars, log_error, single_instance,
-    startup_notification_handler, unix_socket_paths
+    detach, expandvars, log_error, prefetch_shell_environment,
+    single_instance, startup_notification_handler, unix_socket_paths
 )
 from .window import load_shader_programs
 
@@ -372,6 +372,11 @@ def _main() -> None:
             return
     bad_lines: List[BadLine] = []
     opts = create_opts(cli_opts, accumulate_bad_lines=bad_lines)
+    if is_macos:
+        # when launched from the GUI, PATH is minimal so the login shell
+        # environment is frequently needed, read it in parallel with GLFW and
+        # font initialization
+        prefetch_shell_environment(opts)
     init_glfw(opts, cli_opts.debug_keyboard, cli_opts.debug_rendering)
     setup_environment(opts, cli_opts)
     if cli_opts.watcher:
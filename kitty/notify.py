@@ -4,10 +4,11 @@
 from base64 import standard_b64decode
 from collections import OrderedDict
 from itertools import count
-from typing import Dict, Optional, Callable
+from time import monotonic
+from typing import Callable, Dict, Optional
 
 from .constants import is_macos, logo_png_file
-from .fast_data_types import get_boss
+from .fast_data_types import add_timer, get_boss
 from .utils import log_error
 
 NotifyImplementation = Callable[[str, str, str], None]
@@ -188,19 +189,139 @@ def notification_activated(identifier: str, activated_implementation: Optional[C
                 activated_implementation(r.identifier, r.window_id, r.focus, r.report)
 
 
+def send_notification(title: str, body: str, cmd: NotificationCommand, window_id: int, notify_implementation: NotifyImplementation) -> None:
+    identifier = 'i' + str(next(id_counter))
+    notify_implementation(title, body, identifier)
+    register_identifier(identifier, cmd, window_id)
+
+
+class PendingNotification:
+
+    def __init__(self, title: str, body: str, cmd: NotificationCommand, notify_implementation: NotifyImplementation):
+        self.title, self.body, self.cmd = title, body, cmd
+        self.notify_implementation = notify_implementation
+
+
+class WindowNotifications:
+
+    def __init__(self, window_id: int, burst: int, now: float):
+        self.window_id = window_id
+        self.tokens = float(burst)
+        self.last_refill_at = now
+        self.last_sent = ('', '')
+        self.last_sent_at = -1e9
+        self.pending: Optional[PendingNotification] = None
+        self.num_merged = 0
+
+
+class NotificationQueue:
+
+    '''
+    Each window can send burst notifications immediately, after that one
+    notification every interval seconds. Notifications that arrive while a
+    window is over its limit are merged, only the latest is sent, once the
+    window is allowed to send again, with a note about how many were merged.
+    Exact repeats of the last notification sent by a window within
+    duplicate_interval seconds are dropped. Sending happens on the main
+    thread, as the desktop notification backends require that.
+    '''
+
+    def __init__(
+        self,
+        burst: int = 5,
+        interval: float = 1.0,
+        duplicate_interval: float = 2.0,
+        clock: Callable[[], float] = monotonic,
+        schedule: Optional[Callable[[float, Callable[[], None]], None]] = None,
+    ):
+        self.burst, self.interval, self.duplicate_interval = burst, interval, duplicate_interval
+        self.clock = clock
+        self.schedule = schedule or (lambda delay, callback: add_timer(lambda timer_id: callback(), delay, False))
+        self.windows: Dict[int, WindowNotifications] = {}
+        self.timer_scheduled = False
+
+    def state_for(self, window_id: int, now: float) -> WindowNotifications:
+        w = self.windows.get(window_id)
+        if w is None:
+            if len(self.windows) > 64:
+                self.prune(now)
+            w = self.windows[window_id] = WindowNotifications(window_id, self.burst, now)
+        else:
+            w.tokens = min(self.burst, w.tokens + (now - w.last_refill_at) / self.interval)
+            w.last_refill_at = now
+        return w
+
+    def prune(self, now: float) -> None:
+        for window_id, w in tuple(self.windows.items()):
+            if w.pending is None and now - w.last_refill_at > self.burst * self.interval and now - w.last_sent_at > self.duplicate_interval:
+                del self.windows[window_id]
+
+    def add(self, title: str, body: str, cmd: NotificationCommand, window_id: int, notify_implementation: NotifyImplementation) -> None:
+        now = self.clock()
+        w = self.state_for(window_id, now)
+        if (title, body) == w.last_sent and now - w.last_sent_at < self.duplicate_interval and w.pending is None:
+            return
+        if w.pending is None and w.tokens >= 1:
+            self.send(w, PendingNotification(title, body, cmd, notify_implementation), now)
+            return
+        if w.pending is not None:
+            w.num_merged += 1
+        w.pending = PendingNotification(title, body, cmd, notify_implementation)
+        self.schedule_dispatch(w)
+
+    def send(self, w: WindowNotifications, n: PendingNotification, now: float) -> None:
+        w.tokens -= 1
+        w.last_sent, w.last_sent_at = (n.title, n.body), now
+        body = n.body
+        if w.num_merged:
+            note = f'{w.num_merged} more notifications from this window were merged into this one'
+            body = f'{body}\n{note}' if body else note
+            w.num_merged = 0
+        send_notification(n.title, body, n.cmd, w.window_id, n.notify_implementation)
+
+    def schedule_dispatch(self, w: WindowNotifications) -> None:
+        if not self.timer_scheduled:
+            self.timer_scheduled = True
+            self.schedule(max(0, (1 - w.tokens) * self.interval), self.dispatch)
+
+    def dispatch(self) -> None:
+        self.timer_scheduled = False
+        now = self.clock()
+        delay: Optional[float] = None
+        for window_id, w in tuple(self.windows.items()):
+            n = w.pending
+            if n is None:
+                continue
+            w = self.state_for(window_id, now)
+            if w.tokens >= 1:
+                w.pending = None
+                self.send(w, n, now)
+            else:
+                q = (1 - w.tokens) * self.interval
+                delay = q if delay is None else min(delay, q)
+        if delay is not None:
+            self.timer_scheduled = True
+            self.schedule(delay, self.dispatch)
+
+    def clear(self) -> None:
+        self.windows.clear()
+
+
+notification_queue = NotificationQueue()
+
+
 def reset_registry() -> None:
     global id_counter
     identifier_registry.clear()
     id_counter = count()
+    notification_queue.clear()
 
 
 def notify_with_command(cmd: NotificationCommand, window_id: int, notify_implementation: NotifyImplementation = notify_implementation) -> None:
     title = cmd.title or cmd.body
     body = cmd.body if cmd.title else ''
     if title:
-        identifier = 'i' + str(next(id_counter))
-        notify_implementation(title, body, identifier)
-        register_identifier(identifier, cmd, window_id)
+        notification_queue.add(title, body, cmd, window_id, notify_implementation)
 
 
 def handle_notification_cmd(
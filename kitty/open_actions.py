@@ -4,9 +4,10 @@
 
 import os
 import posixpath
-from contextlib import suppress
+import re
 from typing import (
-    Any, Generator, Iterable, List, NamedTuple, Optional, Tuple, cast
+    TYPE_CHECKING, Any, Callable, Dict, Generator, Iterable, List, NamedTuple,
+    Optional, Tuple, Union, cast
 )
 from urllib.parse import ParseResult, unquote, urlparse
 
@@ -14,10 +15,12 @@
 from .constants import config_dir
 from .guess_mime_type import guess_type
 from .options.utils import parse_key_action
-from .types import run_once
 from .typing import MatchType
 from .utils import expandvars, log_error
 
+if TYPE_CHECKING:
+    from typing import Pattern
+
 
 class MatchCriteria(NamedTuple):
     type: MatchType
@@ -64,90 +67,134 @@ def parse(lines: Iterable[str]) -> Generator[OpenAction, None, None]:
         yield OpenAction(tuple(match_criteria), tuple(actions))
 
 
-def url_matches_criterion(purl: 'ParseResult', url: str, unquoted_path: str, mc: MatchCriteria) -> bool:
-    if mc.type == 'url':
-        import re
+class URLInfo:
+
+    def __init__(self, url: str, purl: 'ParseResult'):
+        self.url = url
+        self.purl = purl
+        self.path = unquote(purl.path)
+        self.lower_path = self.path.lower()
+        self.protocol = (purl.scheme or 'file').lower()
+        self._mime_type: Optional[str] = None
+
+    @property
+    def mime_type(self) -> str:
+        if self._mime_type is None:
+            self._mime_type = (guess_type(self.path, allow_filesystem_access=True) or '').lower()
+        return self._mime_type
+
+
+Matcher = Callable[[URLInfo], bool]
+
+
+def never_matches(u: URLInfo) -> bool:
+    return False
+
+
+def compile_glob(pat: str) -> 'Optional[Pattern[str]]':
+    import fnmatch
+    try:
+        return re.compile(fnmatch.translate(pat))
+    except Exception:
+        return None
+
+
+def split_values(value: str) -> Tuple[str, ...]:
+    return tuple(x.strip() for x in value.split(','))
+
+
+def compile_criterion(mc: MatchCriteria) -> Matcher:
+    if mc.type in ('url', 'fragment_matches'):
         try:
             pat = re.compile(mc.value)
         except re.error:
-            return False
-        return pat.search(unquote(url)) is not None
+            return never_matches
+        if mc.type == 'url':
+            return lambda u: pat.search(unquote(u.url)) is not None
+        return lambda u: pat.search(unquote(u.purl.fragment)) is not None
 
     if mc.type == 'mime':
-        import fnmatch
-        mt = guess_type(unquoted_path, allow_filesystem_access=True)
-        if not mt:
-            return False
-        mt = mt.lower()
-        for mpat in mc.value.split(','):
-            mpat = mpat.strip()
-            with suppress(Exception):
-                if fnmatch.fnmatchcase(mt, mpat):
-                    return True
-        return False
+        pats = tuple(p for p in map(compile_glob, split_values(mc.value)) if p is not None)
+        return lambda u: bool(u.mime_type) and any(p.match(u.mime_type) is not None for p in pats)
 
     if mc.type == 'ext':
-        if not purl.path:
-            return False
-        path = unquoted_path.lower()
-        for ext in mc.value.split(','):
-            ext = ext.strip()
-            if path.endswith('.' + ext):
-                return True
-        return False
+        exts = tuple('.' + ext for ext in split_values(mc.value))
+        return lambda u: bool(u.purl.path) and u.lower_path.endswith(exts)
 
     if mc.type == 'protocol':
-        protocol = (purl.scheme or 'file').lower()
-        for key in mc.value.split(','):
-            if key.strip() == protocol:
-                return True
-        return False
-
-    if mc.type == 'fragment_matches':
-        import re
-        try:
-            pat = re.compile(mc.value)
-        except re.error:
-            return False
+        protocols = frozenset(split_values(mc.value))
+        return lambda u: u.protocol in protocols
 
-        return pat.search(unquote(purl.fragment)) is not None
+    if mc.type in ('path', 'file'):
+        gpat = compile_glob(mc.value)
+        if gpat is None:
+            return never_matches
+        match = gpat.match
+        if mc.type == 'path':
+            return lambda u: match(u.lower_path) is not None
+        return lambda u: match(posixpath.basename(u.path).lower()) is not None
 
-    if mc.type == 'path':
-        import fnmatch
-        try:
-            return fnmatch.fnmatchcase(unquoted_path.lower(), mc.value)
-        except Exception:
-            return False
+    return never_matches
 
-    if mc.type == 'file':
-        import fnmatch
-        import posixpath
-        try:
-            fname = posixpath.basename(unquoted_path)
-        except Exception:
-            return False
-        try:
-            return fnmatch.fnmatchcase(fname.lower(), mc.value)
-        except Exception:
-            return False
 
+class CompiledOpenActions:
 
-def url_matches_criteria(purl: 'ParseResult', url: str, unquoted_path: str, criteria: Iterable[MatchCriteria]) -> bool:
-    for x in criteria:
-        try:
-            if not url_matches_criterion(purl, url, unquoted_path, x):
-                return False
-        except Exception:
-            return False
-    return True
+    '''
+    Open actions with all their match criteria pre-compiled. Actions are
+    bucketed by their first protocol or, failing that, ext criterion, so that
+    only actions that can possibly match a URL are checked, in the order in
+    which they were defined.
+    '''
+
+    def __init__(self, actions: Iterable[OpenAction] = ()):
+        self.actions = tuple(actions)
+        self.matchers = tuple(tuple(map(compile_criterion, a.match_criteria)) for a in self.actions)
+        self.by_protocol: Dict[str, List[int]] = {}
+        self.by_ext: Dict[str, List[int]] = {}
+        self.unbucketed: List[int] = []
+        for i, action in enumerate(self.actions):
+            types = [mc.type for mc in action.match_criteria]
+            if 'protocol' in types:
+                bucket, mc = self.by_protocol, action.match_criteria[types.index('protocol')]
+            elif 'ext' in types:
+                bucket, mc = self.by_ext, action.match_criteria[types.index('ext')]
+            else:
+                self.unbucketed.append(i)
+                continue
+            for key in dict.fromkeys(split_values(mc.value)):
+                bucket.setdefault(key, []).append(i)
 
+    def candidates(self, u: URLInfo) -> List[int]:
+        ans = set(self.unbucketed)
+        ans.update(self.by_protocol.get(u.protocol, ()))
+        if self.by_ext and u.purl.path:
+            # every key that could satisfy lower_path.endswith('.' + ext)
+            path = u.lower_path
+            i = path.find('.')
+            while i > -1:
+                ans.update(self.by_ext.get(path[i+1:], ()))
+                i = path.find('.', i + 1)
+        return sorted(ans)
 
-def actions_for_url_from_list(url: str, actions: Iterable[OpenAction]) -> Generator[KeyAction, None, None]:
+    def first_match(self, u: URLInfo) -> Optional[OpenAction]:
+        for i in self.candidates(u):
+            try:
+                if all(m(u) for m in self.matchers[i]):
+                    return self.actions[i]
+            except Exception:
+                pass
+        return None
+
+
+def actions_for_url_from_list(url: str, actions: Union[CompiledOpenActions, Iterable[OpenAction]]) -> Generator[KeyAction, None, None]:
     try:
         purl = urlparse(url)
     except Exception:
         return
-    path = unquote(purl.path)
+    if not isinstance(actions, CompiledOpenActions):
+        actions = CompiledOpenActions(actions)
+    u = URLInfo(url, purl)
+    path = u.path
 
     env = {
         'URL': url,
@@ -167,26 +214,44 @@ def expand(x: Any) -> Any:
             return ans
         return x
 
-    for action in actions:
-        if url_matches_criteria(purl, url, path, action.match_criteria):
-            for ac in action.actions:
-                yield ac._replace(args=tuple(map(expand, ac.args)))
-            return
+    action = actions.first_match(u)
+    if action is not None:
+        for ac in action.actions:
+            yield ac._replace(args=tuple(map(expand, ac.args)))
+
+
+# path -> ((mtime, size), actions)
+open_actions_cache: Dict[str, Tuple[Tuple[int, int], CompiledOpenActions]] = {}
 
 
-@run_once
-def load_open_actions() -> Tuple[OpenAction, ...]:
+def load_open_actions() -> CompiledOpenActions:
+    path = os.path.join(config_dir, 'open-actions.conf')
     try:
-        f = open(os.path.join(config_dir, 'open-actions.conf'))
+        st = os.stat(path)
+    except OSError:
+        open_actions_cache.pop(path, None)
+        return CompiledOpenActions()
+    key = st.st_mtime_ns, st.st_size
+    cached = open_actions_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        f = open(path)
     except FileNotFoundError:
-        return ()
+        return CompiledOpenActions()
     with f:
-        return tuple(parse(f))
+        ans = CompiledOpenActions(parse(f))
+    open_actions_cache[path] = key, ans
+    return ans
+
+
+def clear_open_actions_cache() -> None:
+    open_actions_cache.clear()
 
 
 def actions_for_url(url: str, actions_spec: Optional[str] = None) -> Generator[KeyAction, None, None]:
     if actions_spec is None:
         actions = load_open_actions()
     else:
-        actions = tuple(parse(actions_spec.splitlines()))
+        actions = CompiledOpenActions(parse(actions_spec.splitlines()))
     yield from actions_for_url_from_list(url, actions)
@@ -2,9 +2,11 @@
 # License: GPLv3 Copyright: 2020, Kovid Goyal <kovid at kovidgoyal.net>
 
 from contextlib import suppress
+from functools import wraps
+from time import monotonic
 from typing import (
     TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List,
-    NoReturn, Optional, Tuple, Type, Union, cast
+    NoReturn, Optional, Tuple, Type, TypeVar, Union, cast
 )
 
 from kitty.cli import get_defaults_from_seq, parse_args, parse_option_spec
@@ -109,6 +111,81 @@ class ParsingOfArgsFailed(ValueError):
     pass
 
 
+class Histogram:
+
+    '''
+    Counts of values in buckets whose upper bounds are powers of two. The
+    first bucket is for values less than one.
+    '''
+
+    def __init__(self) -> None:
+        self.buckets: List[int] = []
+        self.count = 0
+        self.total = self.max = 0.
+
+    def add(self, val: float) -> None:
+        idx = 0 if val < 1 else int(val).bit_length()
+        if idx >= len(self.buckets):
+            self.buckets.extend([0] * (idx + 1 - len(self.buckets)))
+        self.buckets[idx] += 1
+        self.count += 1
+        self.total += val
+        self.max = max(self.max, val)
+
+    def serialize(self) -> Dict[str, Any]:
+        return {
+            'count': self.count, 'total': self.total, 'max': self.max,
+            'buckets': {f'<{1 << i}': n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class CommandStats:
+
+    def __init__(self) -> None:
+        self.errors = 0
+        self.payload_bytes = Histogram()
+        self.parse_us = Histogram()
+        self.match_us = Histogram()
+        self.execute_us = Histogram()
+        self.serialize_us = Histogram()
+
+    def serialize(self) -> Dict[str, Any]:
+        ans: Dict[str, Any] = {'calls': self.parse_us.count, 'errors': self.errors}
+        for k in ('payload_bytes', 'parse_us', 'match_us', 'execute_us', 'serialize_us'):
+            ans[k] = getattr(self, k).serialize()
+        return ans
+
+
+command_stats: Dict[str, CommandStats] = {}
+
+
+def stats_for_command(name: str) -> CommandStats:
+    ans = command_stats.get(name)
+    if ans is None:
+        ans = command_stats[name] = CommandStats()
+    return ans
+
+
+def microseconds_since(start: float) -> float:
+    return (monotonic() - start) * 1e6
+
+
+MatchFunc = TypeVar('MatchFunc', bound=Callable[..., Any])
+
+
+def record_match_time(func: MatchFunc) -> MatchFunc:
+
+    @wraps(func)
+    def wrapper(self: 'RemoteCommand', *a: Any) -> Any:
+        st = monotonic()
+        try:
+            return func(self, *a)
+        finally:
+            stats_for_command(self.name).match_us.add(microseconds_since(st))
+
+    return cast(MatchFunc, wrapper)
+
+
 class AsyncResponder:
 
     def __init__(self, payload_get: PayloadGetType, window: Optional[Window]) -> None:
@@ -158,6 +235,7 @@ def get_default(self, name: str, missing: Any = None) -> Any:
             return self.defaults.get(name, missing)
         return missing
 
+    @record_match_time
     def windows_for_match_payload(self, boss: 'Boss', window: Optional['Window'], payload_get: PayloadGetType) -> List['Window']:
         if payload_get('all'):
             windows = list(boss.all_windows)
@@ -173,6 +251,7 @@ def windows_for_match_payload(self, boss: 'Boss', window: Optional['Window'], pa
                     raise MatchError(payload_get('match'))
         return windows
 
+    @record_match_time
     def tabs_for_match_payload(self, boss: 'Boss', window: Optional['Window'], payload_get: PayloadGetType) -> List['Tab']:
         if payload_get('all'):
             return list(boss.all_tabs)
@@ -191,6 +270,7 @@ def tabs_for_match_payload(self, boss: 'Boss', window: Optional['Window'], paylo
             return [t]
         return []
 
+    @record_match_time
     def windows_for_payload(self, boss: 'Boss', window: Optional['Window'], payload_get: PayloadGetType) -> List['Window']:
         if payload_get('all'):
             windows = list(boss.all_windows)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+import json
+from typing import TYPE_CHECKING, Optional
+
+from .base import (
+    ArgsType, Boss, PayloadGetType, PayloadType, RCOptions, RemoteCommand,
+    ResponseType, Window, command_stats
+)
+
+if TYPE_CHECKING:
+    from kitty.cli_stub import RCStatsRCOptions as CLIOptions
+
+
+class RCStats(RemoteCommand):
+    '''
+    reset: Boolean indicating whether to reset the statistics after returning them
+    '''
+
+    short_desc = 'Show statistics about remote control commands'
+    desc = (
+        'Show statistics about the remote control commands this kitty instance has handled,'
+        ' as JSON, keyed by command name. For every command there is the number of calls and errors'
+        ' and histograms of the payload size in bytes and of the time, in microseconds, taken'
+        ' to parse the command, match windows or tabs, execute the command and serialize its response.'
+        ' Matching is part of executing. Commands that match windows or tabs with their own logic, such as'
+        ' detach-tab, only report it as part of executing. Histogram buckets are powers of two, each bucket counts the values'
+        ' less than its name and greater than or equal to the name of the previous bucket.'
+    )
+    options_spec = '''\
+--reset
+type=bool-set
+Reset the statistics after showing them.
+'''
+    argspec = ''
+
+    def message_to_kitty(self, global_opts: RCOptions, opts: 'CLIOptions', args: ArgsType) -> PayloadType:
+        return {'reset': opts.reset}
+
+    def response_from_kitty(self, boss: Boss, window: Optional[Window], payload_get: PayloadGetType) -> ResponseType:
+        ans = {name: s.serialize() for name, s in command_stats.items()}
+        if payload_get('reset'):
+            command_stats.clear()
+        return json.dumps(ans, indent=2, sort_keys=True)
+
+
+rc_stats = RCStats()
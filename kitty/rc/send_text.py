@@ -3,7 +3,8 @@
 
 import base64
 import sys
-from typing import TYPE_CHECKING, List, Optional, Union
+from time import monotonic
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 from kitty.fast_data_types import KeyEvent as WindowSystemKeyEvent
 from kitty.key_encoding import decode_key_event_as_window_system_key
@@ -12,13 +13,65 @@
 from .base import (
     MATCH_TAB_OPTION, MATCH_WINDOW_OPTION, ArgsType, Boss, CmdGenerator,
     MatchError, PayloadGetType, PayloadType, RCOptions, RemoteCommand,
-    ResponseType, Window
+    ResponseType, Window, microseconds_since, stats_for_command
 )
 
 if TYPE_CHECKING:
     from kitty.cli_stub import SendTextRCOptions as CLIOptions
 
 
+# Maps session_id to (ids of all windows when resolved, ids of matched windows)
+resolved_sessions: Dict[str, Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+# Fields whose value never changes for the lifetime of a window
+stable_match_fields = frozenset(('id', 'window_id', 'pid'))
+
+
+def matched_windows(boss: Boss, payload_get: PayloadGetType) -> List[Window]:
+    if payload_get('all'):
+        windows: List[Optional[Window]] = list(boss.all_windows)
+    else:
+        windows = [boss.active_window]
+        match = payload_get('match')
+        if match:
+            windows = list(boss.match_windows(match))
+        mt = payload_get('match_tab')
+        if mt:
+            windows = []
+            tabs = tuple(boss.match_tabs(mt))
+            if not tabs:
+                raise MatchError(payload_get('match_tab'), 'tabs')
+            for tab in tabs:
+                windows += tuple(tab)
+    return [w for w in windows if w is not None]
+
+
+def match_is_stable(payload_get: PayloadGetType) -> bool:
+    # Whether the matched windows depend only on the set of windows and not
+    # on mutable state such as titles, working directories or focus
+    if payload_get('all'):
+        return True
+    match = payload_get('match')
+    if not match or payload_get('match_tab'):
+        return False
+    return match.partition(':')[0] in stable_match_fields
+
+
+def resolve_windows(boss: Boss, payload_get: PayloadGetType) -> List[Window]:
+    session_id = payload_get('session_id')
+    if not session_id or not match_is_stable(payload_get):
+        return matched_windows(boss, payload_get)
+    all_ids = tuple(boss.window_id_map)
+    cached = resolved_sessions.get(session_id)
+    if cached is not None and cached[0] == all_ids:
+        return [boss.window_id_map[wid] for wid in cached[1]]
+    windows = matched_windows(boss, payload_get)
+    resolved_sessions.pop(session_id, None)
+    resolved_sessions[session_id] = all_ids, tuple(w.id for w in windows)
+    if len(resolved_sessions) > 32:
+        del resolved_sessions[next(iter(resolved_sessions))]
+    return windows
+
+
 class SendText(RemoteCommand):
     '''
     data+: The data being sent. Can be either: text: followed by text or base64: followed by standard base64 encoded bytes
@@ -26,6 +79,7 @@ class SendText(RemoteCommand):
     match_tab: A string indicating the tab to send text to
     all: A boolean indicating all windows should be matched.
     exclude_active: A boolean that prevents sending text to the active window
+    session_id: A unique id identifying a stream of send-text commands, windows matched only by id are resolved once per stream
     '''
     short_desc = 'Send arbitrary text to specified windows'
     desc = (
@@ -60,8 +114,15 @@ class SendText(RemoteCommand):
     argspec = '[TEXT TO SEND]'
 
     def message_to_kitty(self, global_opts: RCOptions, opts: 'CLIOptions', args: ArgsType) -> PayloadType:
+        from kitty.short_uuid import uuid4
         limit = 1024
-        ret = {'match': opts.match, 'data': '', 'match_tab': opts.match_tab, 'all': opts.all, 'exclude_active': opts.exclude_active}
+        # Bytes are sent base64 encoded, use chunks that fit comfortably in a
+        # single message: socket messages are limited to 64KB and escape
+        # codes sent over the tty to 8K
+        blimit = 32 * 1024 if global_opts.to else 4096
+        ret = {
+            'match': opts.match, 'data': '', 'match_tab': opts.match_tab, 'all': opts.all, 'exclude_active': opts.exclude_active,
+            'session_id': uuid4()}
 
         def pipe() -> CmdGenerator:
             if sys.stdin.isatty():
@@ -83,7 +144,7 @@ def pipe() -> CmdGenerator:
                         yield ret
             else:
                 while True:
-                    data = sys.stdin.buffer.read(limit)
+                    data = sys.stdin.buffer.read(blimit)
                     if not data:
                         break
                     ret['data'] = 'base64:' + base64.standard_b64encode(data).decode('ascii')
@@ -99,7 +160,7 @@ def chunks(text: str) -> CmdGenerator:
         def file_pipe(path: str) -> CmdGenerator:
             with open(path, 'rb') as f:
                 while True:
-                    data = f.read(limit)
+                    data = f.read(blimit)
                     if not data:
                         break
                     ret['data'] = 'base64:' + base64.standard_b64encode(data).decode('ascii')
@@ -121,21 +182,9 @@ def chain() -> CmdGenerator:
         return chain()
 
     def response_from_kitty(self, boss: Boss, window: Optional[Window], payload_get: PayloadGetType) -> ResponseType:
-        if payload_get('all'):
-            windows: List[Optional[Window]] = list(boss.all_windows)
-        else:
-            windows = [boss.active_window]
-            match = payload_get('match')
-            if match:
-                windows = list(boss.match_windows(match))
-            mt = payload_get('match_tab')
-            if mt:
-                windows = []
-                tabs = tuple(boss.match_tabs(mt))
-                if not tabs:
-                    raise MatchError(payload_get('match_tab'), 'tabs')
-                for tab in tabs:
-                    windows += tuple(tab)
+        st = monotonic()
+        windows = resolve_windows(boss, payload_get)
+        stats_for_command(self.name).match_us.add(microseconds_since(st))
         pdata: str = payload_get('data')
         encoding, _, q = pdata.partition(':')
         if encoding == 'text':
@@ -150,16 +199,15 @@ def response_from_kitty(self, boss: Boss, window: Optional[Window], payload_get:
             data = candidate
         else:
             raise TypeError(f'Invalid encoding for send-text data: {encoding}')
-        exclude_active = payload_get('exclude_active')
-        for window in windows:
-            if window is not None:
-                if not exclude_active or window is not boss.active_window:
-                    if isinstance(data, WindowSystemKeyEvent):
-                        kdata = window.encoded_key(data)
-                        if kdata:
-                            window.write_to_child(kdata)
-                    else:
-                        window.write_to_child(data)
+        if payload_get('exclude_active'):
+            windows = [w for w in windows if w is not boss.active_window]
+        if isinstance(data, WindowSystemKeyEvent):
+            for window in windows:
+                kdata = window.encoded_key(data)
+                if kdata:
+                    window.write_to_child(kdata)
+        elif windows and data:
+            boss.child_monitor.needs_write_many(tuple(w.id for w in windows), data)
         return None
 
 
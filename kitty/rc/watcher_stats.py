@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+import json
+from typing import TYPE_CHECKING, Optional
+
+from .base import (
+    ArgsType, Boss, PayloadGetType, PayloadType, RCOptions, RemoteCommand,
+    ResponseType, Window
+)
+
+if TYPE_CHECKING:
+    from kitty.cli_stub import WatcherStatsRCOptions as CLIOptions
+
+
+class WatcherStats(RemoteCommand):
+    '''
+    reset: Boolean indicating whether to reset the statistics after returning them
+    '''
+
+    short_desc = 'Show how long watchers take to run'
+    desc = (
+        'Show the number of calls and the total and worst-case run time, in milliseconds, of every'
+        ' watcher that has been called so far. The result is returned as JSON, keyed by the path of the'
+        ' watcher and then by the event, for example, :italic:`on_resize`. Watchers run in the main'
+        ' loop of kitty, so a slow watcher adds latency to everything, use this to find it.'
+    )
+    options_spec = '''\
+--reset
+type=bool-set
+Reset the statistics after showing them.
+'''
+    argspec = ''
+
+    def message_to_kitty(self, global_opts: RCOptions, opts: 'CLIOptions', args: ArgsType) -> PayloadType:
+        return {'reset': opts.reset}
+
+    def response_from_kitty(self, boss: Boss, window: Optional[Window], payload_get: PayloadGetType) -> ResponseType:
+        from kitty.window import watcher_timings
+        ans = {path: {which: t.serialize() for which, t in q.items()} for path, q in watcher_timings.items()}
+        if payload_get('reset'):
+            watcher_timings.clear()
+        return json.dumps(ans, indent=2, sort_keys=True)
+
+
+watcher_stats = WatcherStats()
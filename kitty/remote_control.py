@@ -18,30 +18,47 @@
 from .constants import appname, version
 from .fast_data_types import get_boss, read_command_response, send_data_to_peer
 from .rc.base import (
-    NoResponse, ParsingOfArgsFailed, PayloadGetter, all_command_names,
-    command_for_name, parse_subcommand_cli
+    CommandStats, NoResponse, ParsingOfArgsFailed, PayloadGetter,
+    all_command_names, command_for_name, microseconds_since,
+    parse_subcommand_cli, stats_for_command
 )
 from .types import AsyncResponse
 from .typing import BossType, WindowType
 from .utils import TTYIO, parse_address_spec
 
 active_async_requests: Dict[str, float] = {}
+ResponseOrNone = Union[Dict[str, Any], None, AsyncResponse]
 
 
-def encode_response_for_peer(response: Any) -> bytes:
-    import json
-    return b'\x1bP@kitty-cmd' + json.dumps(response).encode('utf-8') + b'\x1b\\'
+def serialize_response(response: Any, stats: Optional[CommandStats] = None) -> str:
+    st = monotonic()
+    ans = json.dumps(response)
+    if stats is not None:
+        stats.serialize_us.add(microseconds_since(st))
+    return ans
+
+
+def encode_response_for_peer(response: Any, stats: Optional[CommandStats] = None) -> bytes:
+    return b'\x1bP@kitty-cmd' + serialize_response(response, stats).encode('utf-8') + b'\x1b\\'
 
 
-def handle_cmd(boss: BossType, window: Optional[WindowType], serialized_cmd: str, peer_id: int) -> Union[Dict[str, Any], None, AsyncResponse]:
+def handle_cmd(
+    boss: BossType, window: Optional[WindowType], serialized_cmd: str, peer_id: int
+) -> Tuple[ResponseOrNone, Optional[CommandStats]]:
+    # Returns the response and the stats of the command, to be passed on when
+    # serializing the response
+    st = monotonic()
     cmd = json.loads(serialized_cmd)
     v = cmd['version']
     no_response = cmd.get('no_response', False)
     if tuple(v)[:2] > version[:2]:
         if no_response:
-            return None
-        return {'ok': False, 'error': 'The kitty client you are using to send remote commands is newer than this kitty instance. This is not supported.'}
+            return None, None
+        return {'ok': False, 'error': 'The kitty client you are using to send remote commands is newer than this kitty instance. This is not supported.'}, None
     c = command_for_name(cmd['cmd'])
+    stats = stats_for_command(c.name)
+    stats.payload_bytes.add(len(serialized_cmd))
+    stats.parse_us.add(microseconds_since(st))
     payload = cmd.get('payload') or {}
     payload['peer_id'] = peer_id
     async_id = str(cmd.get('async', ''))
@@ -49,28 +66,32 @@ def handle_cmd(boss: BossType, window: Optional[WindowType], serialized_cmd: str
         if 'cancel_async' in cmd:
             active_async_requests.pop(async_id, None)
             c.cancel_async_request(boss, window, PayloadGetter(c, payload))
-            return None
+            return None, None
         active_async_requests[async_id] = monotonic()
         payload['async_id'] = async_id
         if len(active_async_requests) > 32:
             oldest = next(iter(active_async_requests))
             del active_async_requests[oldest]
+    st = monotonic()
     try:
         ans = c.response_from_kitty(boss, window, PayloadGetter(c, payload))
     except Exception:
+        stats.errors += 1
         if no_response:  # don't report errors if --no-response was used
-            return None
+            return None, None
         raise
+    finally:
+        stats.execute_us.add(microseconds_since(st))
     if isinstance(ans, NoResponse):
-        return None
+        return None, None
     if isinstance(ans, AsyncResponse):
-        return ans
+        return ans, None
     response: Dict[str, Any] = {'ok': True}
     if ans is not None:
         response['data'] = ans
     if not c.no_response and not no_response:
-        return response
-    return None
+        return response, stats
+    return None, None
 
 
 global_options_spec = partial('''\
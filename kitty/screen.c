@@ -3453,12 +3453,54 @@ marked_cells(Screen *self, PyObject *o UNUSED) {
     return ans;
 }
 
+static size_t
+sanitize_paste(const char *src, size_t sz, char *dest, void *data) {
+    const bool bracketed = *(bool*)data;
+    size_t i = 0, n = 0;
+    const char *p;
+    while (i < sz) {
+        if (bracketed) {
+            // Remove bracketed paste end markers. Checking the end of the
+            // output rather than the input means markers formed by removing
+            // other markers are removed as well.
+            p = memchr(src + i, '~', sz - i);
+            const size_t end = p ? (size_t)(p - src) + 1 : sz;
+            memcpy(dest + n, src + i, end - i); n += end - i; i = end;
+            if (p) {
+                if (n >= 6 && memcmp(dest + n - 6, "\x1b[201~", 6) == 0) n -= 6;
+                else if (n >= 5 && memcmp(dest + n - 5, "\x9b" "201~", 5) == 0) n -= 5;
+            }
+        } else {
+            // Workaround for broken editors like nano that cannot handle
+            // newlines in pasted text see https://github.com/kovidgoyal/kitty/issues/994
+            p = memchr(src + i, '\n', sz - i);
+            const size_t end = p ? (size_t)(p - src) : sz;
+            memcpy(dest + n, src + i, end - i); n += end - i; i = end;
+            if (p) {
+                if (!end || src[end - 1] != '\r') dest[n++] = '\r';
+                i++;
+            }
+        }
+    }
+    return n;
+}
+
 static PyObject*
-paste(Screen *self, PyObject *bytes) {
-    if (!PyBytes_Check(bytes)) { PyErr_SetString(PyExc_TypeError, "Must paste() bytes"); return NULL; }
-    if (self->modes.mBRACKETED_PASTE) write_escape_code_to_child(self, CSI, BRACKETED_PASTE_START);
-    write_to_child(self, PyBytes_AS_STRING(bytes), PyBytes_GET_SIZE(bytes));
-    if (self->modes.mBRACKETED_PASTE) write_escape_code_to_child(self, CSI, BRACKETED_PASTE_END);
+paste(Screen *self, PyObject *text) {
+    const char *data; Py_ssize_t sz;
+    if (PyBytes_Check(text)) { data = PyBytes_AS_STRING(text); sz = PyBytes_GET_SIZE(text); }
+    else if (PyUnicode_Check(text)) { data = PyUnicode_AsUTF8AndSize(text, &sz); if (!data) return NULL; }
+    else { PyErr_SetString(PyExc_TypeError, "Must paste() bytes or str"); return NULL; }
+    bool bracketed = self->modes.mBRACKETED_PASTE;
+    if (bracketed) write_escape_code_to_child(self, CSI, BRACKETED_PASTE_START);
+    if (self->window_id) schedule_write_to_child_filtered(self->window_id, data, sz, sanitize_paste, &bracketed);
+    if (self->test_child != Py_None) {
+        char *buf = malloc(sz + 1);
+        if (!buf) return PyErr_NoMemory();
+        write_to_test_child(self, buf, sanitize_paste(data, sz, buf, &bracketed));
+        free(buf);
+    }
+    if (bracketed) write_escape_code_to_child(self, CSI, BRACKETED_PASTE_END);
     Py_RETURN_NONE;
 }
 
@@ -475,14 +475,15 @@ swap_tabs(id_type os_window_id, unsigned int a, unsigned int b) {
 }
 
 static void
-add_borders_rect(id_type os_window_id, id_type tab_id, uint32_t left, uint32_t top, uint32_t right, uint32_t bottom, uint32_t color) {
+set_borders_rects(id_type os_window_id, id_type tab_id, const BorderRect *rects, size_t num) {
     WITH_TAB(os_window_id, tab_id)
         BorderRects *br = &tab->border_rects;
         br->is_dirty = true;
-        if (!left && !top && !right && !bottom) { br->num_border_rects = 0; return; }
-        ensure_space_for(br, rect_buf, BorderRect, br->num_border_rects + 1, capacity, 32, false);
-        BorderRect *r = br->rect_buf + br->num_border_rects++;
-        r->left = left; r->right = right; r->top = top; r->bottom = bottom; r->color = color;
+        br->num_border_rects = 0;
+        if (!num) return;
+        ensure_space_for(br, rect_buf, BorderRect, num, capacity, 32, false);
+        memcpy(br->rect_buf, rects, sizeof(BorderRect) * num);
+        br->num_border_rects = num;
     END_WITH_TAB
 }
 
@@ -587,7 +588,6 @@ send_pending_click_to_window_id(id_type timer_id UNUSED, void *data) {
 #define KKK(name) PYWRAP1(name) { id_type a, b, c; PA("KKK", &a, &b, &c); name(a, b, c); Py_RETURN_NONE; }
 #define KKII(name) PYWRAP1(name) { id_type a, b; unsigned int c, d; PA("KKII", &a, &b, &c, &d); name(a, b, c, d); Py_RETURN_NONE; }
 #define KKKK(name) PYWRAP1(name) { id_type a, b, c, d; PA("KKKK", &a, &b, &c, &d); name(a, b, c, d); Py_RETURN_NONE; }
-#define KK5I(name) PYWRAP1(name) { id_type a, b; unsigned int c, d, e, f, g; PA("KKIIIII", &a, &b, &c, &d, &e, &f, &g); name(a, b, c, d, e, f, g); Py_RETURN_NONE; }
 #define BOOL_SET(name) PYWRAP1(set_##name) { global_state.name = PyObject_IsTrue(args); Py_RETURN_NONE; }
 #define dict_iter(d) { \
     PyObject *key, *value; Py_ssize_t pos = 0; \
@@ -1111,7 +1111,19 @@ KI(set_active_tab)
 K(mark_os_window_dirty)
 KKK(set_active_window)
 KII(swap_tabs)
-KK5I(add_borders_rect)
+
+PYWRAP1(set_borders_rects) {
+    id_type os_window_id, tab_id; Py_buffer rects;
+    PA("KKy*", &os_window_id, &tab_id, &rects);
+    if (rects.len % sizeof(BorderRect)) {
+        PyBuffer_Release(&rects);
+        PyErr_SetString(PyExc_ValueError, "The size of the rects buffer must be a multiple of the size of five 32-bit unsigned integers");
+        return NULL;
+    }
+    set_borders_rects(os_window_id, tab_id, rects.buf, rects.len / sizeof(BorderRect));
+    PyBuffer_Release(&rects);
+    Py_RETURN_NONE;
+}
 
 #define M(name, arg_type) {#name, (PyCFunction)name, arg_type, NULL}
 #define MW(name, arg_type) {#name, (PyCFunction)py##name, arg_type, NULL}
@@ -1140,7 +1152,7 @@ static PyMethodDef module_methods[] = {
     MW(mark_os_window_dirty, METH_VARARGS),
     MW(set_active_window, METH_VARARGS),
     MW(swap_tabs, METH_VARARGS),
-    MW(add_borders_rect, METH_VARARGS),
+    MW(set_borders_rects, METH_VARARGS),
     MW(set_tab_bar_render_data, METH_VARARGS),
     MW(set_window_render_data, METH_VARARGS),
     MW(set_window_padding, METH_VARARGS),
@@ -5,7 +5,7 @@
 import stat
 import weakref
 from collections import deque
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from functools import partial
 from operator import attrgetter
 from time import monotonic
@@ -116,6 +116,8 @@ def __init__(
             setattr(self, which + '_window', partial(self.nth_window, num=i))
         self._last_used_layout: Optional[str] = None
         self._current_layout_name: Optional[str] = None
+        self.relayout_deferred = 0
+        self.relayout_pending = False
         self.cwd = self.args.directory
         if no_initial_window:
             self._set_current_layout(self.enabled_layouts[0])
@@ -167,13 +169,36 @@ def _set_current_layout(self, layout_name: str) -> None:
         self.mark_tab_bar_dirty()
 
     def startup(self, session_tab: 'SessionTab') -> None:
-        for cmd in session_tab.windows:
-            if isinstance(cmd, SpecialWindowInstance):
-                self.new_special_window(cmd)
-            else:
-                from .launch import launch
-                launch(get_boss(), cmd.opts, cmd.args, target_tab=self, force_target_tab=True)
+        from .launch import launch
+        timings: List[Tuple[Optional[Window], float]] = []
+        st = monotonic()
+        # Layout all the windows of the session tab once, after they have all
+        # been created, instead of once per added window
+        with self.deferred_relayout():
+            for cmd in session_tab.windows:
+                wst = monotonic()
+                if isinstance(cmd, SpecialWindowInstance):
+                    w: Optional[Window] = self.new_special_window(cmd)
+                else:
+                    w = launch(get_boss(), cmd.opts, cmd.args, target_tab=self, force_target_tab=True)
+                timings.append((w, monotonic() - wst))
         self.windows.set_active_window_group_for(self.windows.all_windows[session_tab.active_window_idx])
+        if self.args.debug_startup:
+            for w, t in timings:
+                if w is not None:
+                    log_error(f'Spawned window {w.id} ({" ".join(w.child.argv)}) in {t * 1000:.1f} ms')
+            log_error(f'Started {len(timings)} windows in tab {self.id} in {(monotonic() - st) * 1000:.1f} ms')
+
+    @contextmanager
+    def deferred_relayout(self) -> Generator[None, None, None]:
+        self.relayout_deferred += 1
+        try:
+            yield
+        finally:
+            self.relayout_deferred -= 1
+            if not self.relayout_deferred and self.relayout_pending:
+                self.relayout_pending = False
+                self.relayout()
 
     def serialize_state(self) -> Dict[str, Any]:
         return {
@@ -234,11 +259,17 @@ def on_bell(self, window: Window) -> None:
         self.mark_tab_bar_dirty()
 
     def relayout(self) -> None:
+        if self.relayout_deferred:
+            self.relayout_pending = True
+            return
         if self.windows:
             self.current_layout(self.windows)
         self.relayout_borders()
 
     def relayout_borders(self) -> None:
+        if self.relayout_deferred:
+            self.relayout_pending = True
+            return
         tm = self.tab_manager_ref()
         if tm is not None:
             w = self.active_window
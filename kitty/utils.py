@@ -638,31 +638,96 @@ def find_exe(name: str) -> Optional[str]:
     return ans
 
 
-def read_shell_environment(opts: Optional[Options] = None) -> Dict[str, str]:
-    ans: Optional[Dict[str, str]] = getattr(read_shell_environment, 'ans', None)
-    if ans is None:
-        from .child import openpty, remove_blocking
-        ans = {}
-        setattr(read_shell_environment, 'ans', ans)
+def shell_rc_files(shell: List[str]) -> List[str]:
+    name = os.path.basename(shell[0]).lstrip('-')
+    home = os.path.expanduser('~')
+    if name == 'zsh':
+        zdotdir = os.environ.get('ZDOTDIR') or home
+        ans = [os.path.join(d, x) for d in ('/etc', '/etc/zsh') for x in ('zshenv', 'zprofile', 'zshrc', 'zlogin')]
+        ans += [os.path.join(zdotdir, x) for x in ('.zshenv', '.zprofile', '.zshrc', '.zlogin')]
+    elif name == 'fish':
+        config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, '.config')
+        ans = ['/etc/fish/config.fish', '/usr/local/etc/fish/config.fish', os.path.join(config_home, 'fish', 'config.fish')]
+    else:
+        ans = ['/etc/profile', '/etc/bashrc', '/etc/bash.bashrc']
+        ans += [os.path.join(home, x) for x in ('.bash_profile', '.bash_login', '.profile', '.bashrc')]
+    exe = find_exe(shell[0])
+    if exe:
+        ans.insert(0, exe)
+    return ans
+
+
+def shell_environment_cache_key(shell: List[str]) -> List[Any]:
+    mtimes: List[Any] = []
+    for path in shell_rc_files(shell):
+        try:
+            mtimes.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            pass
+    return [shell, mtimes]
+
+
+shell_environment_cache_name = 'shell-environment'
+
+
+def shell_environment_cache_path() -> str:
+    from .constants import cache_dir
+    return os.path.join(cache_dir(), shell_environment_cache_name + '.json')
+
+
+def save_shell_environment(key: List[Any], env: Dict[str, str]) -> None:
+    # The environment can contain secrets exported in the rc files, so make
+    # sure only the user can read it
+    import json
+    from .config import atomic_save
+    path = shell_environment_cache_path()
+    with suppress(OSError):
+        os.chmod(path, 0o600)
+    try:
+        atomic_save(json.dumps({'key': key, 'env': env}).encode('utf-8'), path)
+        os.chmod(path, 0o600)
+    except Exception as err:
+        log_error(f'Failed to save the shell environment with error: {err}')
+
+
+class ShellEnvironmentReader:
+
+    timeout = 1.5
+
+    def __init__(self, shell: List[str]):
         import subprocess
-        shell = resolved_shell(opts)
-        master, slave = openpty()
-        remove_blocking(master)
+        from threading import Thread
+        from .child import openpty, remove_blocking
+        self.ans: Dict[str, str] = {}
+        self.cache_key = shell_environment_cache_key(shell)
+        shell = list(shell)
         if '-l' not in shell and '--login' not in shell:
             shell += ['-l']
         if '-i' not in shell and '--interactive' not in shell:
             shell += ['-i']
+        self.master, self.slave = openpty()
+        remove_blocking(self.master)
+        self.thread: Optional[Thread] = None
         try:
-            p = subprocess.Popen(shell + ['-c', 'env'], stdout=slave, stdin=slave, stderr=slave, start_new_session=True, close_fds=True)
+            self.process = subprocess.Popen(
+                shell + ['-c', 'env'], stdout=self.slave, stdin=self.slave, stderr=self.slave, start_new_session=True, close_fds=True)
         except FileNotFoundError:
             log_error('Could not find shell to read environment')
-            return ans
-        with os.fdopen(master, 'rb') as stdout, os.fdopen(slave, 'wb'):
+            os.close(self.master)
+            os.close(self.slave)
+            return
+        # The shell runs in parallel with the rest of kitty startup, its
+        # output is collected in a thread so that it never blocks on a full pty
+        self.thread = Thread(target=self.collect, name='ReadShellEnv', daemon=True)
+        self.thread.start()
+
+    def collect(self) -> None:
+        from subprocess import TimeoutExpired
+        p = self.process
+        with os.fdopen(self.master, 'rb') as stdout, os.fdopen(self.slave, 'wb'):
             raw = b''
-            from subprocess import TimeoutExpired
-            from time import monotonic
             start_time = monotonic()
-            while monotonic() - start_time < 1.5:
+            while monotonic() - start_time < self.timeout:
                 try:
                     ret: Optional[int] = p.wait(0.01)
                 except TimeoutExpired:
@@ -687,9 +752,64 @@ def read_shell_environment(opts: Optional[Options] = None) -> Dict[str, str]:
                 for line in draw.splitlines():
                     k, v = line.partition('=')[::2]
                     if k and v:
-                        ans[k] = v
+                        self.ans[k] = v
+                if self.ans:
+                    save_shell_environment(self.cache_key, self.ans)
             else:
                 log_error('Failed to run shell to read its environment')
+
+    def wait(self) -> Dict[str, str]:
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        return self.ans
+
+
+def cached_shell_environment(shell: List[str]) -> Optional[Dict[str, str]]:
+    import json
+    try:
+        with open(shell_environment_cache_path(), 'rb') as f:
+            cached_values = json.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as err:
+        log_error(f'Failed to read the cached shell environment with error: {err}')
+        return None
+    if isinstance(cached_values, dict) and cached_values.get('key') == shell_environment_cache_key(shell):
+        env = cached_values.get('env')
+        if isinstance(env, dict):
+            return env
+    return None
+
+
+def clear_shell_environment_cache() -> None:
+    with suppress(FileNotFoundError):
+        os.remove(shell_environment_cache_path())
+    for x in ('ans', 'reader'):
+        with suppress(AttributeError):
+            delattr(read_shell_environment, x)
+
+
+def prefetch_shell_environment(opts: Optional[Options] = None) -> None:
+    # Start the login shell used to read the environment now, so that it runs
+    # in parallel with the rest of startup instead of blocking the first use
+    if getattr(read_shell_environment, 'ans', None) is not None or getattr(read_shell_environment, 'reader', None) is not None:
+        return
+    shell = resolved_shell(opts)
+    env = cached_shell_environment(shell)
+    if env is None:
+        setattr(read_shell_environment, 'reader', ShellEnvironmentReader(shell))
+    else:
+        setattr(read_shell_environment, 'ans', env)
+
+
+def read_shell_environment(opts: Optional[Options] = None) -> Dict[str, str]:
+    prefetch_shell_environment(opts)
+    reader: Optional[ShellEnvironmentReader] = getattr(read_shell_environment, 'reader', None)
+    if reader is not None:
+        delattr(read_shell_environment, 'reader')
+        setattr(read_shell_environment, 'ans', reader.wait())
+    ans: Dict[str, str] = getattr(read_shell_environment, 'ans')
     return ans
 
 
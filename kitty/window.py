@@ -5,14 +5,16 @@
 import os
 import sys
 import weakref
+from base64 import standard_b64decode
 from collections import deque
 from enum import IntEnum
 from functools import partial
 from gettext import gettext as _
 from itertools import chain
+from time import monotonic
 from typing import (
-    TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, List, NamedTuple,
-    Optional, Pattern, Sequence, Tuple, Union
+    TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Pattern,
+    Sequence, Tuple, Union
 )
 
 from .child import ProcessDesc
@@ -50,6 +52,7 @@
 
 if TYPE_CHECKING:
     from .file_transmission import FileTransmission
+    from .rc.base import CommandStats
 
 
 class WindowDict(TypedDict):
@@ -76,10 +79,64 @@ class PipeData(TypedDict):
     text: str
 
 
-class ClipboardPending(NamedTuple):
-    where: str
-    data: str
-    truncated: bool = False
+def strip_non_base64(text: str) -> str:
+    # standard_b64decode() ignores characters that are not in the base64
+    # alphabet, such as newlines, do the same for chunked data
+    pat = getattr(strip_non_base64, 'pat', None)
+    if pat is None:
+        import re
+        pat = re.compile('[^A-Za-z0-9+/]+')
+        setattr(strip_non_base64, 'pat', pat)
+    return pat.sub('', text)
+
+
+class ClipboardPending:
+
+    ''' Accumulate an OSC 52 request that arrives in multiple chunks, decoding
+    the base64 data as it arrives, so that large copies take linear time '''
+
+    def __init__(self, where: str, max_size: float = 0):
+        self.where = where
+        self.max_size = int(max_size * 1024 * 1024)
+        self.encoded_size = 0
+        self.leftover = ''
+        self.data = bytearray()
+        self.truncated = self.invalid = False
+
+    def add(self, text: str) -> None:
+        if self.truncated:
+            return
+        self.encoded_size += len(text)
+        if self.max_size and self.encoded_size > self.max_size:
+            log_error('Discarding part of too large OSC 52 paste request')
+            self.truncated = True
+            self.data = bytearray()
+            self.leftover = ''
+            return
+        if self.invalid:
+            return
+        text = self.leftover + strip_non_base64(text)
+        n = len(text) - len(text) % 4
+        self.leftover = text[n:]
+        if n:
+            self.decode(text[:n])
+
+    def decode(self, text: str) -> None:
+        try:
+            self.data += standard_b64decode(text)
+        except Exception:
+            self.invalid = True
+
+    def finish(self) -> str:
+        if self.leftover and not self.invalid and not self.truncated:
+            self.decode(self.leftover + '=' * (4 - len(self.leftover)))
+            self.leftover = ''
+        if self.invalid:
+            return ''
+        try:
+            return self.data.decode('utf-8')
+        except Exception:
+            return ''
 
 
 class DynamicColor(IntEnum):
@@ -137,13 +194,63 @@ def has_watchers(self) -> bool:
         return bool(self.on_close or self.on_resize or self.on_focus_change)
 
 
+class WatcherTimings:
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = self.worst = 0.
+
+    def add(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total += elapsed
+        self.worst = max(self.worst, elapsed)
+
+    def serialize(self) -> Dict[str, Union[int, float]]:
+        return {'calls': self.calls, 'total_ms': self.total * 1000, 'worst_ms': self.worst * 1000}
+
+
+# watcher path -> event name -> timings
+watcher_timings: Dict[str, Dict[str, WatcherTimings]] = {}
+
+
+def watcher_path(w: Watcher) -> str:
+    code = getattr(w, '__code__', None)
+    return code.co_filename if code is not None else repr(w)
+
+
+def record_watcher_call(w: Watcher, which: str, elapsed: float) -> None:
+    q = watcher_timings.setdefault(watcher_path(w), {})
+    t = q.get(which)
+    if t is None:
+        t = q[which] = WatcherTimings()
+    t.add(elapsed)
+
+
+# (window id, event name) -> data for calls not yet made
+pending_watcher_calls: Dict[Tuple[int, str], Dict[str, Any]] = {}
+
+
 def call_watchers(windowref: Callable[[], Optional['Window']], which: str, data: Dict[str, Any]) -> None:
+    # Calls are made on the next loop tick, bursts of events for a window,
+    # such as from a live resize, are coalesced into a single call with the
+    # latest data
+    w = windowref()
+    if w is None:
+        return
+    key = w.id, which
+    pending = pending_watcher_calls.get(key)
+    if pending is not None:
+        if which == 'on_resize':
+            data = dict(data, old_geometry=pending['old_geometry'])
+        pending_watcher_calls[key] = data
+        return
+    pending_watcher_calls[key] = data
 
     def callback(timer_id: Optional[int]) -> None:
+        data = pending_watcher_calls.pop(key, None)
         w = windowref()
-        if w is not None:
-            watchers: List[Watcher] = getattr(w.watchers, which)
-            w.call_watchers(watchers, data)
+        if w is not None and data is not None:
+            w.call_watchers(which, data)
 
     add_timer(callback, 0, False)
 
@@ -841,16 +948,15 @@ def handle_remote_cmd(self, cmd: str) -> None:
         get_boss().handle_remote_cmd(cmd, self)
 
     def handle_remote_print(self, msg: bytes) -> None:
-        from base64 import standard_b64decode
-
         from .cli import green
         text = standard_b64decode(msg).decode('utf-8')
         text = text.replace('\x1b', green(r'\e')).replace('\a', green(r'\a')).replace('\0', green(r'\0'))
         print(text, end='', file=sys.stderr)
         sys.stderr.flush()
 
-    def send_cmd_response(self, response: Any) -> None:
-        self.screen.send_escape_code_to_child(DCS, '@kitty-cmd' + json.dumps(response))
+    def send_cmd_response(self, response: Any, stats: Optional['CommandStats'] = None) -> None:
+        from .remote_control import serialize_response
+        self.screen.send_escape_code_to_child(DCS, '@kitty-cmd' + serialize_response(response, stats))
 
     def file_transmission(self, data: str) -> None:
         self.file_transmission_control.handle_serialized_command(data)
@@ -859,28 +965,22 @@ def clipboard_control(self, data: str, is_partial: bool = False) -> None:
         where, text = data.partition(';')[::2]
         if is_partial:
             if self.clipboard_pending is None:
-                self.clipboard_pending = ClipboardPending(where, text)
-            else:
-                self.clipboard_pending = self.clipboard_pending._replace(data=self.clipboard_pending[1] + text)
-                limit = get_options().clipboard_max_size
-                if limit and len(self.clipboard_pending.data) > limit * 1024 * 1024:
-                    log_error('Discarding part of too large OSC 52 paste request')
-                    self.clipboard_pending = self.clipboard_pending._replace(data='', truncated=True)
+                self.clipboard_pending = ClipboardPending(where, get_options().clipboard_max_size)
+            self.clipboard_pending.add(text)
             return
 
+        decoded: Optional[str] = None
         if not where:
             if self.clipboard_pending is not None:
-                text = self.clipboard_pending.data + text
-                where = self.clipboard_pending.where
-                try:
-                    if self.clipboard_pending.truncated:
-                        return
-                finally:
-                    self.clipboard_pending = None
+                cp, self.clipboard_pending = self.clipboard_pending, None
+                cp.add(text)
+                if cp.truncated:
+                    return
+                where, decoded = cp.where, cp.finish()
             else:
                 where = 's0'
         cc = get_options().clipboard_control
-        if text == '?':
+        if decoded is None and text == '?':
             response = None
             if 's' in where or 'c' in where:
                 if 'read-clipboard-ask' in cc:
@@ -896,11 +996,12 @@ def clipboard_control(self, data: str, is_partial: bool = False) -> None:
             self.send_osc52(loc, response or '')
 
         else:
-            from base64 import standard_b64decode
-            try:
-                text = standard_b64decode(text).decode('utf-8')
-            except Exception:
-                text = ''
+            if decoded is None:
+                try:
+                    decoded = standard_b64decode(text).decode('utf-8')
+                except Exception:
+                    decoded = ''
+            text = decoded
 
             if 's' in where or 'c' in where:
                 if 'write-clipboard' in cc:
@@ -1011,17 +1112,20 @@ def text_for_selection(self) -> str:
             return ''.join((ln.rstrip() or '\n') for ln in lines)
         return ''.join(lines)
 
-    def call_watchers(self, which: Iterable[Watcher], data: Dict[str, Any]) -> None:
+    def call_watchers(self, which: str, data: Dict[str, Any]) -> None:
         boss = get_boss()
-        for w in which:
+        watchers: List[Watcher] = getattr(self.watchers, which)
+        for w in watchers:
+            st = monotonic()
             try:
                 w(boss, self, data)
             except Exception:
                 import traceback
                 traceback.print_exc()
+            record_watcher_call(w, which, monotonic() - st)
 
     def destroy(self) -> None:
-        self.call_watchers(self.watchers.on_close, {})
+        self.call_watchers('on_close', {})
         self.destroyed = True
         if hasattr(self, 'screen'):
             # Remove cycles so that screen is de-allocated immediately
@@ -1091,18 +1195,8 @@ def paste_bytes(self, text: Union[str, bytes]) -> None:
     @ac('cp', 'Paste the specified text into the current window')
     def paste(self, text: Union[str, bytes]) -> None:
         if text and not self.destroyed:
-            if isinstance(text, str):
-                text = text.encode('utf-8')
-            if self.screen.in_bracketed_paste_mode:
-                while True:
-                    new_text = text.replace(b'\033[201~', b'').replace(b'\x9b201~', b'')
-                    if len(text) == len(new_text):
-                        break
-                    text = new_text
-            else:
-                # Workaround for broken editors like nano that cannot handle
-                # newlines in pasted text see https://github.com/kovidgoyal/kitty/issues/994
-                text = text.replace(b'\r\n', b'\n').replace(b'\n', b'\r')
+            # The text is sanitized for bracketed paste or has its newlines
+            # translated in a single pass as it is queued for the child
             self.screen.paste(text)
 
     @ac('cp', 'Copy the selected text from the active window to the clipboard')
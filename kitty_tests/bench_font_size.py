@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# License: GPL v3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Measure the latency of changing the font size in all OS windows. This is a
+# kitten that runs inside the kitty process, run it with:
+#
+#   kitty -o 'map f1 kitten /path/to/kitty_tests/bench_font_size.py'
+#
+# and press F1. It opens extra OS windows, changes the font size back and
+# forth in all of them and reports the times in a new window.
+
+from time import monotonic
+from typing import Any, Dict, List
+
+from kitty.boss import Boss
+from kitty.fast_data_types import mark_os_window_for_close
+
+from kittens.tui.handler import result_handler
+
+NUM_OS_WINDOWS = 20
+NUM_CHANGES = 10
+
+
+def main(args: List[str]) -> None:
+    pass
+
+
+@result_handler(no_ui=True)
+def handle_result(args: List[str], answer: Any, target_window_id: int, boss: Boss) -> None:
+    num_os_windows = int(args[1]) if len(args) > 1 else NUM_OS_WINDOWS
+    extra_os_windows = [boss._new_os_window(()) for i in range(max(0, num_os_windows - len(boss.os_window_map)))]
+    timings: Dict[str, List[float]] = {'+': [], '-': []}
+    try:
+        for i in range(NUM_CHANGES):
+            for op in '+-':
+                st = monotonic()
+                boss.change_font_size(True, op, 2.0)
+                timings[op].append(monotonic() - st)
+    finally:
+        for os_window_id in extra_os_windows:
+            mark_os_window_for_close(os_window_id)
+    lines = [f'Changed the font size in {len(boss.os_window_map)} OS windows {NUM_CHANGES} times in each direction']
+    for op, name in (('+', 'increase'), ('-', 'decrease')):
+        t = timings[op]
+        # the first change renders the sprites for the new cell size, the
+        # rest can re-use them
+        lines.append(f'{name}: first: {t[0] * 1000:.1f} ms average of rest: {sum(t[1:]) * 1000 / max(1, len(t) - 1):.1f} ms')
+    boss.display_scrollback(boss.active_window, '\n'.join(lines), title='Font size change benchmark')
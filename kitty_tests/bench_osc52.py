@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# License: GPL v3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Measure how long the terminal takes to process a large OSC 52 copy. Run it
+# inside kitty. Note that clipboard_max_size must be larger than the size of
+# the base64 encoded payload for the data to actually reach the clipboard.
+
+import os
+import sys
+import termios
+import tty
+from argparse import ArgumentParser
+from base64 import standard_b64encode
+from time import monotonic
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark OSC 52 clipboard writes')
+    parser.add_argument('--size', default=50, type=float, help='Size of the data to copy in MB')
+    parser.add_argument('--chunk-size', default=64 * 1024, type=int, help='Number of bytes to write to the terminal at a time')
+    args = parser.parse_args()
+
+    line = b'The quick brown fox jumps over the lazy dog. 0123456789\n'
+    data = line * (int(args.size * 1024 * 1024) // len(line))
+    payload = b'\033]52;c;' + standard_b64encode(data) + b'\033\\'
+    fd = sys.stdout.fileno()
+    old = termios.tcgetattr(fd)
+    tty.setraw(fd)
+    try:
+        st = monotonic()
+        for i in range(0, len(payload), args.chunk_size):
+            os.write(fd, payload[i:i + args.chunk_size])
+        # The response to the primary device attributes query is sent only
+        # after the terminal has finished processing everything before it
+        os.write(fd, b'\033[c')
+        response = b''
+        while not response.endswith(b'c'):
+            response += os.read(fd, 64)
+        elapsed = monotonic() - st
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+    print(f'Copied {len(data) / (1024 * 1024):.1f} MB ({len(payload) / (1024 * 1024):.1f} MB encoded) in {elapsed:.2f} seconds')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# License: GPL v3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+# Measure the throughput of the escape code parser and screen without any
+# rendering or I/O. Synthetic streams are generated from a fixed seed, so the
+# numbers can be compared across commits. Run it from the source directory
+# with:
+#
+#   python3 -m kitty_tests.bench_parser
+#
+# Use --file to also measure streams recorded with kitty --dump-bytes and
+# --json to get machine readable output.
+
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from base64 import standard_b64encode
+from random import Random
+from string import ascii_letters, digits, punctuation
+from time import perf_counter
+from typing import Callable, Dict, List
+
+WORD_CHARS = ascii_letters + digits + punctuation
+WIDE_CHARS = '日本語中文字👍💜🎩🍀☃、。'
+COMBINING_CHARS = '\u0301\u0308\u0323'
+
+
+def words(rng: Random, num: int) -> List[str]:
+    return [''.join(rng.choices(WORD_CHARS, k=rng.randint(1, 10))) for i in range(num)]
+
+
+def lines(rng: Random, size: int, make_line: Callable[[], str]) -> bytes:
+    ans: List[bytes] = []
+    total = 0
+    while total < size:
+        line = make_line().encode('utf-8') + b'\r\n'
+        ans.append(line)
+        total += len(line)
+    return b''.join(ans)
+
+
+def ascii_stream(rng: Random, size: int) -> bytes:
+    return lines(rng, size, lambda: ' '.join(words(rng, rng.randint(0, 12))))
+
+
+def sgr_stream(rng: Random, size: int) -> bytes:
+
+    def sgr() -> str:
+        q = rng.randrange(5)
+        if q == 0:
+            return f'\x1b[{rng.choice((1, 2, 3, 4, 7, 9))}m'
+        if q == 1:
+            return f'\x1b[{rng.randint(30, 37)};{rng.randint(40, 47)}m'
+        if q == 2:
+            return f'\x1b[38;5;{rng.randrange(256)}m'
+        if q == 3:
+            return f'\x1b[48;2;{rng.randrange(256)};{rng.randrange(256)};{rng.randrange(256)}m'
+        return '\x1b[m'
+
+    return lines(rng, size, lambda: ' '.join(sgr() + w for w in words(rng, rng.randint(0, 12))) + '\x1b[m')
+
+
+def unicode_stream(rng: Random, size: int) -> bytes:
+
+    def word() -> str:
+        ans = ''.join(rng.choices(WIDE_CHARS, k=rng.randint(1, 6)))
+        if rng.random() < 0.3:
+            ans = rng.choice('aeiou') + rng.choice(COMBINING_CHARS) + ans
+        return ans
+
+    return lines(rng, size, lambda: ' '.join(word() for i in range(rng.randint(0, 8))))
+
+
+def random_bytes(rng: Random, size: int) -> bytes:
+    return rng.getrandbits(size * 8).to_bytes(size, 'little')
+
+
+def graphics_stream(rng: Random, size: int) -> bytes:
+    ans: List[bytes] = []
+    total = 0
+    while total < size:
+        width, height = rng.randint(1, 32), rng.randint(1, 32)
+        data = standard_b64encode(random_bytes(rng, width * height * 3)).decode('ascii')
+        cmd = f'\x1b_Gi={rng.randint(1, 16)},a=T,f=24,s={width},v={height},q=2;{data}\x1b\\'
+        line = (cmd + ' '.join(words(rng, 4)) + '\r\n').encode('ascii')
+        ans.append(line)
+        total += len(line)
+    return b''.join(ans)
+
+
+STREAMS: Dict[str, Callable[[Random, int], bytes]] = {
+    'ascii': ascii_stream,
+    'sgr': sgr_stream,
+    'unicode': unicode_stream,
+    'graphics': graphics_stream,
+}
+
+
+def measure(data: bytes, cols: int, rows: int, scrollback: int, chunk_size: int, repeat: int) -> float:
+    from kitty.fast_data_types import parse_bytes
+
+    from . import BaseTest
+    best = float('inf')
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    for i in range(repeat):
+        screen = BaseTest().create_screen(cols=cols, lines=rows, scrollback=scrollback)
+        st = perf_counter()
+        for chunk in chunks:
+            parse_bytes(screen, chunk)
+        best = min(best, perf_counter() - st)
+    return best
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark the parser and screen without rendering')
+    parser.add_argument('--size', default=8, type=float, help='Size of each synthetic stream in MB')
+    parser.add_argument('--stream', action='append', choices=tuple(STREAMS), help='Synthetic streams to run, can be specified multiple times. Defaults to all.')
+    parser.add_argument(
+        '--file', action='append', default=[],
+        help='Path to a recorded stream, for example, from kitty --dump-bytes. Can be specified multiple times.')
+    parser.add_argument('--repeat', default=5, type=int, help='Number of times to run each stream, the fastest run is reported')
+    parser.add_argument(
+        '--chunk-size', default=1024 * 1024, type=int,
+        help='Number of bytes to parse at a time, defaults to the size of the read buffer used by kitty')
+    parser.add_argument('--cols', default=200, type=int, help='Width of the screen')
+    parser.add_argument('--lines', default=50, type=int, help='Height of the screen')
+    parser.add_argument('--scrollback', default=10000, type=int, help='Number of lines of scrollback')
+    parser.add_argument('--seed', default=1, type=int, help='Seed for generating the synthetic streams')
+    parser.add_argument('--json', action='store_true', help='Output the results as JSON')
+    args = parser.parse_args()
+
+    streams: Dict[str, bytes] = {}
+    for name in args.stream or STREAMS:
+        streams[name] = STREAMS[name](Random(args.seed), int(args.size * 1024 * 1024))
+    for path in args.file:
+        with open(path, 'rb') as f:
+            streams[os.path.basename(path)] = f.read()
+
+    results = []
+    for name, data in streams.items():
+        elapsed = measure(data, args.cols, args.lines, args.scrollback, args.chunk_size, args.repeat)
+        num_lines = data.count(b'\n')
+        results.append({
+            'stream': name, 'bytes': len(data), 'lines': num_lines, 'seconds': elapsed,
+            'mb_per_sec': len(data) / (1024 * 1024 * elapsed), 'lines_per_sec': num_lines / elapsed,
+        })
+        if not args.json:
+            r = results[-1]
+            print(f'{name:>12}: {r["mb_per_sec"]:8.2f} MB/s {r["lines_per_sec"]:12,.0f} lines/s', flush=True)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -98,3 +98,32 @@ def random_item():
 
         for threads in range(4):
             self.basic_test(data, 'foo', None, threads=threads)
+
+    def test_matcher(self):
+        ' Test the persistent matcher '
+        from io import BytesIO
+
+        from kittens.choose.match import Matcher
+        m = Matcher(threads=1)
+        m.add(x for x in ('abc', b'xyz', 'ac', ''))
+        self.ae(len(m), 4)
+        self.ae(m.query(''), [(0, 0, ()), (1, 0, ()), (2, 0, ()), (3, 0, ())])
+        self.ae([(i, p) for i, s, p in m.query('A')], [(2, (0,)), (0, (0,))])
+        self.ae([(i, p) for i, s, p in m.query('ac')], [(2, (0, 1)), (0, (0, 2))])
+        m.add(['bac'])
+        self.ae([i for i, s, p in m.query('ac')], [2, 4, 0])
+        self.ae([i for i, s, p in m.query('ac', limit=1)], [2])
+        self.ae(m.query('acx'), [])
+        self.ae(m.query('z'), [(1, m.query('z')[0][1], (2,))])
+        self.assertRaises(TypeError, m.add, [1])
+
+        alphabet = string.ascii_lowercase + '/-.'
+        items = [''.join(random.choice(alphabet) for i in range(random.randint(1, 30))) for x in range(5000)]
+        m = Matcher()
+        m.add_from_file(BytesIO('\n'.join(items).encode()), chunk_size=1000)
+        self.ae(len(m), len(items))
+        for q in ('a', 'ab', 'ab/', 'ab/c', 'b'):
+            fresh = Matcher()
+            fresh.add(items)
+            self.ae(m.query(q), fresh.query(q))
+            self.ae([items[i] for i, s, p in m.query(q)], run(items, q))
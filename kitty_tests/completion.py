@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+
+import json
+import os
+import tempfile
+
+from . import BaseTest
+
+
+class TestCompletion(BaseTest):
+
+    def test_completion_data_cache(self):
+        from kitty.complete import find_completions, load_completion_data
+        with tempfile.TemporaryDirectory() as tdir:
+            path = os.path.join(tdir, 'completion-data.json')
+            data = load_completion_data(path)
+            self.assertTrue(os.path.exists(path))
+            self.assertIn('set-colors', data['rc_commands'])
+            self.assertIn('--all', data['rc_options']['set-colors'][0]['aliases'])
+            self.ae(data['rc_args']['set-colors'], ['files', 'CONF files', ['*.conf']])
+            self.assertIn('icat', data['kitten_options'])
+            self.assertNotIn('ssh', data['kitten_options'])
+            self.ae(load_completion_data(path), data)
+            with open(path, 'w') as f:
+                json.dump(dict(data, rc_commands=['from-cache']), f)
+            self.ae(load_completion_data(path)['rc_commands'], ['from-cache'])
+            with open(path, 'w') as f:
+                json.dump(dict(data, key=['stale'], rc_commands=['from-cache']), f)
+            self.ae(load_completion_data(path), data)
+
+        def matches(*words, new_word=False):
+            ans = find_completions(('kitty',) + words, new_word, ('@',), ('complete', 'kitten'))
+            return {k: sorted(v) for k, v in ans.match_groups.items()}
+
+        self.ae(matches('@', 'set-col'), {'Remote control commands': ['set-colors']})
+        self.ae(matches('@', 'set-colors', '--al'), {'Options': ['--all']})
+        self.ae(matches('@', 'goto-layout', 'ta'), {'Layouts': ['tall']})
+        self.ae(matches('+kitten', 'ica'), {'Kittens': ['icat']})
+        self.ae(matches('+kitten', 'icat', '--pri'), {'Options': ['--print-window-size']})
+        self.ae(matches('-o', 'font_si'), {'Config directives': ['font_size=']})
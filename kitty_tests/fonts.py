@@ -13,7 +13,9 @@
     DECAWM, get_fallback_font, sprite_map_set_layout, sprite_map_set_limits,
     test_render_line, test_sprite_position_for, wcwidth
 )
-from kitty.fonts.box_drawing import box_chars
+from kitty.fonts.box_drawing import (
+    box_chars, render_box_char, render_box_char_cached, rendered_box_chars
+)
 from kitty.fonts.render import (
     coalesce_symbol_maps, render_string, setup_for_testing, shape_string
 )
@@ -62,6 +64,18 @@ def test_box_drawing(self):
         test_render_line(line)
         self.assertEqual(len(self.sprites) - prerendered, len(box_chars))
 
+    def test_box_drawing_cache(self):
+        width, height, dpi = 9, 19, 96.
+        rendered_box_chars.cache_clear()
+        for ch in '─╭█⣿🬀':
+            expected = render_box_char(ch, bytearray(width * height), width, height, dpi)
+            self.ae(render_box_char_cached(ord(ch), bytearray(width * height), width, height, dpi), expected)
+            # served from memory
+            self.ae(render_box_char_cached(ord(ch), bytearray(width * height), width, height, dpi), expected)
+            rendered_box_chars.cache_clear()
+            # served from disk
+            self.ae(render_box_char_cached(ord(ch), bytearray(width * height), width, height, dpi), expected)
+
     def test_font_rendering(self):
         render_string('ab\u0347\u0305你好|\U0001F601|\U0001F64f|\U0001F63a|')
         text = 'He\u0347\u0305llo\u0341, w\u0302or\u0306l\u0354d!'
@@ -181,3 +195,56 @@ def test_coalesce_symbol_maps(self):
         q = {(0, 30): 'a', (10, 10): 'b', (11, 11): 'b', (2, 2): 'c', (1, 1): 'c'}
         self.ae(coalesce_symbol_maps(q), {
             (0, 0): 'a', (1, 2): 'c', (3, 9): 'a', (10, 11): 'b', (12, 30): 'a'})
+
+
+@unittest.skipIf(is_macos, 'Only fontconfig lookups are cached')
+class FontConfigCache(BaseTest):
+
+    def test_font_cache_key(self):
+        from kitty.fonts.fontconfig import font_cache_key
+
+        from .open_actions import patch_env
+        with tempfile.TemporaryDirectory() as tdir, patch_env(XDG_DATA_HOME=tdir):
+            sub = os.path.join(tdir, 'fonts', 'a', 'b')
+            os.makedirs(sub)
+            for x in (tdir, os.path.join(tdir, 'fonts'), os.path.dirname(sub), sub):
+                os.utime(x, ns=(1, 1))
+            key = font_cache_key()
+            self.ae(font_cache_key(), key)
+            # a font added in a sub-directory without running fc-cache
+            open(os.path.join(sub, 'x.ttf'), 'wb').close()
+            self.assertNotEqual(font_cache_key(), key)
+
+    def test_font_cache_saved_once(self):
+        import atexit
+
+        from kitty.fonts import fontconfig as fc
+        calls = []
+
+        def fc_list(spacing, allow_bitmapped_fonts):
+            calls.append(spacing)
+            return ({'family': f'f{spacing}', 'path': '/x'},)
+
+        orig = fc.fc_list
+        fc.fc_list = fc_list
+        fc.font_cache.set_override({'key': fc.font_cache_key(), 'fc_list': {}, 'best_match': {}})
+        path = fc.font_cache_path()
+        try:
+            self.ae(fc.cached_fc_list(1), ({'family': 'f1', 'path': '/x'},))
+            fc.cached_fc_list(2)
+            fc.cached_fc_list(1)
+            self.ae(calls, [1, 2])
+            self.assertFalse(os.path.exists(path))
+            fc.save_font_cache()
+            fc.font_cache.clear_override()
+            fc.font_cache.clear_cached()
+            self.ae(sorted(fc.font_cache()['fc_list']), ['1:0', '2:0'])
+            os.remove(path)
+            fc.save_font_cache()
+            self.assertFalse(os.path.exists(path))
+        finally:
+            fc.fc_list = orig
+            fc.font_cache.clear_override()
+            fc.font_cache.clear_cached()
+            fc.font_cache_dirty = False
+            atexit.unregister(fc.save_font_cache)
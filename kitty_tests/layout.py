@@ -4,6 +4,7 @@
 from kitty.config import defaults
 from kitty.types import WindowGeometry
 from kitty.layout.interface import Grid, Horizontal, Splits, Stack, Tall
+from kitty.layout.splits import Pair
 from kitty.window import EdgeWidths
 from kitty.window_list import WindowList, reset_group_id_counter
 
@@ -21,6 +22,7 @@ def __init__(self, win_id, overlay_for=None, overlay_window_id=None):
         self.padding = EdgeWidths()
         self.margin = EdgeWidths()
         self.focused = False
+        self.needs_attention = False
 
     def focus_changed(self, focused):
         self.focused = focused
@@ -257,3 +259,64 @@ def test_splits(self):
         self.ae(q.neighbors_for_window(windows[1], all_windows), {'left': [1], 'right': [], 'top': [], 'bottom': [3, 4]})
         self.ae(q.neighbors_for_window(windows[2], all_windows), {'left': [1], 'right': [4], 'top': [2], 'bottom': []})
         self.ae(q.neighbors_for_window(windows[3], all_windows), {'left': [3], 'right': [], 'top': [2], 'bottom': []})
+
+    def test_neighbors_graph(self):
+        q = create_layout(Horizontal)
+        windows = create_windows(q, num=3)
+        q(windows)
+        calls = []
+        orig = q.neighbors_for_window
+
+        def neighbors_for_window(*a):
+            calls.append(a)
+            return orig(*a)
+
+        q.neighbors_for_window = neighbors_for_window
+        windows.set_active_group_idx(1)
+        self.ae(q.neighbors(windows), {'left': [1], 'right': [3], 'top': [], 'bottom': []})
+        self.ae(q.neighbors(windows), {'left': [1], 'right': [3], 'top': [], 'bottom': []})
+        self.ae(len(calls), 1)
+        windows.set_active_group_idx(2)
+        self.ae(q.neighbors(windows), {'left': [2], 'right': [], 'top': [], 'bottom': []})
+        windows.set_active_group_idx(1)
+        q.neighbors(windows)
+        self.ae(len(calls), 2)
+        q.move_window(windows, 1)
+        q(windows)
+        self.ae(q.neighbors(windows), {'left': [3], 'right': [], 'top': [], 'bottom': []})
+        self.ae(len(calls), 3)
+
+    def test_splits_layout_cache(self):
+        q = create_layout(Splits)
+        all_windows = create_windows(q, num=8)
+        q(all_windows)
+        all_pairs = tuple(q.pairs_root.self_and_descendants())
+        geometries = [w.geometry for w in all_windows]
+        borders = tuple(q.minimal_borders(all_windows))
+        computed = []
+        orig = Pair.do_layout_pair
+
+        def do_layout_pair(pair, *a):
+            computed.append(pair)
+            return orig(pair, *a)
+
+        Pair.do_layout_pair = do_layout_pair
+        try:
+            q(all_windows)
+            self.ae(computed, [])
+            self.ae(geometries, [w.geometry for w in all_windows])
+            self.ae(borders, tuple(q.minimal_borders(all_windows)))
+            # only the resized pair and its ancestors are laid out again
+            pair = q.pairs_root.pair_for_window(8)
+            self.assertTrue(q.modify_size_of_window(all_windows, 8, 0.2, pair.horizontal))
+            q(all_windows)
+            self.assertIn(pair, computed)
+            self.assertLess(len(computed), len(all_pairs))
+            geometries = [w.geometry for w in all_windows]
+            self.assertNotEqual(geometries, [w.geometry for w in create_windows(create_layout(Splits), num=8)])
+            for p in all_pairs:
+                p.layout_key = None
+            q(all_windows)
+            self.ae(geometries, [w.geometry for w in all_windows])
+        finally:
+            Pair.do_layout_pair = orig
@@ -2,7 +2,10 @@
 # License: GPL v3 Copyright: 2018, Kovid Goyal <kovid at kovidgoyal.net>
 
 
+import json
 import os
+import shutil
+import tempfile
 from contextlib import contextmanager
 
 from . import BaseTest
@@ -54,3 +57,100 @@ def single(url, func, *args):
         single('file://hostname/tmp/moo.txt#23', 'launch', 'editor', '/tmp/moo.txt', '23')
         single('some thing.txt', 'ignored')
         self.ae(actions('x:///a.txt'), (KeyAction('one', ()), KeyAction('two', ())))
+
+    def test_compiled_open_actions(self):
+        from kitty import open_actions
+        from kitty.open_actions import CompiledOpenActions, actions_for_url, parse
+        spec = '''
+protocol https,ftp
+action https
+
+ext tar.gz
+action tarball
+
+url (
+action bad_regex
+
+file *.GZ
+action gz
+
+path /tmp/*
+action tmp
+
+protocol file
+action file
+'''
+        ca = CompiledOpenActions(parse(spec.splitlines()))
+        self.ae(sorted(ca.by_protocol), ['file', 'ftp', 'https'])
+        self.ae(sorted(ca.by_ext), ['tar.gz'])
+
+        def first(url, spec=spec):
+            acts = tuple(actions_for_url(url, spec))
+            return acts[0].func if acts else None
+
+        self.ae(first('https://x.org/a.tar.gz'), 'https')
+        self.ae(first('/x/a.tar.gz'), 'tarball')
+        self.ae(first('/x/a.gz'), 'gz')
+        self.ae(first('/tmp/a.txt'), 'tmp')
+        self.ae(first('/x/a.txt'), 'file')
+        self.ae(first('ssh://x/a.txt'), None)
+
+        tdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tdir)
+        orig = open_actions.config_dir
+        open_actions.config_dir = tdir
+        self.addCleanup(setattr, open_actions, 'config_dir', orig)
+        open_actions.clear_open_actions_cache()
+        self.ae(len(open_actions.load_open_actions().actions), 0)
+        path = os.path.join(tdir, 'open-actions.conf')
+        with open(path, 'w') as f:
+            f.write(spec)
+        ca = open_actions.load_open_actions()
+        self.ae(len(ca.actions), 6)
+        self.assertIs(open_actions.load_open_actions(), ca)
+        with open(path, 'a') as f:
+            f.write('\nprotocol ssh\naction ssh\n')
+        self.ae(first('ssh://x/a.txt', None), 'ssh')
+
+    def test_mime_types_index(self):
+        import mimetypes
+
+        from kitty import guess_mime_type as g
+        orig = mimetypes.knownfiles
+        with tempfile.TemporaryDirectory() as tdir:
+            path = os.path.join(tdir, 'mime.types')
+            mimetypes.knownfiles = [path]
+            g.system_mime_types.clear_cached()
+            try:
+                self.ae(g.guess_type_from_index('/a/b.PNG'), 'image/png')
+                self.ae(g.guess_type('a.json'), 'text/json')
+                self.assertIsNone(g.guess_type_from_index('a.conf'))
+                self.ae(g.guess_type('a.conf'), 'text/config')
+                for q in ('x.tar.gz', 'noext', '.bashrc', 'a.'):
+                    self.assertIsNone(g.guess_type_from_index(q))
+                self.ae(g.guess_type('x.tar.gz'), 'application/x-tar')
+                # the system database takes precedence over the index
+                with open(path, 'w') as f:
+                    f.write('text/x-csrc c\nimage/x-test png\ntext/x-test rst conf\n')
+                g.system_mime_types.clear_cached()
+                self.ae(g.guess_type('a.c'), 'text/x-csrc')
+                self.ae(g.guess_type('a.PNG'), 'image/x-test')
+                self.ae(g.guess_type('a.rst'), 'text/x-test')
+                self.ae(g.guess_type('a.conf'), 'text/x-test')
+                # and is only parsed again when it changes
+                from kitty.constants import cache_dir
+                cache_path = os.path.join(cache_dir(), 'mime-types.json')
+                with open(cache_path) as f:
+                    cached = json.load(f)
+                cached['overrides']['c'] = 'text/x-cached'
+                with open(cache_path, 'w') as f:
+                    json.dump(cached, f)
+                g.system_mime_types.clear_cached()
+                self.ae(g.guess_type('a.c'), 'text/x-cached')
+                os.remove(path)
+                g.system_mime_types.clear_cached()
+                self.ae(g.guess_type('a.c'), 'text/plain')
+                self.ae(g.guess_type('a.rst'), 'text/restructured-text')
+            finally:
+                mimetypes.knownfiles = orig
+                g.system_mime_types.clear_cached()
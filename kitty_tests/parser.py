@@ -8,8 +8,8 @@
 
 from kitty.fast_data_types import CURSOR_BLOCK, parse_bytes, parse_bytes_dump
 from kitty.notify import (
-    NotificationCommand, handle_notification_cmd, notification_activated,
-    reset_registry
+    NotificationCommand, NotificationQueue, handle_notification_cmd,
+    notification_activated, reset_registry
 )
 
 from . import BaseTest
@@ -307,6 +307,41 @@ def activated(identifier, window_id, focus, report):
         self.ae(activations, [('0', 1, True, False)])
         reset()
 
+    def test_notification_queue(self):
+        reset_registry()
+        notifications = []
+        timers = []
+        now = 0
+
+        def notify(title, body, identifier):
+            notifications.append((title, body))
+
+        def send(title, window_id=1, body=''):
+            cmd = NotificationCommand()
+            cmd.title, cmd.body = title, body
+            q.add(title, body, cmd, window_id, notify)
+
+        def fire(at):
+            nonlocal now
+            now = at
+            timers.pop(0)()
+
+        q = NotificationQueue(burst=2, interval=1, duplicate_interval=1, clock=lambda: now, schedule=lambda delay, cb: timers.append(cb))
+        send('a'), send('a'), send('b')
+        self.ae(notifications, [('a', ''), ('b', '')])
+        send('c'), send('d'), send('e'), send('x', window_id=2)
+        self.ae(notifications, [('a', ''), ('b', ''), ('x', '')])
+        self.ae(len(timers), 1)
+        fire(0.5)
+        self.ae(len(notifications), 3)
+        fire(1)
+        self.ae(notifications[-1], ('e', '2 more notifications from this window were merged into this one'))
+        self.ae(timers, [])
+        now = 3
+        send('e')
+        self.ae(len(notifications), 5)
+        reset_registry()
+
     def test_dcs_codes(self):
         s = self.create_screen()
         c = s.callbacks
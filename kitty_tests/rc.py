@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+
+import json
+import tempfile
+
+from . import BaseTest
+
+
+class TestRemoteControl(BaseTest):
+
+    def test_rc_stats(self):
+        from kitty.constants import version
+        from kitty.rc.base import Histogram, command_stats
+        from kitty.remote_control import encode_response_for_peer, handle_cmd
+
+        h = Histogram()
+        for x in (0.5, 1, 1.5, 3, 1000):
+            h.add(x)
+        self.ae(h.serialize(), {'count': 5, 'total': 1006, 'max': 1000, 'buckets': {'<1': 1, '<2': 2, '<4': 1, '<1024': 1}})
+
+        def run(payload):
+            cmd = json.dumps({'cmd': 'rc-stats', 'version': version, 'payload': payload})
+            response, stats = handle_cmd(None, None, cmd, 0)
+            encode_response_for_peer(response, stats)
+            return json.loads(response['data'])
+
+        command_stats.clear()
+        run({})
+        s = run({'reset': True})['rc-stats']
+        self.ae(s['calls'], 2)
+        self.ae(s['errors'], 0)
+        self.ae(s['execute_us']['count'], 1)
+        self.ae(s['serialize_us']['count'], 1)
+        self.ae(s['match_us']['count'], 0)
+        self.ae(s['payload_bytes']['count'], 2)
+        self.ae(dict(command_stats), {})
+
+        # responses can be serialized in any order
+        r1, s1 = handle_cmd(None, None, json.dumps({'cmd': 'rc-stats', 'version': version, 'payload': {}}), 0)
+        r2, s2 = handle_cmd(None, None, json.dumps({'cmd': 'watcher-stats', 'version': version, 'payload': {}}), 0)
+        encode_response_for_peer(r2, s2)
+        encode_response_for_peer(r1, s1)
+        encode_response_for_peer(r1)
+        self.ae(command_stats['rc-stats'].serialize_us.count, 1)
+        self.ae(command_stats['watcher-stats'].serialize_us.count, 1)
+        command_stats.clear()
+
+    def test_send_text_session_cache(self):
+        from types import SimpleNamespace
+
+        from kitty.rc.send_text import resolve_windows, resolved_sessions
+
+        def window(wid, title):
+            return SimpleNamespace(id=wid, title=title)
+
+        windows = {1: window(1, 'a'), 2: window(2, 'b'), 3: window(3, 'a')}
+
+        def match_windows(match):
+            field, exp = match.split(':', 1)
+            for w in windows.values():
+                if str(getattr(w, 'id' if field == 'id' else field)) == exp:
+                    yield w
+
+        boss = SimpleNamespace(window_id_map=windows, all_windows=[], active_window=windows[1], match_windows=match_windows)
+
+        def resolve(session_id='s', **payload):
+            payload['session_id'] = session_id
+            boss.all_windows = list(windows.values())
+            return [w.id for w in resolve_windows(boss, payload.get)]
+
+        resolved_sessions.clear()
+        self.ae(resolve(all=True), [1, 2, 3])
+        self.assertIn('s', resolved_sessions)
+        boss.match_windows = None  # the cached result is used
+        self.ae(resolve(all=True), [1, 2, 3])
+        windows[4] = window(4, 'a')
+        boss.match_windows = match_windows
+        self.ae(resolve(all=True), [1, 2, 3, 4])
+        self.ae(resolve('i', match='id:2'), [2])
+        self.assertIn('i', resolved_sessions)
+        # matches on mutable state and the active window are not cached
+        self.ae(resolve('t', match='title:a'), [1, 3, 4])
+        windows[3].title = 'b'
+        self.ae(resolve('t', match='title:a'), [1, 4])
+        self.ae(resolve('d'), [1])
+        boss.active_window = windows[2]
+        self.ae(resolve('d'), [2])
+        self.assertNotIn('t', resolved_sessions)
+        self.assertNotIn('d', resolved_sessions)
+
+        from kitty.rc.base import command_stats
+        from kitty.rc.send_text import send_text
+        writes = []
+        boss.child_monitor = SimpleNamespace(needs_write_many=lambda ids, data: writes.append((ids, data)))
+        command_stats.clear()
+        send_text.response_from_kitty(boss, None, {'all': True, 'data': 'text:x', 'session_id': 's'}.get)
+        self.ae(writes, [((1, 2, 3, 4), b'x')])
+        self.ae(command_stats['send-text'].match_us.count, 1)
+        command_stats.clear()
+
+    def test_send_text_chunks(self):
+        from base64 import standard_b64decode
+        from types import SimpleNamespace
+
+        from kitty.rc.send_text import send_text
+
+        opts = SimpleNamespace(match=None, match_tab=None, all=False, exclude_active=False, stdin=False, from_file=None)
+        text = 'a' * 1500 + '☃'
+        payloads = [dict(p) for p in send_text.message_to_kitty(SimpleNamespace(to=None), opts, [text])]
+        self.ae([p['data'] for p in payloads], ['text:' + text[:1024], 'text:' + text[1024:]])
+        self.ae(len({p['session_id'] for p in payloads}), 1)
+
+        with tempfile.NamedTemporaryFile() as f:
+            data = bytes(range(256)) * 40
+            f.write(data)
+            f.flush()
+            opts.from_file = f.name
+            for to, size in ((None, 4096), ('unix:/x', 32 * 1024)):
+                chunks = [p['data'] for p in send_text.message_to_kitty(SimpleNamespace(to=to), opts, [])]
+                decoded = [standard_b64decode(c.partition(':')[2]) for c in chunks if c.startswith('base64:')]
+                self.ae(b''.join(decoded), data)
+                self.ae(max(map(len, decoded)), min(size, len(data)))
+
+    def test_watcher_stats(self):
+        import weakref
+
+        from kitty import window as wmod
+        from kitty.constants import version
+        from kitty.remote_control import encode_response_for_peer, handle_cmd
+
+        calls = []
+
+        def on_resize(boss, window, data):
+            calls.append((window.id, data))
+
+        class FakeWindow:
+            call_watchers = wmod.Window.call_watchers
+
+            def __init__(self, wid):
+                self.id = wid
+                self.watchers = wmod.Watchers()
+                self.watchers.on_resize.append(on_resize)
+
+        timers = []
+        orig_add_timer = wmod.add_timer
+        wmod.add_timer = lambda callback, interval, repeats: timers.append(callback)
+        wmod.watcher_timings.clear()
+        wmod.pending_watcher_calls.clear()
+        try:
+            w1, w2 = FakeWindow(1), FakeWindow(2)
+            for i in range(5):
+                wmod.call_watchers(weakref.ref(w1), 'on_resize', {'old_geometry': i, 'new_geometry': i + 1})
+            wmod.call_watchers(weakref.ref(w2), 'on_resize', {'old_geometry': 10, 'new_geometry': 11})
+            self.ae(len(timers), 2)
+            for callback in timers:
+                callback(None)
+            self.ae(calls, [(1, {'old_geometry': 0, 'new_geometry': 5}), (2, {'old_geometry': 10, 'new_geometry': 11})])
+            # pending calls for windows that have been closed are dropped
+            del timers[:], calls[:]
+            wmod.call_watchers(weakref.ref(w2), 'on_resize', {'old_geometry': 11, 'new_geometry': 12})
+            del w2
+            timers[0](None)
+            self.ae(calls, [])
+            self.ae(wmod.pending_watcher_calls, {})
+        finally:
+            wmod.add_timer = orig_add_timer
+
+        def run(payload):
+            cmd = json.dumps({'cmd': 'watcher-stats', 'version': version, 'payload': payload})
+            response, stats = handle_cmd(None, None, cmd, 0)
+            encode_response_for_peer(response, stats)
+            return json.loads(response['data'])
+
+        s = run({})
+        self.ae(list(s), [__file__])
+        self.ae(s[__file__]['on_resize']['calls'], 2)
+        self.assertGreaterEqual(s[__file__]['on_resize']['worst_ms'], 0)
+        self.ae(run({'reset': True}), s)
+        self.ae(run({}), {})
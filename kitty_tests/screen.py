@@ -825,6 +825,47 @@ def t(q, use_pending_mode, *expected):
             t('', use_pending_mode, ('p;', False))
             t('!', use_pending_mode, ('p;!', False))
 
+    def test_osc_52_chunks(self):
+        from base64 import encodebytes, standard_b64encode
+
+        from kitty.window import ClipboardPending
+        text = 'abc\u2603\U0001f431' * 1001
+        encoded = standard_b64encode(text.encode('utf-8')).decode('ascii')
+        for chunk_size in (1, 3, 4, 7, 8186):
+            cp = ClipboardPending('c')
+            for i in range(0, len(encoded), chunk_size):
+                cp.add(encoded[i:i+chunk_size])
+            self.ae(cp.finish(), text)
+        # wrapped base64 such as the output of the base64 utility
+        wrapped = encodebytes(text.encode('utf-8')).decode('ascii')
+        self.assertIn('\n', wrapped)
+        for chunk_size in (1, 5, 77, 1000):
+            cp = ClipboardPending('c')
+            for i in range(0, len(wrapped), chunk_size):
+                cp.add(wrapped[i:i+chunk_size])
+            self.ae(cp.finish(), text)
+        # the padding added by finish() does not count towards the limit
+        cp = ClipboardPending('c', max_size=3 / (1024 * 1024))
+        cp.add('YWI')
+        self.ae(cp.finish(), 'ab')
+        cp = ClipboardPending('c', max_size=1 / 1024)
+        for i in range(0, len(encoded), 100):
+            cp.add(encoded[i:i+100])
+        self.assertTrue(cp.truncated)
+        cp = ClipboardPending('c')
+        cp.add(standard_b64encode(b'\xff\xfe').decode('ascii'))
+        self.ae(cp.finish(), '')
+
+    def test_paste(self):
+        s = self.create_screen()
+        c = s.callbacks
+        s.paste('a\r\nb\nc\r\r\n')
+        self.ae(c.wtcbuf, b'a\rb\rc\r\r')
+        c.clear()
+        parse_bytes(s, b'\033[?2004h')
+        s.paste(b'a\nb\033[20\033[201~1~c\x9b201~')
+        self.ae(c.wtcbuf, b'\033[200~a\nbc\033[201~')
+
     def test_key_encoding_flags_stack(self):
         s = self.create_screen()
         c = s.callbacks
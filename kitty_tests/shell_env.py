@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+
+import os
+import stat
+import tempfile
+
+from . import BaseTest
+from .open_actions import patch_env
+
+
+class TestShellEnvironment(BaseTest):
+
+    def test_shell_environment_cache(self):
+        from kitty.utils import (
+            ShellEnvironmentReader, cached_shell_environment,
+            clear_shell_environment_cache, shell_environment_cache_path
+        )
+        with tempfile.TemporaryDirectory() as home, patch_env(HOME=home):
+            shell = [os.path.join(home, 'fake-shell')]
+            with open(shell[0], 'w') as f:
+                f.write('#!/bin/sh\necho A=1\necho SECRET=x\n')
+            os.chmod(shell[0], 0o755)
+            clear_shell_environment_cache()
+            self.assertIsNone(cached_shell_environment(shell))
+            env = ShellEnvironmentReader(shell).wait()
+            self.ae(env, {'A': '1', 'SECRET': 'x'})
+            self.ae(stat.S_IMODE(os.stat(shell_environment_cache_path()).st_mode), 0o600)
+            self.ae(cached_shell_environment(shell), env)
+            self.assertIsNone(cached_shell_environment(shell + ['-x']))
+            # changing a startup file of the shell invalidates the cache
+            with open(os.path.join(home, '.profile'), 'w') as f:
+                f.write('export B=2\n')
+            self.assertIsNone(cached_shell_environment(shell))
+            ShellEnvironmentReader(shell).wait()
+            self.ae(cached_shell_environment(shell), env)
+            clear_shell_environment_cache()
+            self.assertIsNone(cached_shell_environment(shell))
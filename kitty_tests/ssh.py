@@ -2,12 +2,20 @@
 # License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
 
 
+import glob
 import os
+import shutil
+import subprocess
+import tempfile
 from . import BaseTest
 
-from kittens.ssh.main import get_connection_data
+from kittens.ssh.main import (
+    get_connection_data, get_posix_cmd, get_python_cmd
+)
 from kitty.utils import SSHConnectionData
 
+from .open_actions import patch_env
+
 
 class SSHTest(BaseTest):
 
@@ -22,3 +30,60 @@ def t(cmdline, binary='ssh', host='main', port=None, identity_file=''):
         t('ssh un@ip -i ident -p34', host='un@ip', port=34, identity_file='ident')
         t('ssh un@ip -iident -p34', host='un@ip', port=34, identity_file='ident')
         t('ssh -p 33 main', port=33)
+
+    def test_ssh_terminfo_bootstrap(self):
+        if not shutil.which('tic') or not shutil.which('sh'):
+            self.skipTest('tic not available')
+        terminfo = 'xterm-kitty-test|kitty test,\n\tam, cols#80,\n'
+
+        def run(terminfo, get_cmd=get_posix_cmd):
+            cmd = get_cmd(terminfo, ['echo', 'ok'])[0]
+            self.ae(subprocess.check_output(cmd, shell=True, env=env, cwd=home), b'ok\n')
+            return glob.glob(os.path.join(home, '.terminfo', '*', 'xterm-kitty-test'))
+
+        def contents(path):
+            with open(path, 'rb') as f:
+                return f.read()
+
+        for get_cmd in (get_posix_cmd, get_python_cmd):
+            if get_cmd is get_python_cmd and not shutil.which('python'):
+                continue
+            with tempfile.TemporaryDirectory() as home:
+                env = dict(os.environ, HOME=home)
+                compiled = run(terminfo, get_cmd)
+                self.ae(len(compiled), 1)
+                # not re-compiled when unchanged
+                with open(compiled[0], 'wb') as f:
+                    f.write(b'marker')
+                self.ae(run(terminfo, get_cmd), compiled)
+                self.ae(contents(compiled[0]), b'marker')
+                # re-compiled when the compiled entry is missing
+                os.remove(compiled[0])
+                self.ae(run(terminfo, get_cmd), compiled)
+                self.assertNotEqual(contents(compiled[0]), b'marker')
+                with open(compiled[0], 'wb') as f:
+                    f.write(b'marker')
+                self.ae(run(terminfo.replace('80', '81'), get_cmd), compiled)
+                self.assertNotEqual(contents(compiled[0]), b'marker')
+
+    def test_ssh_connection_sharing(self):
+        from kittens.ssh import main as ssh
+        with tempfile.TemporaryDirectory() as rd, patch_env(XDG_RUNTIME_DIR=rd, KITTY_SSH_SHARE_CONNECTIONS='1'):
+            orig, ssh.config_prevents_connection_sharing = ssh.config_prevents_connection_sharing, lambda *a: False
+            try:
+                args = ssh.connection_sharing_args([], 'host')
+                sd = os.path.join(rd, f'kssh-{os.getuid()}')
+                self.ae(args[args.index('-o') + 1], 'ControlMaster=auto')
+                self.assertIn(f'ControlPath={sd}/%C', args)
+                self.ae(ssh.connection_sharing_args(['-o', 'ControlPath=x'], 'host'), [])
+                self.ae(ssh.connection_sharing_args(['-L', '80:localhost:80'], 'host'), [])
+                os.chmod(sd, 0o755)
+                self.ae(ssh.connection_sharing_args([], 'host'), [])
+                os.rmdir(sd)
+                os.symlink(rd, sd)
+                self.ae(ssh.connection_sharing_args([], 'host'), [])
+                os.remove(sd)
+                with patch_env(KITTY_SSH_SHARE_CONNECTIONS=None):
+                    self.ae(ssh.connection_sharing_args([], 'host'), [])
+            finally:
+                ssh.config_prevents_connection_sharing = orig
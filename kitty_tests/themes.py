@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# License: GPLv3 Copyright: 2021, Kovid Goyal <kovid at kovidgoyal.net>
+
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+from . import BaseTest
+
+
+def themes_zip(*names: str) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('kitty-themes-master/themes.json', repr(list(names)))
+    return buf.getvalue()
+
+
+class TestThemes(BaseTest):
+
+    def test_themes_fetch(self):
+        from kittens.themes.collection import (
+            fetch_themes, is_cache_stale, read_metadata
+        )
+        served = {'data': themes_zip('a'), 'etag': '"1"', 'requests': 0}
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                served['requests'] += 1
+                if self.headers.get('If-None-Match') == served['etag']:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', served['etag'])
+                self.send_header('Content-Length', str(len(served['data'])))
+                self.end_headers()
+                self.wfile.write(served['data'])
+
+            def log_message(self, *a):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{server.server_address[1]}/themes.zip'
+        name = 'test-themes'
+
+        def contents(path):
+            with zipfile.ZipFile(path) as zf:
+                return zf.read('kitty-themes-master/themes.json')
+
+        try:
+            self.assertTrue(is_cache_stale(1, name))
+            path = fetch_themes(name, url, 1)
+            self.ae(contents(path), b"['a']")
+            self.ae(read_metadata(path).etag, '"1"')
+            self.assertFalse(is_cache_stale(1, name))
+            fetch_themes(name, url, 1)
+            self.ae(served['requests'], 1)
+            fetch_themes(name, url, 0)
+            self.ae(served['requests'], 2)
+            self.ae(contents(path), b"['a']")
+            served['data'], served['etag'] = themes_zip('b'), '"2"'
+            fetch_themes(name, url, 0)
+            self.ae(contents(path), b"['b']")
+            self.ae(read_metadata(path).etag, '"2"')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        mirror = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(mirror, f'{name}.zip'), 'wb') as f:
+                f.write(themes_zip('c'))
+            path = fetch_themes(name, mirror, 0)
+            self.ae(contents(path), b"['c']")
+            etag = read_metadata(path).etag
+            fetch_themes(name, mirror, 0)
+            self.ae(read_metadata(path).etag, etag)
+        finally:
+            shutil.rmtree(mirror)
+
+    def test_theme_index(self):
+        from kittens.themes.collection import Themes, theme_index
+        with tempfile.TemporaryDirectory() as tdir:
+            path = os.path.join(tdir, 'kitty-themes.zip')
+            with zipfile.ZipFile(path, 'w') as zf:
+                zf.writestr('kitty-themes-master/themes.json', json.dumps([
+                    {'name': 'A', 'file': 'themes/a.conf', 'is_dark': True}, {'name': 'B', 'file': 'themes/b.conf'}]))
+                zf.writestr('kitty-themes-master/themes/a.conf', '## name: A\nbackground #000000\n')
+                zf.writestr('kitty-themes-master/themes/b.conf', '## name: B\nbackground_opacity 0.5\n')
+            items = theme_index(path)
+            self.ae([x['raw'] for x in items], ['## name: A\nbackground #000000\n', '## name: B\nbackground_opacity 0.5\n'])
+            self.ae(items[0]['colors'], {'background': '#000000'})
+            self.assertIsNone(items[1]['colors'])
+            index_path = os.path.join(tdir, 'kitty-themes-index.json')
+            self.ae(theme_index(path), items)
+            # the index is used as long as the zip file is unchanged
+            with open(index_path) as f:
+                index = json.load(f)
+            index['themes'][0]['name'] = 'C'
+            with open(index_path, 'w') as f:
+                json.dump(index, f)
+            self.ae(theme_index(path)[0]['name'], 'C')
+            index['key'] = ['stale']
+            with open(index_path, 'w') as f:
+                json.dump(index, f)
+            self.ae(theme_index(path), items)
+            themes = Themes()
+            themes.load_from_zip(path)
+            self.ae([(t.name, t.is_dark, t.raw) for t in themes], [
+                ('A', True, items[0]['raw']), ('B', False, items[1]['raw'])])
+
+    def test_themes_search_narrowing(self):
+        from functools import partial
+
+        from kittens.themes.collection import Theme, Themes
+        from kittens.themes.main import ThemesList
+        themes = Themes()
+        for name in ('Alpha', 'Alabaster', 'Beta', 'Gamma Ray', 'Amber'):
+            t = themes.themes[name] = Theme(partial(str, ''))
+            t.name = name
+        themes.index_map = tuple(themes.themes)
+
+        def names(tl):
+            return sorted(t.name for t in tl.themes)
+
+        tl = ThemesList()
+        tl.update_themes(themes)
+        self.ae(len(tl), 5)
+        self.assertTrue(tl.update_search('a'))
+        self.assertFalse(tl.update_search('a'))
+        self.ae(names(tl), ['Alabaster', 'Alpha', 'Amber', 'Beta', 'Gamma Ray'])
+        # when the query is extended only the previous matches are searched
+        del tl.themes.themes['Alpha']
+        tl.update_search('al')
+        self.ae(names(tl), ['Alabaster'])
+        # other changes search all themes again
+        tl.update_search('am')
+        self.ae(names(tl), ['Amber', 'Gamma Ray'])
+        tl.update_search('')
+        self.ae(len(tl), 5)
@@ -45,3 +45,56 @@ def test_line_edit(self):
     def test_multiprocessing_spawn(self):
         from kitty.multiprocessing import test_spawn
         test_spawn()
+
+    def test_frame_coalescing(self):
+        import asyncio
+
+        from kittens.tui.loop import Loop
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        loop = Loop()
+
+        class H:
+            frame_interval = 0
+            draws = 0
+
+            def write(self, data):
+                loop.write_buf += data.encode('ascii')
+
+            def draw_screen(self):
+                self.draws += 1
+
+        h = H()
+        try:
+            for i in range(10):
+                loop.schedule_frame(h)
+            loop.asycio_loop.call_soon(loop.asycio_loop.stop)
+            loop.asycio_loop.run_forever()
+            self.ae(h.draws, 1)
+            self.ae(len(loop.frame_timings), 1)
+            self.ae(bytes(loop.write_buf), b'\033[?2026h\033[?2026l')
+        finally:
+            loop.asycio_loop.close()
+            asyncio.set_event_loop(None)
+
+    def test_virtual_screen(self):
+        from kittens.tui.virtual_screen import VirtualScreen
+        from kitty.utils import ScreenSize
+        size = ScreenSize(5, 20, 0, 0, 10, 20)
+        vs = VirtualScreen()
+        out = []
+
+        def commit(*lines):
+            del out[:]
+            for line in lines:
+                vs.print(line)
+            vs.commit(out.append, size)
+            return ''.join(out)
+
+        self.ae(commit('a', 'b', 'c'), '\033[H\033[2J\033[1;1H\033[m\033[2Ka\033[2;1H\033[m\033[2Kb\033[3;1H\033[m\033[2Kc\033[m')
+        self.ae(commit('a', 'x', 'c'), '\033[2;1H\033[m\033[2Kx\033[m')
+        self.ae(commit('a', 'x'), '\033[3;1H\033[m\033[2K\033[m')
+        vs.set_cursor(1, 0)
+        self.ae(commit('a', 'x'), '\033[m\033[1;2H')
+        vs.invalidate()
+        self.ae(commit('a'), '\033[H\033[2J\033[1;1H\033[m\033[2Ka\033[m')
+        self.ae(commit(*'abcdefgh'), ''.join(f'\033[{i};1H\033[m\033[2K{x}' for i, x in enumerate('bcde', 2)) + '\033[m')
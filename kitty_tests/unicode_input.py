@@ -20,3 +20,18 @@ def matches(a, *words):
         self.ae(matches('horizontal', 'ell'), {0x2026, 0x22ef, 0x2b2c, 0x2b2d, 0xfe19})
         self.assertFalse(matches('sfgsfgsfgfgsdg'))
         self.assertIn(0x1f41d, matches('bee'))
+
+    def test_search(self):
+        from kittens.unicode_input.unicode_names import codepoints_matching_search as search
+        self.ae(set(search(('horiz', 'ell'))), {0x2026, 0x22ef, 0x2b2c, 0x2b2d, 0xfe19})
+        self.ae(search(('horiz', 'ell'))[0], 0x2026)
+        self.ae(search(('sfgsfgsfgfgsdg',)), ())
+        self.ae(search(('arrow', 'sfgsfgsfgfgsdg')), ())
+        # substrings of words
+        self.assertIn(0x2192, search(('ightwa',)))
+        self.assertIn(0x2192, search(('arrow', 'ightwa')))
+        # complete words rank above prefixes which rank above substrings
+        r = search(('left',))
+        self.assertLess(r.index(0x2194), r.index(0x2190))
+        r = search(('ard',))
+        self.assertLess(r.index(0x1cf2), r.index(0x2190))